@@ -0,0 +1,108 @@
+import os
+import numpy as np
+import hl2ss
+import hl2ss_3dcv
+
+
+PORT = hl2ss.StreamPort.RM_VLC_LEFTFRONT
+
+
+def _create_calibration_rm_vlc(rng):
+    return hl2ss._Mode2_RM_VLC(*[rng.random(shape).astype(np.float32) for shape in [(480, 640, 2), (4, 4), (480, 640, 2), (4, 4)]])
+
+
+def _save_calibration_rm_vlc(path, calibration):
+    base = hl2ss_3dcv._calibration_subdirectory(PORT, path)
+    os.makedirs(base, exist_ok=True)
+    hl2ss_3dcv._save_calibration_rm(PORT, calibration, base)
+    # Make sure the edit is visible on filesystems with coarse timestamps
+    for name in os.listdir(base):
+        status = os.stat(os.path.join(base, name))
+        os.utime(os.path.join(base, name), ns=(status.st_atime_ns, status.st_mtime_ns + 1000000))
+    return base
+
+
+def _count_directory_loads(monkeypatch):
+    loads = []
+    load = hl2ss_3dcv._load_calibration_rm
+    monkeypatch.setattr(hl2ss_3dcv, '_load_calibration_rm', lambda port, path: loads.append(path) or load(port, path))
+    return loads
+
+
+def test_store_serves_unchanged_entries(tmp_path, monkeypatch):
+    path = str(tmp_path)
+    calibration = _create_calibration_rm_vlc(np.random.default_rng(0))
+    _save_calibration_rm_vlc(path, calibration)
+    hl2ss_3dcv.migrate_calibration_store(path)
+
+    loads = _count_directory_loads(monkeypatch)
+    loaded = hl2ss_3dcv.get_calibration_rm(None, PORT, path)
+
+    assert len(loads) == 0
+    assert np.array_equal(loaded.uv2xy, calibration.uv2xy)
+
+
+def test_store_refreshes_edited_entries(tmp_path, monkeypatch):
+    path = str(tmp_path)
+    rng = np.random.default_rng(0)
+    _save_calibration_rm_vlc(path, _create_calibration_rm_vlc(rng))
+    hl2ss_3dcv.migrate_calibration_store(path)
+
+    calibration = _create_calibration_rm_vlc(rng)
+    _save_calibration_rm_vlc(path, calibration)
+
+    loads = _count_directory_loads(monkeypatch)
+    assert np.array_equal(hl2ss_3dcv.get_calibration_rm(None, PORT, path).extrinsics, calibration.extrinsics)
+    assert np.array_equal(hl2ss_3dcv.get_calibration_rm(None, PORT, path).extrinsics, calibration.extrinsics)
+    assert len(loads) == 1
+
+
+def test_store_ignores_deleted_entries(tmp_path, monkeypatch):
+    path = str(tmp_path)
+    rng = np.random.default_rng(0)
+    base = _save_calibration_rm_vlc(path, _create_calibration_rm_vlc(rng))
+    hl2ss_3dcv.migrate_calibration_store(path)
+
+    for name in os.listdir(base):
+        os.remove(os.path.join(base, name))
+    os.rmdir(base)
+
+    calibration = _create_calibration_rm_vlc(rng)
+    monkeypatch.setattr(hl2ss_3dcv, '_download_calibration_rm', lambda host, port: calibration)
+
+    assert np.array_equal(hl2ss_3dcv.get_calibration_rm(None, PORT, path).uv2xy, calibration.uv2xy)
+    assert os.path.isdir(base)
+
+
+def test_store_is_created_without_migration(tmp_path):
+    path = str(tmp_path)
+    calibration = _create_calibration_rm_vlc(np.random.default_rng(0))
+    _save_calibration_rm_vlc(path, calibration)
+
+    hl2ss_3dcv.get_calibration_rm(None, PORT, path)
+    store = hl2ss_3dcv.load_calibration_store(path)
+
+    assert store is not None
+    assert np.array_equal(store[f'{hl2ss_3dcv._calibration_key_rm(PORT)}/intrinsics'], calibration.intrinsics)
+
+
+def test_store_refreshes_stereo_groups_independently(tmp_path):
+    path = str(tmp_path)
+    rng = np.random.default_rng(0)
+    port_2 = hl2ss.StreamPort.RM_VLC_RIGHTFRONT
+    calibration = hl2ss_3dcv._StereoCalibration(*[rng.random(shape).astype(np.float32) for shape in [(3, 3), (1, 3), (3, 3), (3, 3)]])
+    rectification = hl2ss_3dcv._StereoRectification(*[rng.random(shape) for shape in [(3, 3), (3, 3), (3, 4), (3, 4), (4, 4)]], np.array([0, 0, 640, 480], dtype=np.int32), np.array([0, 0, 640, 480], dtype=np.int32), rng.random((480, 640)).astype(np.float32), rng.random((480, 640)).astype(np.float32))
+    hl2ss_3dcv.save_stereo_calibration(PORT, port_2, calibration, path)
+    hl2ss_3dcv.save_stereo_rectification(PORT, port_2, rectification, path)
+
+    # Edit the rectification files behind the store, then refresh the
+    # calibration entries first
+    base = hl2ss_3dcv._stereo_subdirectory(PORT, port_2, path)
+    rectification.Q[:] = 7
+    hl2ss_3dcv._save_stereo_rectification(rectification, base)
+    for name in os.listdir(base):
+        status = os.stat(os.path.join(base, name))
+        os.utime(os.path.join(base, name), ns=(status.st_atime_ns, status.st_mtime_ns + 1000000))
+
+    assert np.array_equal(hl2ss_3dcv.load_stereo_calibration(PORT, port_2, path).F, calibration.F)
+    assert np.all(hl2ss_3dcv.load_stereo_rectification(PORT, port_2, path).Q == 7)
@@ -0,0 +1,71 @@
+import os
+import numpy as np
+import hl2ss
+import hl2ss_io
+import hl2ss_utilities
+
+
+def _write_recording(filename, count=120):
+    wr = hl2ss_io.wr_rm_imu(filename, hl2ss.StreamPort.RM_IMU_ACCELEROMETER, hl2ss.StreamMode.MODE_1, b'')
+    wr.open()
+    pose = np.eye(4, dtype=np.float32)
+    for frame in range(0, count):
+        # Drop a few frames to produce gaps in the statistics
+        if ((frame % 37) == 36):
+            continue
+        payload = np.full((32 + (frame % 5) * 4,), frame, dtype=np.uint8).tobytes()
+        wr.write(hl2ss._packet(100000 + frame * 10000, payload, pose))
+    wr.close()
+
+
+def _write_container(filename, input_filename):
+    rd = hl2ss_io._rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER)
+    rd.open()
+    wr = hl2ss_io.wr_container(filename, [rd], b'')
+    wr.open()
+    stream = wr.get_writer(rd.port)
+    while (True):
+        data = rd.get_next_packet()
+        if (data is None):
+            break
+        stream.write(data)
+    wr.close()
+    rd.close()
+    return hl2ss_io.get_container_stream(filename, rd.port)
+
+
+def _strip(statistics):
+    return {key : value for key, value in statistics.items() if (key not in ['filename', 'size'])}
+
+
+def test_statistics_match_across_formats(tmp_path):
+    filename = os.path.join(tmp_path, 'imu.bin')
+    _write_recording(filename)
+
+    hl2ss_io.split(filename, os.path.join(tmp_path, 'segment.bin'), 3)
+    manifest = hl2ss_io.get_manifest_filename(os.path.join(tmp_path, 'segment.bin'))
+    container = _write_container(os.path.join(tmp_path, 'imu.hl2c'), filename)
+
+    plain, segmented, packed = hl2ss_utilities.get_recordings_statistics([filename, manifest, container], processes=False)
+
+    assert 'error' not in plain
+    assert plain['gaps'] > 0
+    assert plain['truncated'] == 0
+    assert _strip(segmented) == _strip(plain)
+    assert _strip(packed) == _strip(plain)
+
+
+def test_scan_reports_truncated_container(tmp_path):
+    filename = os.path.join(tmp_path, 'imu.bin')
+    _write_recording(filename)
+    container = _write_container(os.path.join(tmp_path, 'imu.hl2c'), filename)
+
+    path, port = container.rsplit('#', 1)
+    _, indices = hl2ss_io.load_container(path)
+    end = int(indices[int(port)]['offset'][-1])
+    with open(path, 'r+b') as file:
+        file.truncate(end + 8)
+
+    report = hl2ss_io.scan(container)
+    assert report['packets'] == indices[int(port)].shape[0] - 1
+    assert report['truncated'] == hl2ss_io._CHUNK_SIZE + 8
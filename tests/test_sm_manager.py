@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+o3d = pytest.importorskip('open3d', exc_type=ImportError)
+
+import hl2ss
+import hl2ss_sa
+import hl2ss_svr
+
+
+def _create_rays(rng, count, side):
+    origins = np.stack([rng.uniform(-0.5, side + 0.5, count), np.full(count, 1.0), rng.uniform(-0.5, side + 0.5, count)], axis=1)
+    directions = np.stack([rng.uniform(-0.6, 0.6, count), -np.ones(count), rng.uniform(-0.6, 0.6, count)], axis=1)
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    return np.hstack([origins, directions]).astype(np.float32)
+
+
+def _cast_rays_per_surface(manager, rays):
+    distances = np.full(rays.shape[0], np.inf)
+    surfaces = np.full(rays.shape[0], None, dtype=object)
+    triangles = np.full(rays.shape[0], -1)
+    for surface_id, entry in manager._surfaces.items():
+        scene = o3d.t.geometry.RaycastingScene()
+        scene.add_triangles(entry.triangle_mesh)
+        hits = scene.cast_rays(rays)
+        t_hit = hits['t_hit'].numpy()
+        closer = t_hit < distances
+        distances[closer] = t_hit[closer]
+        surfaces[closer] = surface_id
+        triangles[closer] = hits['primitive_ids'].numpy()[closer]
+    return distances, surfaces, triangles
+
+
+@pytest.fixture
+def mock_sm():
+    server = hl2ss_svr.mock_sm('127.0.0.1', surfaces=36, churn=0.2, size=1.0)
+    server.open()
+    yield server
+    server.close()
+
+
+@pytest.mark.parametrize('bucket_size', [2.0, 0.5, None])
+def test_cast_rays_matches_per_surface_scenes(mock_sm, bucket_size):
+    rng = np.random.default_rng(1)
+    manager = hl2ss_sa.sm_manager('127.0.0.1', 2000, 2, bucket_size)
+    manager.open()
+    volumes = hl2ss.sm_bounding_volume()
+    volumes.add_box([0, 0, 0], [20, 20, 20])
+    manager.set_volumes(volumes)
+    try:
+        # Surfaces churn between updates, exercising bucket rebuilds
+        for _ in range(0, 3):
+            manager.get_observed_surfaces()
+            rays = _create_rays(rng, 5000, 6)
+            distances, surfaces, triangles = manager.cast_rays(rays, ids=True)
+            expected_distances, expected_surfaces, expected_triangles = _cast_rays_per_surface(manager, rays)
+            hit = np.isfinite(expected_distances)
+
+            assert np.any(hit)
+            assert np.allclose(distances, expected_distances)
+            assert np.array_equal(manager.cast_rays(rays), distances)
+            assert np.all(surfaces[hit] == expected_surfaces[hit])
+            assert np.array_equal(triangles[hit], expected_triangles[hit])
+            assert np.all(surfaces[~hit] == None)
+            assert np.all(triangles[~hit] == -1)
+    finally:
+        manager.close()
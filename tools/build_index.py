@@ -0,0 +1,11 @@
+
+import argparse
+import hl2ss_io
+
+parser = argparse.ArgumentParser(description='HL2SS Index Builder Tool. Creates the seek index sidecar for data recorded with hl2ss_io.')
+parser.add_argument('-I', '--input', action='append', required=True, help='Input bin files (e.g., -I ./data/personal_video.bin -I ./data/microphone.bin)')
+args = parser.parse_args()
+
+for filename in args.input:
+    index = hl2ss_io.create_index(filename)
+    print('{filename}: {count} packets, {keys} key frames -> {index}'.format(filename=filename, count=index.shape[0], keys=int(index['key'].sum()), index=hl2ss_io.get_index_filename(filename)))
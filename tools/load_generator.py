@@ -0,0 +1,33 @@
+
+import argparse
+import time
+import hl2ss
+import hl2ss_svr
+
+parser = argparse.ArgumentParser(description='HL2SS Load Generator Tool. Serves synthetic packets for the selected streams at configurable rates and reports the throughput achieved by each client.')
+parser.add_argument('-P', '--port', action='append', required=True, help='Stream ports to serve (e.g., -P 3800 -P 3810)')
+parser.add_argument('--host', help='Listen address (e.g. 127.0.0.1)', default='127.0.0.1')
+parser.add_argument('--rate', help='Packets per second for every client (defaults to the native rate of each stream)', default=None)
+parser.add_argument('--count', help='Number of distinct payloads generated per client', default=64)
+
+args = parser.parse_args()
+
+rate = None if (args.rate is None) else float(args.rate)
+
+servers = [hl2ss_svr.synthetic(args.host, int(port), rate, int(args.count)) for port in args.port]
+
+for server in servers:
+    server.open()
+    print('Serving synthetic {name} on {host}:{port}'.format(name=hl2ss.get_port_name(server.port), host=args.host, port=server.port))
+
+try:
+    while (True):
+        time.sleep(1)
+        for server in servers:
+            for address, statistics in server.get_statistics().items():
+                print('{name} {address}: {statistics}'.format(name=hl2ss.get_port_name(server.port), address=address, statistics=statistics))
+except KeyboardInterrupt:
+    pass
+
+for server in servers:
+    server.close()
@@ -0,0 +1,14 @@
+
+import argparse
+import hl2ss_3dcv
+
+parser = argparse.ArgumentParser(description='HL2SS Calibration Migration Tool. Packs a calibration folder (one set of bin files per sensor) into a single memory-mapped calibration store.')
+parser.add_argument('--path', help='Calibration folder (e.g., ../calibration)', required=True)
+args = parser.parse_args()
+
+migrated = hl2ss_3dcv.migrate_calibration_store(args.path)
+
+for name in migrated:
+    print('Migrated {name}'.format(name=name))
+
+print('Wrote {filename}'.format(filename=hl2ss_3dcv.get_calibration_store_filename(args.path)))
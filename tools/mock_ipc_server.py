@@ -0,0 +1,34 @@
+
+import argparse
+import time
+import hl2ss_svr
+
+parser = argparse.ArgumentParser(description='HL2SS Mock IPC Server Tool. Serves the remote configuration, spatial mapping, scene understanding, voice input and unity message queue interfaces without a HL2.')
+parser.add_argument('--host', help='Listen address (e.g. 127.0.0.1)', default='127.0.0.1')
+parser.add_argument('-M', '--mesh', action='append', default=None, help='OBJ or PLY files served as spatial mapping surfaces and as the scene understanding world mesh (e.g., -M ./room.ply)')
+parser.add_argument('--surfaces', help='Number of procedural spatial mapping surfaces (ignored if meshes are provided)', default=64)
+parser.add_argument('--triangles', help='Triangles per procedural surface (defaults to the density requested by the client)', default=None)
+parser.add_argument('--churn', help='Fraction of surfaces updated on each get_observed_surfaces call', default=0.0)
+
+args = parser.parse_args()
+
+servers = [
+    hl2ss_svr.mock_rc(args.host),
+    hl2ss_svr.mock_sm(args.host, surfaces=int(args.surfaces), meshes=args.mesh, triangles=None if (args.triangles is None) else int(args.triangles), churn=float(args.churn)),
+    hl2ss_svr.mock_su(args.host, meshes=args.mesh),
+    hl2ss_svr.mock_vi(args.host),
+    hl2ss_svr.mock_umq(args.host),
+]
+
+for server in servers:
+    server.open()
+    print('Serving {name} on {host}:{port}'.format(name=type(server).__name__, host=args.host, port=server.port))
+
+try:
+    while (True):
+        time.sleep(1)
+except KeyboardInterrupt:
+    pass
+
+for server in servers:
+    server.close()
@@ -0,0 +1,32 @@
+
+import argparse
+import json
+import os
+import sys
+import hl2ss_utilities
+
+parser = argparse.ArgumentParser(description='HL2SS Recording Statistics Tool. Summarizes data recorded with hl2ss_io from packet headers only and writes the results as JSON.')
+parser.add_argument('-I', '--input', action='append', required=True, help='Input bin files, segment manifests, container streams or directories to search for bin files (e.g., -I ./data/personal_video.bin -I ./data/recording.hl2c#3810 -I ./archive)')
+parser.add_argument('-O', '--output', help='Output JSON file (defaults to standard output)', default=None)
+parser.add_argument('--extension', help='Extension of the recordings when searching directories', default='.bin')
+parser.add_argument('--workers', help='Number of worker processes', default=None)
+args = parser.parse_args()
+
+filenames = []
+
+for path in args.input:
+    if (os.path.isdir(path)):
+        for root, _, files in os.walk(path):
+            filenames.extend(sorted([os.path.join(root, name) for name in files if (name.endswith(args.extension))]))
+    else:
+        filenames.append(path)
+
+statistics = hl2ss_utilities.get_recordings_statistics(filenames, None if (args.workers is None) else int(args.workers))
+
+if (args.output is None):
+    json.dump(statistics, sys.stdout, indent=4)
+    print('')
+else:
+    with open(args.output, 'w') as file:
+        json.dump(statistics, file, indent=4)
+    print('Wrote statistics for {count} recordings ({errors} errors) to {output}'.format(count=len(statistics), errors=sum([1 for item in statistics if ('error' in item)]), output=args.output))
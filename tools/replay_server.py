@@ -0,0 +1,28 @@
+
+import argparse
+import time
+import hl2ss
+import hl2ss_svr
+
+parser = argparse.ArgumentParser(description='HL2SS Replay Server Tool. Serves data recorded with hl2ss_io on the standard stream ports so that clients can run without a HL2.')
+parser.add_argument('-I', '--input', action='append', required=True, help='Input bin files (e.g., -I ./data/personal_video.bin -I ./data/microphone.bin)')
+parser.add_argument('--host', help='Listen address (e.g. 127.0.0.1)', default='127.0.0.1')
+parser.add_argument('--speed', help='Playback speed (1.0 is real time, 0 is as fast as possible)', default=1.0)
+parser.add_argument('--loop', help='Restart the recording when it ends', action='store_true')
+
+args = parser.parse_args()
+
+servers = [hl2ss_svr.replay(filename, args.host, speed=float(args.speed), loop=args.loop) for filename in args.input]
+
+for server in servers:
+    server.open()
+    print('Serving {filename} ({name}) on {host}:{port}'.format(filename=server.filename, name=hl2ss.get_port_name(server.stream_port), host=args.host, port=server.port))
+
+try:
+    while (True):
+        time.sleep(1)
+except KeyboardInterrupt:
+    pass
+
+for server in servers:
+    server.close()
@@ -0,0 +1,34 @@
+
+import argparse
+import os
+import hl2ss
+import hl2ss_io
+import hl2ss_utilities
+
+parser = argparse.ArgumentParser(description='HL2SS Recording Scanner Tool. Checks data recorded with hl2ss_io for truncation, timestamp errors and gaps without decoding it.')
+parser.add_argument('-I', '--input', action='append', required=True, help='Input bin files, segment manifests or container streams (e.g., -I ./data/personal_video.bin -I ./data/recording.hl2c#3810)')
+parser.add_argument('--repair', help='Write a clean copy without the truncated tail to this directory', default=None)
+parser.add_argument('--index', help='Write the seek index for the valid packets', action='store_true')
+args = parser.parse_args()
+
+for filename in args.input:
+    rd = hl2ss_io.create_rd(filename, hl2ss.ChunkSize.SINGLE_TRANSFER, None)
+    rd.open()
+    period = hl2ss_utilities.get_stream_period(rd)
+    rd.close()
+
+    report = hl2ss_io.scan(filename, period)
+
+    print('{filename} ({name}): {packets} packets, {truncated} truncated bytes, {non_monotonic} non-monotonic timestamps, {gaps} gaps, {invalid_poses} invalid poses'.format(filename=filename, name=hl2ss.get_port_name(report['port']), packets=report['packets'], truncated=report['truncated'], non_monotonic=report['non_monotonic'].shape[0], gaps=report['gaps'].shape[0], invalid_poses=report['invalid_poses']))
+    for frame, delta in zip(report['gaps'], report['gap_deltas']):
+        print('  gap at frame {frame}: {delta:.3f} s'.format(frame=frame, delta=delta / hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS))
+
+    if ((args.repair is not None) and (hl2ss_io.is_container_stream(filename) or hl2ss_io.is_manifest(filename))):
+        print('  repair skipped: not a single stream recording')
+    elif (args.repair is not None):
+        output_filename = os.path.join(args.repair, os.path.basename(filename))
+        hl2ss_io.repair(filename, output_filename)
+        print('  repaired copy -> {output}'.format(output=output_filename))
+    elif (args.index):
+        hl2ss_io.repair(filename)
+        print('  index -> {index}'.format(index=hl2ss_io.get_index_filename(filename)))
@@ -0,0 +1,82 @@
+
+import argparse
+import time
+import hl2ss
+import hl2ss_lnm
+import hl2ss_svr
+
+parser = argparse.ArgumentParser(description='HL2SS Stream Relay Tool. Receives one stream from the HL2 and serves it to multiple clients using the hl2ss protocol.')
+parser.add_argument('--host', help='HL2 IP address (e.g. 192.168.1.0)', required=True)
+parser.add_argument('--port', help='Stream port (e.g. 3810 for Personal Video)', required=True)
+parser.add_argument('--bind', help='Relay listen address (e.g. 0.0.0.0)', default='0.0.0.0')
+parser.add_argument('--bind_port', help='Relay listen port (defaults to the stream port)', default=None)
+parser.add_argument('--queue_size', help='Maximum number of queued packets per client', default=64)
+parser.add_argument('--policy', help='Queue overflow policy (0: drop oldest, 1: drop newest, 2: resync on key frame)', default=hl2ss_svr.RelayPolicy.RESYNC)
+parser.add_argument('--width', help='PV width in pixels', default=1920)
+parser.add_argument('--height', help='PV height in pixels', default=1080)
+parser.add_argument('--fps', help='PV framerate', default=30)
+parser.add_argument('--relay_width', help='Transcode PV to this width in pixels', default=None)
+parser.add_argument('--relay_height', help='Transcode PV to this height in pixels', default=None)
+
+args = parser.parse_args()
+
+host       = args.host
+port       = int(args.port)
+bind_port  = port if (args.bind_port is None) else int(args.bind_port)
+width      = int(args.width)
+height     = int(args.height)
+framerate  = int(args.fps)
+transcoder = None
+
+if (port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+    rx = hl2ss_lnm.rx_rm_vlc(host, port, decoded=False)
+elif (port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+    rx = hl2ss_lnm.rx_rm_vlc(host, port, decoded=False)
+elif (port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+    rx = hl2ss_lnm.rx_rm_vlc(host, port, decoded=False)
+elif (port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+    rx = hl2ss_lnm.rx_rm_vlc(host, port, decoded=False)
+elif (port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+    rx = hl2ss_lnm.rx_rm_depth_ahat(host, port, decoded=False)
+elif (port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+    rx = hl2ss_lnm.rx_rm_depth_longthrow(host, port, decoded=False)
+elif (port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+    rx = hl2ss_lnm.rx_rm_imu(host, port)
+elif (port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+    rx = hl2ss_lnm.rx_rm_imu(host, port)
+elif (port == hl2ss.StreamPort.RM_IMU_MAGNETOMETER):
+    rx = hl2ss_lnm.rx_rm_imu(host, port)
+elif (port == hl2ss.StreamPort.PERSONAL_VIDEO):
+    rx = hl2ss_lnm.rx_pv(host, port, width=width, height=height, framerate=framerate, decoded_format=None)
+    if ((args.relay_width is not None) and (args.relay_height is not None)):
+        transcoder = hl2ss_svr.pv_transcoder(int(args.relay_width), int(args.relay_height), framerate, rx.profile)
+elif (port == hl2ss.StreamPort.MICROPHONE):
+    rx = hl2ss_lnm.rx_microphone(host, port, decoded=False)
+elif (port == hl2ss.StreamPort.SPATIAL_INPUT):
+    rx = hl2ss_lnm.rx_si(host, port)
+elif (port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+    rx = hl2ss_lnm.rx_eet(host, port)
+else:
+    print('Error: Unsupported port {port}'.format(port=port))
+    quit()
+
+if (port == hl2ss.StreamPort.PERSONAL_VIDEO):
+    hl2ss_lnm.start_subsystem_pv(host, port)
+
+server = hl2ss_svr.relay(rx, args.bind, bind_port, int(args.queue_size), int(args.policy), transcoder)
+server.open()
+
+print('Relaying {name} from {host}:{port} on {bind}:{bind_port} (Ctrl+C to stop)'.format(name=hl2ss.get_port_name(port), host=host, port=port, bind=args.bind, bind_port=bind_port))
+
+try:
+    while (server.is_open()):
+        time.sleep(1)
+        for address, statistics in server.get_statistics().items():
+            print('{address}: {statistics}'.format(address=address, statistics=statistics))
+except KeyboardInterrupt:
+    pass
+
+server.close()
+
+if (port == hl2ss.StreamPort.PERSONAL_VIDEO):
+    hl2ss_lnm.stop_subsystem_pv(host, port)
@@ -0,0 +1,39 @@
+
+import argparse
+import hl2ss
+import hl2ss_io
+
+parser = argparse.ArgumentParser(description='HL2SS Recording Trim Tool. Cuts or splits data recorded with hl2ss_io without decoding it. Cuts start on the preceding key frame.')
+parser.add_argument('-I', '--input', help='Input bin file (e.g., ./data/personal_video.bin)', required=True)
+parser.add_argument('-O', '--output', help='Output bin file (e.g., ./data/personal_video_clip.bin)', required=True)
+parser.add_argument('--start', help='Start time in seconds from the beginning of the recording (or start frame with --frames)', default=None)
+parser.add_argument('--stop', help='Stop time in seconds from the beginning of the recording (or stop frame with --frames)', default=None)
+parser.add_argument('--frames', help='Interpret start and stop as frame numbers', action='store_true')
+parser.add_argument('--split', help='Split the recording into this many chunks instead of trimming', default=None)
+parser.add_argument('--gop', help='Snap to multiples of the recorded GOP size instead of inspecting key frames', action='store_true')
+parser.add_argument('--workers', help='Number of parallel copies when splitting', default=None)
+args = parser.parse_args()
+
+key_frames = not args.gop
+
+if (args.split is not None):
+    segments = hl2ss_io.split(args.input, args.output, int(args.split), key_frames, None if (args.workers is None) else int(args.workers))
+    print('Wrote {count} chunks and {manifest}'.format(count=len(segments), manifest=hl2ss_io.get_manifest_filename(args.output)))
+    for segment in segments:
+        print('  {filename}: {packets} packets, {size} bytes'.format(filename=segment['filename'], packets=segment['packets'], size=segment['size']))
+    quit()
+
+if (args.frames):
+    start = None if (args.start is None) else int(args.start)
+    stop = None if (args.stop is None) else int(args.stop)
+else:
+    rd = hl2ss_io.create_rd(args.input, hl2ss.ChunkSize.SINGLE_TRANSFER, None)
+    rd.open()
+    index = rd.get_index()
+    rd.close()
+    base = int(index['timestamp'][0]) if (index.shape[0] > 0) else 0
+    start = None if (args.start is None) else base + int(float(args.start) * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS)
+    stop = None if (args.stop is None) else base + int(float(args.stop) * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS)
+
+segment = hl2ss_io.trim(args.input, args.output, start, stop, args.frames, key_frames)
+print('Wrote {output}: {packets} packets, {size} bytes'.format(output=args.output, packets=segment['packets'], size=segment['size']))
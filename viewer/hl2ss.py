@@ -261,6 +261,9 @@ class _client:
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._socket.connect((host, port))
 
+    def attach(self, client_socket):
+        self._socket = client_socket
+
     def sendall(self, data):
         self._socket.sendall(data)
 
@@ -808,6 +811,51 @@ def get_audio_codec_bitrate(profile):
     return None
 
 
+#------------------------------------------------------------------------------
+# Key Frame Detection
+#------------------------------------------------------------------------------
+
+class _NAL_H264:
+    IDR = 5
+    SPS = 7
+    VCL_LAST = 5
+
+
+class _NAL_H265:
+    IRAP_FIRST = 16
+    IRAP_LAST = 23
+    VPS = 32
+    SPS = 33
+    VCL_LAST = 31
+
+
+def _get_nal_unit_types(payload):
+    payload = payload if (isinstance(payload, (bytes, bytearray))) else bytes(payload)
+    start = payload.find(b'\x00\x00\x01')
+    end = len(payload) - 3
+    while ((start >= 0) and (start < end)):
+        yield payload[start + 3]
+        start = payload.find(b'\x00\x00\x01', start + 3)
+
+
+def is_key_frame_h26x(payload, profile):
+    h264 = get_video_codec_name(profile) == 'h264'
+    for header in _get_nal_unit_types(payload):
+        if (h264):
+            nal_type = header & 0x1F
+            if ((nal_type == _NAL_H264.IDR) or (nal_type == _NAL_H264.SPS)):
+                return True
+            if ((nal_type >= 1) and (nal_type <= _NAL_H264.VCL_LAST)):
+                return False
+        else:
+            nal_type = (header >> 1) & 0x3F
+            if (((nal_type >= _NAL_H265.IRAP_FIRST) and (nal_type <= _NAL_H265.IRAP_LAST)) or (nal_type == _NAL_H265.VPS) or (nal_type == _NAL_H265.SPS)):
+                return True
+            if (nal_type <= _NAL_H265.VCL_LAST):
+                return False
+    return False
+
+
 #------------------------------------------------------------------------------
 # RM VLC Decoder
 #------------------------------------------------------------------------------
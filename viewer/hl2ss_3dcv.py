@@ -1,6 +1,12 @@
 
 import numpy as np
 import os
+import collections
+import hashlib
+import time
+import mmap
+import struct
+import zipfile
 import cv2
 import hl2ss
 import hl2ss_lnm
@@ -87,6 +93,59 @@ def project(points, projection4x4):
     return to_inhomogeneous(transform(points, projection4x4))
 
 
+def rigid_inverse(transform4x4, out=None):
+    if (out is None):
+        out = np.zeros(transform4x4.shape, dtype=np.float32)
+    else:
+        out.fill(0)
+    R_t = np.swapaxes(transform4x4[..., :3, :3], -1, -2)
+    out[..., :3, :3] = R_t
+    out[..., 3:, :3] = -(transform4x4[..., 3:, :3] @ R_t)
+    out[..., 3, 3] = 1
+    return out
+
+
+def _get_batch_transforms(transforms4x4):
+    transforms4x4 = np.asarray(transforms4x4, dtype=np.float32)
+    return transforms4x4[np.newaxis, :, :] if (transforms4x4.ndim == 2) else transforms4x4
+
+
+def _get_batch_output(points, channels, out):
+    shape = points.shape[:-1] + (channels,)
+    if (out is None):
+        return np.empty(shape, dtype=np.float32)
+    # Results are written through reshaped views of out, which would silently
+    # become copies for other layouts
+    if ((out.shape != shape) or (out.dtype != np.float32) or (not out.flags.c_contiguous)):
+        raise Exception(f'out must be a C-contiguous float32 array of shape {shape} (got {out.dtype} array of shape {out.shape})')
+    return out
+
+
+def transform_batch(points, transforms4x4, out=None):
+    transforms4x4 = _get_batch_transforms(transforms4x4)
+    out = _get_batch_output(points, 3, out)
+    count = points.shape[0]
+    block = out.reshape((count, -1, 3))
+    np.matmul(points.reshape((count, -1, 3)), transforms4x4[:, :3, :3], out=block)
+    block += transforms4x4[:, np.newaxis, 3, :3]
+    return out
+
+
+def orient_batch(directions, transforms4x4, out=None):
+    transforms4x4 = _get_batch_transforms(transforms4x4)
+    out = _get_batch_output(directions, 3, out)
+    count = directions.shape[0]
+    np.matmul(directions.reshape((count, -1, 3)), transforms4x4[:, :3, :3], out=out.reshape((count, -1, 3)))
+    return out
+
+
+def project_batch(points, projections4x4, out=None, buffer=None):
+    buffer = transform_batch(points, projections4x4, buffer)
+    out = _get_batch_output(points, 2, out)
+    np.divide(buffer[..., 0:2], buffer[..., 2:3], out=out)
+    return out
+
+
 def extrinsics_to_Rt(extrinsics):
     return (extrinsics[:3, :3], extrinsics[3, :3].reshape((1, 3)))
 
@@ -170,6 +229,14 @@ def rm_depth_undistort(depth, undistort_map):
     return cv2.remap(depth, undistort_map[:, :, 0], undistort_map[:, :, 1], cv2.INTER_NEAREST)
 
 
+def rm_depth_undistort_fixed(depth, undistort_map_nearest):
+    return cv2.remap(depth, undistort_map_nearest, None, cv2.INTER_NEAREST)
+
+
+def undistort_fixed(image, undistort_map_fixed, interpolation=cv2.INTER_LINEAR):
+    return cv2.remap(image, undistort_map_fixed[0], undistort_map_fixed[1], interpolation)
+
+
 def rm_depth_to_float(image):
     return image.astype(np.float32) / hl2ss._RANGEOF.U16_MAX
 
@@ -237,6 +304,208 @@ def su_normalize(mesh, location):
     mesh.vertex_positions = transform(mesh.vertex_positions, location)
 
 
+#------------------------------------------------------------------------------
+# Registration
+#------------------------------------------------------------------------------
+
+def depth_to_image(depth_extrinsics, depth_pose, image_intrinsics, image_extrinsics, image_pose):
+    return (camera_to_rignode(depth_extrinsics) @ reference_to_world(depth_pose) @ world_to_reference(image_pose) @ rignode_to_camera(image_extrinsics) @ camera_to_image(image_intrinsics)).astype(np.float32)
+
+
+class registration:
+    def __init__(self, xy1, image_width, image_height, occlusion=False, occlusion_tolerance=0.05):
+        self.depth_height, self.depth_width = xy1.shape[0:2]
+        self.image_width = image_width
+        self.image_height = image_height
+        self.occlusion = occlusion
+        self.occlusion_tolerance = occlusion_tolerance
+
+        count = self.depth_height * self.depth_width
+
+        self._xy1     = np.ascontiguousarray(block_to_list(xy1[..., 0:3]), dtype=np.float32)
+        self._uvw     = np.empty((count, 3), dtype=np.float32)
+        self._map     = np.empty((2, self.depth_height, self.depth_width), dtype=np.float32)
+        self._valid   = np.empty(count, dtype=np.bool_)
+        self._visible = np.empty(count, dtype=np.bool_)
+        self._pixel   = np.empty(count, dtype=np.int64)
+        self._scratch = np.empty(count, dtype=np.float32)
+        self._zbuffer = np.empty(image_height * image_width, dtype=np.float32)
+        self._timing  = {}
+
+    def _project(self, depth, depth_to_image4x4):
+        start = time.perf_counter()
+        u = self._map[0].reshape(-1)
+        v = self._map[1].reshape(-1)
+        z = self._uvw[:, 2]
+        np.matmul(self._xy1, depth_to_image4x4[:3, :3], out=self._uvw)
+        self._uvw *= depth.reshape((-1, 1))
+        self._uvw += depth_to_image4x4[3, :3]
+        np.greater(z, 0, out=self._valid)
+        self._valid &= depth.reshape(-1) > 0
+        u.fill(-1)
+        v.fill(-1)
+        np.divide(self._uvw[:, 0], z, out=u, where=self._valid)
+        np.divide(self._uvw[:, 1], z, out=v, where=self._valid)
+        self._valid &= (u >= 0) & (u <= (self.image_width - 1)) & (v >= 0) & (v <= (self.image_height - 1))
+        self._timing['project'] = time.perf_counter() - start
+
+    def _update_zbuffer(self):
+        start = time.perf_counter()
+        u = self._map[0].reshape(-1)
+        v = self._map[1].reshape(-1)
+        np.rint(v, out=self._scratch)
+        np.multiply(self._scratch, self.image_width, out=self._scratch)
+        self._scratch += np.rint(u)
+        self._pixel[:] = self._scratch
+        self._zbuffer.fill(np.inf)
+        np.minimum.at(self._zbuffer, self._pixel[self._valid], self._uvw[self._valid, 2])
+        self._timing['zbuffer'] = time.perf_counter() - start
+
+    def _update_visibility(self):
+        if (not self.occlusion):
+            self._visible[:] = self._valid
+            return
+        self._update_zbuffer()
+        start = time.perf_counter()
+        np.less_equal(self._uvw[:, 2], self._zbuffer[np.where(self._valid, self._pixel, 0)] + self.occlusion_tolerance, out=self._visible)
+        self._visible &= self._valid
+        self._timing['visibility'] = time.perf_counter() - start
+
+    def image_to_depth(self, depth, image, depth_to_image4x4, interpolation=cv2.INTER_LINEAR, out=None):
+        self._timing = {}
+        self._project(depth, depth_to_image4x4)
+        self._update_visibility()
+        start = time.perf_counter()
+        self._map[0].reshape(-1)[~self._visible] = -1
+        self._map[1].reshape(-1)[~self._visible] = -1
+        out = cv2.remap(image, self._map[0], self._map[1], interpolation, dst=out, borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+        self._timing['remap'] = time.perf_counter() - start
+        return out
+
+    def depth_to_image(self, depth, depth_to_image4x4, out=None):
+        self._timing = {}
+        self._project(depth, depth_to_image4x4)
+        self._update_zbuffer()
+        start = time.perf_counter()
+        if (out is None):
+            out = np.empty((self.image_height, self.image_width), dtype=np.float32)
+        np.copyto(out.reshape(-1), self._zbuffer)
+        out[np.isinf(out)] = 0
+        self._timing['splat'] = time.perf_counter() - start
+        return out
+
+    def get_map(self):
+        return self._map
+
+    def get_mask(self):
+        return self._visible.reshape((self.depth_height, self.depth_width))
+
+    def get_timing(self):
+        timing = dict(self._timing)
+        timing['total'] = sum(timing.values())
+        return timing
+
+
+#------------------------------------------------------------------------------
+# Voxel Accumulator
+#------------------------------------------------------------------------------
+
+_VOXEL_KEY_BITS   = 21
+_VOXEL_KEY_OFFSET = 1 << (_VOXEL_KEY_BITS - 1)
+_VOXEL_KEY_MASK   = (1 << _VOXEL_KEY_BITS) - 1
+
+
+def voxel_keys(points, voxel_size):
+    ijk = (np.floor(points / voxel_size).astype(np.int64) + _VOXEL_KEY_OFFSET) & _VOXEL_KEY_MASK
+    return (ijk[:, 0] << (2 * _VOXEL_KEY_BITS)) | (ijk[:, 1] << _VOXEL_KEY_BITS) | ijk[:, 2]
+
+
+class voxel_accumulator:
+    def __init__(self, voxel_size, labels=0, max_age=None, max_distance=None):
+        self.voxel_size = voxel_size
+        self.labels = labels
+        self.max_age = max_age
+        self.max_distance = max_distance
+        self.clear()
+
+    def clear(self):
+        self._keys   = np.zeros(0, dtype=np.int64)
+        self._count  = np.zeros(0, dtype=np.float64)
+        self._points = np.zeros((0, 3), dtype=np.float64)
+        self._colors = np.zeros((0, 3), dtype=np.float64)
+        self._votes  = np.zeros((0, self.labels), dtype=np.int32)
+        self._time   = np.zeros(0, dtype=np.float64)
+        self._frame  = 0
+
+    def __len__(self):
+        return self._keys.shape[0]
+
+    def push(self, points, colors=None, labels=None, timestamp=None, head_position=None):
+        points = block_to_list(points)
+        valid = np.all(np.isfinite(points), axis=-1)
+        points = points[valid]
+        timestamp = self._frame if (timestamp is None) else timestamp
+        self._frame += 1
+
+        keys, inverse, counts = np.unique(voxel_keys(points, self.voxel_size), return_inverse=True, return_counts=True)
+        size = keys.shape[0]
+
+        point_sums = np.stack([np.bincount(inverse, points[:, i], size) for i in range(3)], axis=-1)
+        color_sums = np.zeros((size, 3), dtype=np.float64) if (colors is None) else np.stack([np.bincount(inverse, channel, size) for channel in block_to_list(colors)[valid].T], axis=-1)
+        votes = np.zeros((size, self.labels), dtype=np.int32)
+        if ((labels is not None) and (self.labels > 0)):
+            labels = labels.reshape(-1)[valid].astype(np.int64)
+            known = (labels >= 0) & (labels < self.labels)
+            np.add.at(votes, (inverse[known], labels[known]), 1)
+
+        position = np.searchsorted(self._keys, keys)
+        found = position < self._keys.shape[0]
+        found[found] = self._keys[position[found]] == keys[found]
+
+        update = position[found]
+        self._count[update]  += counts[found]
+        self._points[update] += point_sums[found]
+        self._colors[update] += color_sums[found]
+        self._votes[update]  += votes[found]
+        self._time[update]    = timestamp
+
+        insert = position[~found]
+        self._keys   = np.insert(self._keys,   insert, keys[~found])
+        self._count  = np.insert(self._count,  insert, counts[~found])
+        self._points = np.insert(self._points, insert, point_sums[~found], axis=0)
+        self._colors = np.insert(self._colors, insert, color_sums[~found], axis=0)
+        self._votes  = np.insert(self._votes,  insert, votes[~found], axis=0)
+        self._time   = np.insert(self._time,   insert, timestamp)
+
+        self.evict(timestamp, head_position)
+
+    def evict(self, timestamp=None, head_position=None):
+        keep = np.ones(self._keys.shape[0], dtype=np.bool_)
+        if ((self.max_age is not None) and (timestamp is not None)):
+            keep &= (timestamp - self._time) <= self.max_age
+        if ((self.max_distance is not None) and (head_position is not None)):
+            keep &= compute_norm(self.get_points() - np.asarray(head_position, dtype=np.float32).reshape((1, 3))) <= self.max_distance
+        if (not np.all(keep)):
+            self._keys   = self._keys[keep]
+            self._count  = self._count[keep]
+            self._points = self._points[keep]
+            self._colors = self._colors[keep]
+            self._votes  = self._votes[keep]
+            self._time   = self._time[keep]
+
+    def get_points(self):
+        return (self._points / self._count[:, np.newaxis]).astype(np.float32)
+
+    def get_colors(self):
+        return (self._colors / self._count[:, np.newaxis]).astype(np.float32)
+
+    def get_labels(self):
+        return np.argmax(self._votes, axis=-1).astype(np.int32) if (self.labels > 0) else np.zeros(self._keys.shape[0], dtype=np.int32)
+
+    def get_counts(self):
+        return self._count.astype(np.int32)
+
+
 #------------------------------------------------------------------------------
 # Calibration
 #------------------------------------------------------------------------------
@@ -406,6 +675,198 @@ def _load_calibration_rm(port, path):
     return None
 
 
+#------------------------------------------------------------------------------
+# Calibration Store
+#------------------------------------------------------------------------------
+
+_CALIBRATION_STORE_MAGIC   = 'HL2SSCAL'
+_CALIBRATION_STORE_VERSION = 1
+
+_CALIBRATION_FIELDS_RM_VLC             = ['uv2xy', 'extrinsics', 'undistort_map', 'intrinsics']
+_CALIBRATION_FIELDS_RM_DEPTH_AHAT      = ['uv2xy', 'extrinsics', 'scale', 'alias', 'undistort_map', 'intrinsics']
+_CALIBRATION_FIELDS_RM_DEPTH_LONGTHROW = ['uv2xy', 'extrinsics', 'scale', 'undistort_map', 'intrinsics']
+_CALIBRATION_FIELDS_RM_IMU             = ['extrinsics']
+_CALIBRATION_FIELDS_PV                 = ['focal_length', 'principal_point', 'radial_distortion', 'tangential_distortion', 'projection', 'intrinsics']
+_STEREO_CALIBRATION_FIELDS             = ['R', 't', 'E', 'F']
+_STEREO_RECTIFICATION_FIELDS           = ['R1', 'R2', 'P1', 'P2', 'Q', 'roi1', 'roi2', 'map1', 'map2']
+
+_calibration_stores = dict()
+
+
+def _get_calibration_layout_rm(port):
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return (_CALIBRATION_FIELDS_RM_VLC,             hl2ss._Mode2_RM_VLC)
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return (_CALIBRATION_FIELDS_RM_VLC,             hl2ss._Mode2_RM_VLC)
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return (_CALIBRATION_FIELDS_RM_VLC,             hl2ss._Mode2_RM_VLC)
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return (_CALIBRATION_FIELDS_RM_VLC,             hl2ss._Mode2_RM_VLC)
+    if (port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return (_CALIBRATION_FIELDS_RM_DEPTH_AHAT,      hl2ss._Mode2_RM_DEPTH_AHAT)
+    if (port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return (_CALIBRATION_FIELDS_RM_DEPTH_LONGTHROW, hl2ss._Mode2_RM_DEPTH_LONGTHROW)
+    if (port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+        return (_CALIBRATION_FIELDS_RM_IMU,             hl2ss._Mode2_RM_IMU)
+    if (port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+        return (_CALIBRATION_FIELDS_RM_IMU,             hl2ss._Mode2_RM_IMU)
+
+    return None
+
+
+def _calibration_key_rm(port):
+    return hl2ss.get_port_name(port)
+
+
+def _calibration_key_pv(port, focus, width, height):
+    return f'{hl2ss.get_port_name(port)}/{int(focus)}_{int(width)}_{int(height)}'
+
+
+def _calibration_key_pv_extrinsics(port):
+    return hl2ss.get_port_name(port)
+
+
+def _calibration_key_stereo(port_1, port_2):
+    return hl2ss.get_port_name(port_1) + '.' + hl2ss.get_port_name(port_2)
+
+
+def get_calibration_store_filename(path):
+    return os.path.join(path, 'calibration.npz')
+
+
+def _load_npz_mapped(filename):
+    arrays = dict()
+    with open(filename, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        with zipfile.ZipFile(file) as archive:
+            for info in archive.infolist():
+                if (not info.filename.endswith('.npy')):
+                    continue
+                name = info.filename[:-4]
+                if (info.compress_type != zipfile.ZIP_STORED):
+                    with archive.open(info) as member:
+                        arrays[name] = np.lib.format.read_array(member)
+                    continue
+                name_length, extra_length = struct.unpack_from('<HH', data, info.header_offset + 26)
+                file.seek(info.header_offset + 30 + name_length + extra_length)
+                version = np.lib.format.read_magic(file)
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file) if (version == (1, 0)) else np.lib.format.read_array_header_2_0(file)
+                count = int(np.prod(shape))
+                array = np.frombuffer(data, dtype=dtype, count=count, offset=file.tell()) if (count > 0) else np.zeros(0, dtype=dtype)
+                array = array.reshape(shape[::-1]).transpose() if (fortran_order) else array.reshape(shape)
+                array.flags.writeable = False
+                arrays[name] = array
+    return arrays
+
+
+def load_calibration_store(path):
+    filename = get_calibration_store_filename(path)
+    if (not os.path.isfile(filename)):
+        return None
+    status = os.stat(filename)
+    signature = (status.st_mtime_ns, status.st_size)
+    cached = _calibration_stores.get(filename, None)
+    if ((cached is not None) and (cached[0] == signature)):
+        return cached[1]
+    store = _load_npz_mapped(filename)
+    if ((str(store.get('__magic__', '')) != _CALIBRATION_STORE_MAGIC) or (int(store.get('__version__', -1)) != _CALIBRATION_STORE_VERSION)):
+        raise Exception(f'{filename} is not a version {_CALIBRATION_STORE_VERSION} hl2ss calibration store')
+    _calibration_stores[filename] = (signature, store)
+    return store
+
+
+def save_calibration_store(path, store):
+    filename = get_calibration_store_filename(path)
+    arrays = {name : np.asarray(value) for name, value in store.items() if (not name.startswith('__'))}
+    arrays['__magic__'] = np.array(_CALIBRATION_STORE_MAGIC)
+    arrays['__version__'] = np.array(_CALIBRATION_STORE_VERSION, dtype=np.int32)
+    temporary = f'{filename}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        np.savez(file, **arrays)
+    _calibration_stores.pop(filename, None)
+    os.replace(temporary, filename)
+
+
+def _get_source_signature(source):
+    if (os.path.isdir(source)):
+        names = [os.path.join(source, name) for name in os.listdir(source)]
+    elif (os.path.isfile(source)):
+        names = [source]
+    else:
+        return -1
+    return max([os.stat(name).st_mtime_ns for name in names], default=0)
+
+
+def _store_source_name(key, fields):
+    return f'{key}/__source__.{fields[0]}'
+
+
+def _store_get(store, key, fields, constructor, source):
+    if (store is None):
+        return None
+    names = [f'{key}/{field}' for field in fields]
+    signature = _store_source_name(key, fields)
+    if ((not all([name in store for name in names + [signature]])) or (int(store[signature]) != _get_source_signature(source))):
+        return None
+    return constructor(*[np.array(store[name]) for name in names])
+
+
+def _store_entries(key, fields, values, source):
+    entries = {f'{key}/{field}' : np.asarray(value) for field, value in zip(fields, values)}
+    entries[_store_source_name(key, fields)] = np.array(_get_source_signature(source), dtype=np.int64)
+    return entries
+
+
+def _store_entries_from(key, fields, calibration, source):
+    return _store_entries(key, fields, [getattr(calibration, field) for field in fields], source)
+
+
+def _store_update(path, entries):
+    store = load_calibration_store(path)
+    store = dict() if (store is None) else {name : np.array(value) for name, value in store.items()}
+    store.update(entries)
+    save_calibration_store(path, store)
+
+
+def migrate_calibration_store(path):
+    _check_calibration_directory(path)
+    store = dict()
+    migrated = []
+
+    for port in [hl2ss.StreamPort.RM_VLC_LEFTFRONT, hl2ss.StreamPort.RM_VLC_LEFTLEFT, hl2ss.StreamPort.RM_VLC_RIGHTFRONT, hl2ss.StreamPort.RM_VLC_RIGHTRIGHT, hl2ss.StreamPort.RM_DEPTH_AHAT, hl2ss.StreamPort.RM_DEPTH_LONGTHROW, hl2ss.StreamPort.RM_IMU_ACCELEROMETER, hl2ss.StreamPort.RM_IMU_GYROSCOPE]:
+        base = _calibration_subdirectory(port, path)
+        if (not os.path.isdir(base)):
+            continue
+        store.update(_store_entries_from(_calibration_key_rm(port), _get_calibration_layout_rm(port)[0], _load_calibration_rm(port, base), base))
+        migrated.append(_calibration_key_rm(port))
+
+    port = hl2ss.StreamPort.PERSONAL_VIDEO
+    root = _calibration_subdirectory(port, path)
+    if (os.path.isdir(root)):
+        if (os.path.isfile(os.path.join(root, 'extrinsics.bin'))):
+            store.update(_store_entries(_calibration_key_pv_extrinsics(port), ['extrinsics'], [_load_extrinsics_pv(root)], os.path.join(root, 'extrinsics.bin')))
+            migrated.append(_calibration_key_pv_extrinsics(port) + '/extrinsics')
+        for name in sorted(os.listdir(root)):
+            fields = name.split('_')
+            if ((not os.path.isdir(os.path.join(root, name))) or (len(fields) != 3) or (not all([field.isdigit() for field in fields]))):
+                continue
+            store.update(_store_entries_from(_calibration_key_pv(port, *fields), _CALIBRATION_FIELDS_PV, _load_calibration_pv(os.path.join(root, name)), os.path.join(root, name)))
+            migrated.append(_calibration_key_pv(port, *fields))
+
+    for name in sorted(os.listdir(path)):
+        base = os.path.join(path, name)
+        if ((not os.path.isdir(base)) or (len(name.split('.')) != 2)):
+            continue
+        if (os.path.isfile(os.path.join(base, 'R.bin'))):
+            store.update(_store_entries_from(name, _STEREO_CALIBRATION_FIELDS, _load_stereo_calibration(base), base))
+        if (os.path.isfile(os.path.join(base, 'map_shape.bin'))):
+            store.update(_store_entries_from(name, _STEREO_RECTIFICATION_FIELDS, _load_stereo_rectification(base), base))
+        migrated.append(name)
+
+    save_calibration_store(path, store)
+    return migrated
+
+
 #------------------------------------------------------------------------------
 # Calibration Manager
 #------------------------------------------------------------------------------
@@ -413,7 +874,7 @@ def _load_calibration_rm(port, path):
 class _Mode2_PV(hl2ss._Mode2_PV):
     def __init__(self, mode2, extrinsics):
         super().__init__(mode2.focal_length, mode2.principal_point, mode2.radial_distortion, mode2.tangential_distortion, mode2.projection, mode2.intrinsics)
-        self.extrinsics = extrinsics
+        self.extrinsics            = extrinsics
 
 
 def _check_calibration_directory(path):
@@ -429,10 +890,20 @@ def _calibration_subdirectory_pv(focus, width, height, path):
     return os.path.join(path, f'{int(focus)}_{int(width)}_{int(height)}')
 
 
+# The bin folders under path are the source of truth. The calibration store
+# caches them: each entry records the modification time of the files it was
+# built from and is only served while they are unchanged. Otherwise the folder
+# is read (or the calibration downloaded into it) and the entry refreshed,
+# creating the store if needed.
+
 def get_calibration_rm(host, port, path):
     _check_calibration_directory(path)
 
+    fields, constructor = _get_calibration_layout_rm(port)
     base = _calibration_subdirectory(port, path)
+    calibration = _store_get(load_calibration_store(path), _calibration_key_rm(port), fields, constructor, base)
+    if (calibration is not None):
+        return calibration
 
     try:
         calibration = _load_calibration_rm(port, base)
@@ -441,22 +912,39 @@ def get_calibration_rm(host, port, path):
         os.makedirs(base, exist_ok=True)
         _save_calibration_rm(port, calibration, base)
 
+    _store_update(path, _store_entries_from(_calibration_key_rm(port), fields, calibration, base))
     return calibration
 
 
 def get_calibration_pv(host, port, path, focus, width, height, framerate, load_extrinsics):
     _check_calibration_directory(path)
 
+    store = load_calibration_store(path)
     root = _calibration_subdirectory(port, path)
     base = _calibration_subdirectory_pv(focus, width, height, root)
-    extrinsics = _load_extrinsics_pv(root) if (load_extrinsics) else None
-
-    try:
-        calibration = _load_calibration_pv(base)
-    except:
-        calibration = hl2ss_lnm.download_calibration_pv(host, port, width, height, framerate)
-        os.makedirs(base, exist_ok=True)
-        _save_calibration_pv(calibration, base)
+    key = _calibration_key_pv(port, focus, width, height)
+    entries = dict()
+
+    extrinsics = None
+    if (load_extrinsics):
+        source = os.path.join(root, 'extrinsics.bin')
+        extrinsics = _store_get(store, _calibration_key_pv_extrinsics(port), ['extrinsics'], lambda extrinsics : extrinsics, source)
+        if (extrinsics is None):
+            extrinsics = _load_extrinsics_pv(root)
+            entries.update(_store_entries(_calibration_key_pv_extrinsics(port), ['extrinsics'], [extrinsics], source))
+
+    calibration = _store_get(store, key, _CALIBRATION_FIELDS_PV, hl2ss._Mode2_PV, base)
+    if (calibration is None):
+        try:
+            calibration = _load_calibration_pv(base)
+        except:
+            calibration = hl2ss_lnm.download_calibration_pv(host, port, width, height, framerate)
+            os.makedirs(base, exist_ok=True)
+            _save_calibration_pv(calibration, base)
+        entries.update(_store_entries_from(key, _CALIBRATION_FIELDS_PV, calibration, base))
+
+    if (len(entries) > 0):
+        _store_update(path, entries)
         
     return _Mode2_PV(calibration, extrinsics)
 
@@ -466,8 +954,135 @@ def save_extrinsics_pv(port, extrinsics, path):
 
     base = _calibration_subdirectory(port, path)
     os.makedirs(base, exist_ok=True)
+    result = _save_extrinsics_pv(extrinsics, base)
+    _store_update(path, _store_entries(_calibration_key_pv_extrinsics(port), ['extrinsics'], [extrinsics], os.path.join(base, 'extrinsics.bin')))
+
+    return result
+
+
+#------------------------------------------------------------------------------
+# Calibration Cache
+#------------------------------------------------------------------------------
 
-    return _save_extrinsics_pv(extrinsics, base)
+class _CalibrationTables:
+    def __init__(self, intrinsics, extrinsics, uv2xy, xy1, scale, undistort_map_1, undistort_map_2, undistort_map_nearest, rotated_intrinsics, rotated_extrinsics):
+        self.intrinsics            = intrinsics
+        self.extrinsics            = extrinsics
+        self.uv2xy                 = uv2xy
+        self.xy1                   = xy1
+        self.scale                 = scale
+        self.undistort_map_1       = undistort_map_1
+        self.undistort_map_2       = undistort_map_2
+        self.undistort_map_nearest = undistort_map_nearest
+        self.rotated_intrinsics    = rotated_intrinsics
+        self.rotated_extrinsics    = rotated_extrinsics
+
+    def get_undistort_map_fixed(self):
+        return (self.undistort_map_1, self.undistort_map_2)
+
+
+_CALIBRATION_TABLES_FIELDS = ['intrinsics', 'extrinsics', 'uv2xy', 'xy1', 'scale', 'undistort_map_1', 'undistort_map_2', 'undistort_map_nearest', 'rotated_intrinsics', 'rotated_extrinsics']
+
+
+def _get_array_digest(array):
+    return b'' if (array is None) else hashlib.sha1(np.ascontiguousarray(array, dtype=np.float32)).digest()
+
+
+def _get_table_digests(undistort_map, uv2xy):
+    return (_get_array_digest(undistort_map), _get_array_digest(uv2xy))
+
+
+def _get_calibration_key(port, intrinsics, width, height, extrinsics, depth_scale, table_digests):
+    digest = hashlib.sha1()
+    for array in [intrinsics, extrinsics, depth_scale]:
+        digest.update(b'' if (array is None) else np.ascontiguousarray(array, dtype=np.float32))
+        digest.update(b'|')
+    for table_digest in table_digests:
+        digest.update(table_digest)
+        digest.update(b'|')
+    return (int(port), digest.hexdigest(), int(width), int(height))
+
+
+def _create_calibration_tables(port, intrinsics, width, height, extrinsics, undistort_map, depth_scale, uv2xy):
+    intrinsics = intrinsics.astype(np.float32)
+    extrinsics = None if (extrinsics is None) else extrinsics.astype(np.float32)
+    uv2xy = compute_uv2xy(intrinsics, width, height) if (uv2xy is None) else uv2xy.astype(np.float32)
+    xy1, scale = rm_depth_compute_rays(uv2xy, np.float32(1) if (depth_scale is None) else depth_scale.astype(np.float32))
+    undistort_map_1, undistort_map_2 = (None, None) if (undistort_map is None) else cv2.convertMaps(undistort_map[:, :, 0], undistort_map[:, :, 1], cv2.CV_16SC2)
+    undistort_map_nearest = None if (undistort_map is None) else cv2.convertMaps(undistort_map[:, :, 0], undistort_map[:, :, 1], cv2.CV_16SC2, nninterpolation=True)[0]
+    rotation = rm_vlc_get_rotation(port)
+    rotated_intrinsics, rotated_extrinsics = (None, None) if ((rotation is None) or (extrinsics is None)) else rm_vlc_rotate_calibration(intrinsics, extrinsics, rotation)
+    return _CalibrationTables(intrinsics, extrinsics, uv2xy, xy1, scale, undistort_map_1, undistort_map_2, undistort_map_nearest, rotated_intrinsics, rotated_extrinsics)
+
+
+def _save_calibration_tables(tables, filename):
+    np.savez(filename, **{name : getattr(tables, name) for name in _CALIBRATION_TABLES_FIELDS if (getattr(tables, name) is not None)})
+
+
+def _load_calibration_tables(filename):
+    with np.load(filename) as data:
+        return _CalibrationTables(*[data[name] if (name in data.files) else None for name in _CALIBRATION_TABLES_FIELDS])
+
+
+class calibration_cache:
+    def __init__(self, capacity=16, path=None):
+        self.capacity = capacity
+        self.path = path
+        self._tables = collections.OrderedDict()
+        self._table_digests = collections.OrderedDict()
+
+    def _get_filename(self, key):
+        port, digest, width, height = key
+        return os.path.join(self.path, f'{hl2ss.get_port_name(port)}_{width}_{height}_{digest}.npz')
+
+    def get(self, port, intrinsics, width, height, extrinsics=None, undistort_map=None, depth_scale=None, uv2xy=None):
+        return self._get(port, intrinsics, width, height, extrinsics, undistort_map, depth_scale, uv2xy, _get_table_digests(undistort_map, uv2xy))
+
+    def _get_rm_table_digests(self, calibration):
+        # The large RM tables are hashed once per calibration object and reused
+        # while it holds the same arrays; the entry keeps them alive so their
+        # ids cannot be recycled. Assign new arrays instead of editing in place
+        undistort_map = calibration.undistort_map
+        uv2xy = getattr(calibration, 'uv2xy', None)
+        entry = self._table_digests.get(id(calibration), None)
+        if ((entry is None) or (entry[1] is not undistort_map) or (entry[2] is not uv2xy)):
+            entry = (calibration, undistort_map, uv2xy, _get_table_digests(undistort_map, uv2xy))
+            self._table_digests[id(calibration)] = entry
+            while (len(self._table_digests) > self.capacity):
+                self._table_digests.popitem(last=False)
+        else:
+            self._table_digests.move_to_end(id(calibration))
+        return entry[3]
+
+    def _get(self, port, intrinsics, width, height, extrinsics, undistort_map, depth_scale, uv2xy, table_digests):
+        key = _get_calibration_key(port, intrinsics, width, height, extrinsics, depth_scale, table_digests)
+        tables = self._tables.get(key, None)
+        if (tables is not None):
+            self._tables.move_to_end(key)
+            return tables
+        filename = None if (self.path is None) else self._get_filename(key)
+        if ((filename is not None) and os.path.isfile(filename)):
+            tables = _load_calibration_tables(filename)
+        else:
+            tables = _create_calibration_tables(port, intrinsics, width, height, extrinsics, undistort_map, depth_scale, uv2xy)
+            if (filename is not None):
+                os.makedirs(self.path, exist_ok=True)
+                _save_calibration_tables(tables, filename)
+        self._tables[key] = tables
+        while (len(self._tables) > self.capacity):
+            self._tables.popitem(last=False)
+        return tables
+
+    def get_rm(self, port, calibration):
+        width, height = calibration.undistort_map.shape[1], calibration.undistort_map.shape[0]
+        return self._get(port, calibration.intrinsics, width, height, calibration.extrinsics, calibration.undistort_map, getattr(calibration, 'scale', None), getattr(calibration, 'uv2xy', None), self._get_rm_table_digests(calibration))
+
+    def get_pv(self, port, intrinsics, width, height, extrinsics=None):
+        return self.get(port, intrinsics, width, height, extrinsics)
+
+    def clear(self):
+        self._tables.clear()
+        self._table_digests.clear()
 
 
 #------------------------------------------------------------------------------
@@ -522,6 +1137,95 @@ def rm_vlc_stereo_rectify(intrinsics_1, intrinsics_2, R_1_to_2, t_1_to_2, image_
     return _StereoRectification(R1, R2, P1, P2, Q, roi1, roi2, np.dstack((map1x, map1y)), np.dstack((map2x, map2y))) # float64, opencv shape
 
 
+def rm_vlc_unrotate_map(map_x, map_y, rotation):
+    if (rotation == cv2.ROTATE_90_CLOCKWISE):
+        return (map_y, (hl2ss.Parameters_RM_VLC.HEIGHT - 1) - map_x)
+    if (rotation == cv2.ROTATE_90_COUNTERCLOCKWISE):
+        return ((hl2ss.Parameters_RM_VLC.WIDTH - 1) - map_y, map_x)
+
+    return (map_x, map_y)
+
+
+def rm_vlc_fuse_maps(rectify_map, rotation, undistort_map=None):
+    map_x, map_y = rm_vlc_unrotate_map(rectify_map[:, :, 0].astype(np.float32), rectify_map[:, :, 1].astype(np.float32), rotation)
+    if (undistort_map is None):
+        return (map_x, map_y)
+    return (cv2.remap(undistort_map[:, :, 0], map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=-1), cv2.remap(undistort_map[:, :, 1], map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT, borderValue=-1))
+
+
+def _get_stereo_crop(roi1, roi2, shape):
+    if ((roi1[2] <= 0) or (roi1[3] <= 0) or (roi2[2] <= 0) or (roi2[3] <= 0)):
+        return (0, 0, shape[1], shape[0])
+    x = min([roi1[0], roi2[0]])
+    y = max([roi1[1], roi2[1]])
+    w = max([roi1[0] + roi1[2], roi2[0] + roi2[2]]) - x
+    h = min([roi1[1] + roi1[3], roi2[1] + roi2[3]]) - y
+    return (int(x), int(y), int(w), int(max([h, 0])))
+
+
+class rm_vlc_stereo_rectifier:
+    def __init__(self, port_1, port_2, calibration_1, calibration_2, rectification=None, crop=True, undistort=True, interpolation=cv2.INTER_LINEAR, map_type=cv2.CV_16SC2, calibration=None):
+        self.port_1 = port_1
+        self.port_2 = port_2
+        self.interpolation = interpolation
+        self.map_type = map_type
+
+        rotation_1 = rm_vlc_get_rotation(port_1)
+        rotation_2 = rm_vlc_get_rotation(port_2)
+
+        # The stereo calibration is only needed to compute a rectification
+        self.calibration = calibration
+        self.rectification = rectification
+        if (self.rectification is None):
+            K1, Rt1 = rm_vlc_rotate_calibration(calibration_1.intrinsics, calibration_1.extrinsics, rotation_1)
+            K2, Rt2 = rm_vlc_rotate_calibration(calibration_2.intrinsics, calibration_2.extrinsics, rotation_2)
+            if (self.calibration is None):
+                self.calibration = rm_vlc_stereo_calibrate(K1, K2, Rt1, Rt2)
+            self.rectification = rm_vlc_stereo_rectify(K1, K2, self.calibration.R, self.calibration.t, hl2ss.Parameters_RM_VLC.SHAPE)
+
+        shape = self.rectification.map1.shape[0:2]
+        self.x, self.y, self.width, self.height = _get_stereo_crop(self.rectification.roi1, self.rectification.roi2, shape) if (crop) else (0, 0, shape[1], shape[0])
+
+        self.P1 = self.rectification.P1.copy()
+        self.P2 = self.rectification.P2.copy()
+        self.Q  = self.rectification.Q.copy()
+        self.P1[0:2, 2] -= (self.x, self.y)
+        self.P2[0:2, 2] -= (self.x, self.y)
+        self.Q[0:2, 3]  += (self.x, self.y)
+
+        self._maps_1 = self.__create_maps(self.rectification.map1, rotation_1, calibration_1.undistort_map if (undistort) else None)
+        self._maps_2 = self.__create_maps(self.rectification.map2, rotation_2, calibration_2.undistort_map if (undistort) else None)
+        self._pair = None
+
+    def __create_maps(self, rectify_map, rotation, undistort_map):
+        window = rectify_map[self.y:(self.y + self.height), self.x:(self.x + self.width)]
+        map_x, map_y = rm_vlc_fuse_maps(window, rotation, undistort_map)
+        if (self.map_type == cv2.CV_32FC1):
+            return (map_x, map_y)
+        if (self.interpolation == cv2.INTER_NEAREST):
+            return (cv2.convertMaps(map_x, map_y, self.map_type, nninterpolation=True)[0], None)
+        return cv2.convertMaps(map_x, map_y, self.map_type)
+
+    def get_maps(self):
+        return (self._maps_1, self._maps_2)
+
+    def rectify_1(self, image, out=None):
+        return cv2.remap(image, self._maps_1[0], self._maps_1[1], self.interpolation, dst=out)
+
+    def rectify_2(self, image, out=None):
+        return cv2.remap(image, self._maps_2[0], self._maps_2[1], self.interpolation, dst=out)
+
+    def rectify(self, image_1, image_2, out=None):
+        if (out is None):
+            shape = (2, self.height, self.width) + image_1.shape[2:]
+            if ((self._pair is None) or (self._pair.shape != shape) or (self._pair.dtype != image_1.dtype)):
+                self._pair = np.empty(shape, dtype=image_1.dtype)
+            out = self._pair
+        self.rectify_1(image_1, out[0])
+        self.rectify_2(image_2, out[1])
+        return out
+
+
 def _stereo_subdirectory(port_1, port_2, path):
     name_1 = hl2ss.get_port_name(port_1)
     name_2 = hl2ss.get_port_name(port_2)
@@ -578,24 +1282,38 @@ def save_stereo_calibration(port_1, port_2, calibration, path):
     _check_calibration_directory(path)
     base = _stereo_subdirectory(port_1, port_2, path)
     os.makedirs(base, exist_ok=True)
-    return _save_stereo_calibration(calibration, base)
+    result = _save_stereo_calibration(calibration, base)
+    _store_update(path, _store_entries_from(_calibration_key_stereo(port_1, port_2), _STEREO_CALIBRATION_FIELDS, calibration, base))
+    return result
     
 
 def save_stereo_rectification(port_1, port_2, rectification, path):
     _check_calibration_directory(path)
     base = _stereo_subdirectory(port_1, port_2, path)
     os.makedirs(base, exist_ok=True)
-    return _save_stereo_rectification(rectification, base)
+    result = _save_stereo_rectification(rectification, base)
+    _store_update(path, _store_entries_from(_calibration_key_stereo(port_1, port_2), _STEREO_RECTIFICATION_FIELDS, rectification, base))
+    return result
 
 
 def load_stereo_calibration(port_1, port_2, path):
     _check_calibration_directory(path)
     base = _stereo_subdirectory(port_1, port_2, path)
-    return _load_stereo_calibration(base)
+    calibration = _store_get(load_calibration_store(path), _calibration_key_stereo(port_1, port_2), _STEREO_CALIBRATION_FIELDS, _StereoCalibration, base)
+    if (calibration is not None):
+        return calibration
+    calibration = _load_stereo_calibration(base)
+    _store_update(path, _store_entries_from(_calibration_key_stereo(port_1, port_2), _STEREO_CALIBRATION_FIELDS, calibration, base))
+    return calibration
 
 
 def load_stereo_rectification(port_1, port_2, path):
     _check_calibration_directory(path)
     base = _stereo_subdirectory(port_1, port_2, path)
-    return _load_stereo_rectification(base)
+    rectification = _store_get(load_calibration_store(path), _calibration_key_stereo(port_1, port_2), _STEREO_RECTIFICATION_FIELDS, _StereoRectification, base)
+    if (rectification is not None):
+        return rectification
+    rectification = _load_stereo_rectification(base)
+    _store_update(path, _store_entries_from(_calibration_key_stereo(port_1, port_2), _STEREO_RECTIFICATION_FIELDS, rectification, base))
+    return rectification
 
@@ -1,10 +1,132 @@
 
+import os
+import io
+import pickle
+import traceback
+import json
+import zlib
+import mmap
+import heapq
+import collections
+import concurrent.futures
+import multiprocessing as mp
+import queue
+import threading
 import struct
+import time
 import types
+import numpy as np
 import hl2ss
+import hl2ss_lnm
 
 
 _MAGIC = 'HL2SSV23'
+_COMPRESSED_MAGIC = 'HL2SSC23'
+_CONTAINER_MAGIC = 'HL2SSK23'
+_INDEX_MAGIC = 'HL2SSI23'
+_MANIFEST_MAGIC = 'HL2SSM23'
+
+
+#------------------------------------------------------------------------------
+# Index
+#------------------------------------------------------------------------------
+
+_INDEX_DTYPE = np.dtype([('timestamp', '<u8'), ('offset', '<u8'), ('key', 'u1')])
+
+
+def get_index_filename(filename):
+    return filename + '.idx'
+
+
+class _index_writer:
+    def open(self, filename):
+        self._filename = filename
+        self._data = bytearray()
+        self._count = 0
+
+    def add(self, timestamp, offset, key):
+        self._data.extend(struct.pack('<QQB', timestamp, offset, 1 if (key) else 0))
+        self._count += 1
+
+    def close(self, size):
+        with open(self._filename, 'wb') as file:
+            file.write(struct.pack(f'<{len(_INDEX_MAGIC)}sQQ', _INDEX_MAGIC.encode(), self._count, size))
+            file.write(self._data)
+
+
+def save_index(filename, index, size):
+    with open(get_index_filename(filename), 'wb') as file:
+        file.write(struct.pack(f'<{len(_INDEX_MAGIC)}sQQ', _INDEX_MAGIC.encode(), index.shape[0], size))
+        file.write(index.astype(_INDEX_DTYPE).tobytes())
+
+
+def load_index(filename):
+    if (is_manifest(filename)):
+        return _load_index_segmented(filename)
+    if (is_container_stream(filename)):
+        filename, port = _split_container_stream(filename)
+        return load_container(filename)[1][port]
+    index_filename = get_index_filename(filename)
+    if (not os.path.isfile(index_filename)):
+        return None
+    with open(index_filename, 'rb') as file:
+        header_format = f'<{len(_INDEX_MAGIC)}sQQ'
+        magic, count, size = struct.unpack(header_format, file.read(struct.calcsize(header_format)))
+        if ((magic.decode() != _INDEX_MAGIC) or (size != os.path.getsize(filename))):
+            return None
+        return np.frombuffer(file.read(count * _INDEX_DTYPE.itemsize), dtype=_INDEX_DTYPE)
+
+
+def _load_index_segmented(filename):
+    manifest = load_manifest(filename)
+    bases = get_segment_bases(manifest)
+    indices = []
+    for segment, base in zip(manifest['segments'], bases):
+        index = load_index(get_segment_path(filename, segment))
+        if (index is None):
+            return None
+        index = index.copy()
+        index['offset'] += base
+        indices.append(index)
+    return np.concatenate(indices) if (len(indices) > 0) else np.zeros(0, dtype=_INDEX_DTYPE)
+
+
+#------------------------------------------------------------------------------
+# Manifest
+#------------------------------------------------------------------------------
+
+def get_manifest_filename(filename):
+    return os.path.splitext(filename)[0] + '.json'
+
+
+def get_segment_filename(filename, index):
+    root, extension = os.path.splitext(filename)
+    return f'{root}.{index:05d}{extension}'
+
+
+def get_segment_path(filename, segment):
+    return os.path.join(os.path.dirname(filename), segment['filename'])
+
+
+def get_segment_bases(manifest):
+    return np.cumsum([0] + [segment['size'] for segment in manifest['segments']], dtype=np.uint64)[:-1]
+
+
+def is_manifest(filename):
+    return os.path.splitext(filename)[1].lower() == '.json'
+
+
+def save_manifest(filename, port, segments):
+    with open(filename, 'w') as file:
+        json.dump({'magic' : _MANIFEST_MAGIC, 'port' : int(port), 'segments' : segments}, file, indent=4)
+
+
+def load_manifest(filename):
+    with open(filename, 'r') as file:
+        manifest = json.load(file)
+    if (manifest.get('magic', None) != _MANIFEST_MAGIC):
+        raise Exception(f'{filename} is not a hl2ss segment manifest')
+    return manifest
 
 
 #------------------------------------------------------------------------------
@@ -14,15 +136,29 @@ _MAGIC = 'HL2SSV23'
 class _writer:
     def open(self, filename):
         self._file = open(filename, 'wb')
+        self._index = _index_writer()
+        self._index.open(get_index_filename(filename))
+        self._offset = 0
 
     def put(self, data):
         self._file.write(data)
+        self._offset += len(data)
 
-    def write(self, packet):
-        self._file.write(hl2ss.pack_packet(packet))
+    def write(self, packet, key=True):
+        self._index.add(packet.timestamp, self._offset, key)
+        self.put(hl2ss.pack_packet(packet))
+
+    def patch(self, offset, data):
+        self._file.seek(offset)
+        self._file.write(data)
+        self._file.seek(self._offset)
+
+    def tell(self):
+        return self._offset
 
     def close(self):
         self._file.close()
+        self._index.close(self._offset)
 
 
 #------------------------------------------------------------------------------
@@ -104,7 +240,18 @@ def _create_wr_eet(filename, port, fps, user):
 # Writer Wrappers
 #------------------------------------------------------------------------------
 
-class wr_rm_vlc(hl2ss._context_manager):
+class _wr(hl2ss._context_manager):
+    def write(self, packet):
+        self._wr.write(packet, hl2ss_lnm.is_key_frame(self, packet.payload))
+
+    def tell(self):
+        return self._wr.tell()
+
+    def close(self):
+        self._wr.close()
+
+
+class wr_rm_vlc(_wr):
     def __init__(self, filename, port, mode, divisor, profile, level, bitrate, options, user):
         self.filename = filename
         self.port = port
@@ -119,14 +266,8 @@ class wr_rm_vlc(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_rm_vlc(self.filename, self.port, self.mode, self.divisor, self.profile, self.level, self.bitrate, self.options, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
-
-    def close(self):
-        self._wr.close()
-
 
-class wr_rm_depth_ahat(hl2ss._context_manager):
+class wr_rm_depth_ahat(_wr):
     def __init__(self, filename, port, mode, divisor, profile_z, profile_ab, level, bitrate, options, user):
         self.filename = filename
         self.port = port
@@ -142,14 +283,8 @@ class wr_rm_depth_ahat(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_rm_depth_ahat(self.filename, self.port, self.mode, self.divisor, self.profile_z, self.profile_ab, self.level, self.bitrate, self.options, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
 
-    def close(self):
-        self._wr.close()
-
-
-class wr_rm_depth_longthrow(hl2ss._context_manager):
+class wr_rm_depth_longthrow(_wr):
     def __init__(self, filename, port, mode, divisor, png_filter, user):
         self.filename = filename
         self.port = port
@@ -161,14 +296,8 @@ class wr_rm_depth_longthrow(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_rm_depth_longthrow(self.filename, self.port, self.mode, self.divisor, self.png_filter, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
-
-    def close(self):
-        self._wr.close()
-
 
-class wr_rm_imu(hl2ss._context_manager):
+class wr_rm_imu(_wr):
     def __init__(self, filename, port, mode, user):
         self.filename = filename
         self.port = port
@@ -178,14 +307,8 @@ class wr_rm_imu(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_rm_imu(self.filename, self.port, self.mode, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
-
-    def close(self):
-        self._wr.close()
-
 
-class wr_pv(hl2ss._context_manager):
+class wr_pv(_wr):
     def __init__(self, filename, port, mode, width, height, framerate, divisor, profile, level, bitrate, options, user):
         self.filename = filename
         self.port = port
@@ -203,14 +326,8 @@ class wr_pv(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_pv(self.filename, self.port, self.mode, self.width, self.height, self.framerate, self.divisor, self.profile, self.level, self.bitrate, self.options, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
-
-    def close(self):
-        self._wr.close()
-
 
-class wr_microphone(hl2ss._context_manager):
+class wr_microphone(_wr):
     def __init__(self, filename, port, profile, level, user):
         self.filename = filename
         self.port = port
@@ -221,14 +338,8 @@ class wr_microphone(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_microphone(self.filename, self.port, self.profile, self.level, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
-
-    def close(self):
-        self._wr.close()
-
 
-class wr_si(hl2ss._context_manager):
+class wr_si(_wr):
     def __init__(self, filename, port, user):
         self.filename = filename
         self.port = port
@@ -237,14 +348,8 @@ class wr_si(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_si(self.filename, self.port, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
-
-    def close(self):
-        self._wr.close()
 
-
-class wr_eet(hl2ss._context_manager):
+class wr_eet(_wr):
     def __init__(self, filename, port, fps, user):
         self.filename = filename
         self.port = port
@@ -254,12 +359,6 @@ class wr_eet(hl2ss._context_manager):
     def open(self):
         self._wr = _create_wr_eet(self.filename, self.port, self.fps, self.user)
 
-    def write(self, packet):
-        self._wr.write(packet)
-
-    def close(self):
-        self._wr.close()
-
 
 #------------------------------------------------------------------------------
 # Writer From Receiver
@@ -326,13 +425,637 @@ def create_wr_from_rx(filename, rx, user):
         return _create_wr_from_rx_eet(filename, rx, user)
 
 
+#------------------------------------------------------------------------------
+# Segmented Writer
+#------------------------------------------------------------------------------
+
+class wr_segmented(hl2ss._context_manager):
+    def __init__(self, filename, rx, user, max_size=None, max_duration=None, max_frames=None, key_frames=True):
+        self.filename = filename
+        self.rx = rx
+        self.port = rx.port
+        self.user = user
+        self.max_size = max_size
+        self.max_duration = max_duration
+        self.max_frames = max_frames
+        self.key_frames = key_frames
+
+    def __open_segment(self):
+        filename = get_segment_filename(self.filename, len(self._segments))
+        self._wr = create_wr_from_rx(filename, self.rx, self.user)
+        self._wr.open()
+        self._segment = {'filename' : os.path.basename(filename), 'data_offset' : self._wr.tell(), 'size' : self._wr.tell(), 'packets' : 0, 'first_timestamp' : None, 'last_timestamp' : None}
+        self._segments.append(self._segment)
+
+    def __close_segment(self):
+        self._wr.close()
+        save_manifest(self.manifest, self.port, self._segments)
+
+    def __is_full(self, packet):
+        if (self._segment['packets'] <= 0):
+            return False
+        if ((self.max_size is not None) and (self._segment['size'] >= self.max_size)):
+            return True
+        if ((self.max_duration is not None) and ((packet.timestamp - self._segment['first_timestamp']) >= (self.max_duration * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS))):
+            return True
+        if ((self._max_frames is not None) and (self._segment['packets'] >= self._max_frames)):
+            return True
+        return False
+
+    def open(self):
+        self.manifest = get_manifest_filename(self.filename)
+        self._segments = []
+        self._max_frames = None
+        if (self.max_frames is not None):
+            period = hl2ss_lnm.get_sync_period(self.rx) if (self.key_frames) else 1
+            self._max_frames = max([1, -(-self.max_frames // period)]) * period
+        self.__open_segment()
+
+    def write(self, packet):
+        if (self.__is_full(packet) and ((not self.key_frames) or hl2ss_lnm.is_key_frame(self.rx, packet.payload))):
+            self.__close_segment()
+            self.__open_segment()
+        self._wr.write(packet)
+        self._segment['size'] = self._wr.tell()
+        self._segment['packets'] += 1
+        if (self._segment['first_timestamp'] is None):
+            self._segment['first_timestamp'] = packet.timestamp
+        self._segment['last_timestamp'] = packet.timestamp
+
+    def get_segments(self):
+        return self._segments
+
+    def close(self):
+        self.__close_segment()
+
+
+#------------------------------------------------------------------------------
+# Write-Behind Writer
+#------------------------------------------------------------------------------
+
+class FlushPolicy:
+    NONE = 0
+    PERIODIC = 1
+    SIZE = 2
+
+
+_IOV_MAX = 1024
+
+
+def _writev_fallback(fd, buffers):
+    return sum([os.write(fd, buffer) for buffer in buffers])
+
+
+_writev = os.writev if (hasattr(os, 'writev')) else _writev_fallback
+
+
+def _write_buffers(fd, buffers):
+    buffers = [memoryview(buffer).cast('B') for buffer in buffers]
+    calls = 0
+    index = 0
+    while (index < len(buffers)):
+        count = _writev(fd, buffers[index:(index + _IOV_MAX)])
+        calls += 1
+        while ((index < len(buffers)) and (count >= len(buffers[index]))):
+            count -= len(buffers[index])
+            index += 1
+        if (count > 0):
+            buffers[index] = buffers[index][count:]
+    return calls
+
+
+def _check_background_writer(name, event_failed, error=None):
+    if (event_failed.is_set()):
+        raise Exception(f'{name} failed') from error
+
+
+class _background_writer:
+    def __init__(self, name, queue, drain, event_failed):
+        self.name = name
+        self.event_failed = event_failed
+        self._queue = queue
+        self._drain = drain
+        self._error = None
+        self._thread = threading.Thread(target=self.__run, daemon=True)
+        self._thread.start()
+
+    def __run(self):
+        try:
+            self._drain()
+        except Exception as error:
+            self._error = error
+            self.event_failed.set()
+            # Keep consuming so blocked producers and close() can proceed
+            while (self._queue.get() is not None):
+                pass
+
+    def check(self):
+        _check_background_writer(self.name, self.event_failed, self._error)
+
+    def join(self):
+        self._queue.put(None)
+        self._thread.join()
+        self.check()
+
+
+class wr_write_behind(hl2ss._context_manager):
+    def __init__(self, wr, queue_size=256, flush=FlushPolicy.NONE, flush_period=1.0, flush_size=64*1024*1024, coalesce_size=1024*1024):
+        self.wr = wr
+        self.port = wr.port
+        self.queue_size = queue_size
+        self.flush = flush
+        self.flush_period = flush_period
+        self.flush_size = flush_size
+        self.coalesce_size = coalesce_size
+
+    def __put(self, packets):
+        buffers = []
+        offset = self._writer._offset
+        for packet in packets:
+            self._writer._index.add(packet.timestamp, offset, hl2ss_lnm.is_key_frame(self.wr, packet.payload))
+            header = struct.pack('<QI', packet.timestamp, len(packet.payload))
+            buffers.append(header)
+            buffers.append(packet.payload)
+            offset += len(header) + len(packet.payload)
+            if (packet.pose is not None):
+                pose = np.ascontiguousarray(packet.pose, dtype=np.float32)
+                buffers.append(pose)
+                offset += pose.nbytes
+        start = time.perf_counter()
+        self._calls += _write_buffers(self._fd, buffers)
+        self._busy += time.perf_counter() - start
+        self._packets += len(packets)
+        self._bytes += offset - self._writer._offset
+        self._unsynced += offset - self._writer._offset
+        self._writer._offset = offset
+
+    def __sync(self):
+        if (self.flush == FlushPolicy.PERIODIC):
+            if ((time.perf_counter() - self._sync_time) < self.flush_period):
+                return
+        elif (self.flush == FlushPolicy.SIZE):
+            if (self._unsynced < self.flush_size):
+                return
+        else:
+            return
+        os.fsync(self._fd)
+        self._sync_time = time.perf_counter()
+        self._unsynced = 0
+        self._syncs += 1
+
+    def __drain(self):
+        stop = False
+        while (not stop):
+            packets = [self._queue.get()]
+            size = 0 if (packets[0] is None) else len(packets[0].payload)
+            while ((packets[-1] is not None) and (size < self.coalesce_size) and (len(packets) < (_IOV_MAX // 3))):
+                try:
+                    packets.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+                if (packets[-1] is not None):
+                    size += len(packets[-1].payload)
+            stop = packets[-1] is None
+            if (stop):
+                packets.pop()
+            if (len(packets) > 0):
+                self.__put(packets)
+            self.__sync()
+
+    def open(self):
+        self.wr.open()
+        self._writer = self.wr._wr
+        self._writer._file.flush()
+        self._fd = self._writer._file.fileno()
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._packets = 0
+        self._bytes = 0
+        self._calls = 0
+        self._syncs = 0
+        self._busy = 0.0
+        self._unsynced = 0
+        self._max_depth = 0
+        self._start = time.perf_counter()
+        self._sync_time = self._start
+        self._worker = _background_writer(f'Write-behind writer for {self.wr.filename}', self._queue, self.__drain, threading.Event())
+
+    def write(self, packet):
+        self._worker.check()
+        self._queue.put(packet)
+        self._max_depth = max([self._max_depth, self._queue.qsize()])
+
+    def get_statistics(self):
+        elapsed = time.perf_counter() - self._start
+        return {
+            'packets'         : self._packets,
+            'bytes'           : self._bytes,
+            'writes'          : self._calls,
+            'syncs'           : self._syncs,
+            'queue_depth'     : self._queue.qsize(),
+            'max_queue_depth' : self._max_depth,
+            'throughput'      : self._bytes / elapsed if (elapsed > 0) else 0.0,
+            'disk_throughput' : self._bytes / self._busy if (self._busy > 0) else 0.0,
+        }
+
+    def close(self):
+        try:
+            self._worker.join()
+            if (self.flush != FlushPolicy.NONE):
+                os.fsync(self._fd)
+        finally:
+            self.wr.close()
+
+
+#------------------------------------------------------------------------------
+# Compression
+#------------------------------------------------------------------------------
+
+class Compression:
+    NONE = 0
+    ZLIB = 1
+    LZ4 = 2
+    ZSTD = 3
+    ZDEPTH = 4
+
+
+class _codec_none:
+    def __init__(self, level):
+        pass
+
+    def encode(self, payload):
+        return payload
+
+    def decode(self, payload):
+        return payload
+
+
+class _codec_zlib:
+    def __init__(self, level):
+        self.level = 1 if (level is None) else level
+
+    def encode(self, payload):
+        return zlib.compress(payload, self.level)
+
+    def decode(self, payload):
+        return zlib.decompress(payload)
+
+
+class _codec_lz4:
+    def __init__(self, level):
+        import lz4.frame
+        self._lz4 = lz4.frame
+        self.level = 0 if (level is None) else level
+
+    def encode(self, payload):
+        return self._lz4.compress(payload, compression_level=self.level)
+
+    def decode(self, payload):
+        return self._lz4.decompress(payload)
+
+
+class _codec_zstd:
+    def __init__(self, level):
+        import zstandard
+        self._zstd = zstandard
+        self.level = 3 if (level is None) else level
+
+    def encode(self, payload):
+        return self._zstd.ZstdCompressor(level=self.level).compress(payload)
+
+    def decode(self, payload):
+        return self._zstd.ZstdDecompressor().decompress(payload)
+
+
+class _codec_zdepth:
+    def __init__(self, level):
+        import pyzdepth
+        self._pyzdepth = pyzdepth
+        self._local = threading.local()
+        self._zlib = _codec_zlib(level)
+
+    def _get_codec(self):
+        if (not hasattr(self._local, 'codec')):
+            self._local.codec = self._pyzdepth.DepthCompressor()
+        return self._local.codec
+
+    def encode(self, payload):
+        size = hl2ss.Parameters_RM_DEPTH_AHAT.PIXELS * 2
+        result, compressed = self._get_codec().Compress(hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH, hl2ss.Parameters_RM_DEPTH_AHAT.HEIGHT, bytes(payload[:size]), True)
+        return struct.pack('<I', len(compressed)) + bytes(compressed) + self._zlib.encode(payload[size:])
+
+    def decode(self, payload):
+        size = struct.unpack_from('<I', payload, 0)[0]
+        result, width, height, depth = self._get_codec().Decompress(bytes(payload[4:(4 + size)]))
+        return bytes(depth) + self._zlib.decode(payload[(4 + size):])
+
+
+_CODECS = {
+    Compression.NONE   : _codec_none,
+    Compression.ZLIB   : _codec_zlib,
+    Compression.LZ4    : _codec_lz4,
+    Compression.ZSTD   : _codec_zstd,
+    Compression.ZDEPTH : _codec_zdepth,
+}
+
+
+def _create_codec(compression, level=None):
+    return _CODECS[compression](level)
+
+
+def get_compression(rx, compression):
+    if (compression != Compression.ZDEPTH):
+        return compression
+    if ((rx.port == hl2ss.StreamPort.RM_DEPTH_AHAT) and (rx.profile_z == hl2ss.DepthProfile.SAME) and (rx.profile_ab == hl2ss.VideoProfile.RAW)):
+        return compression
+    return Compression.ZLIB
+
+
+def is_compressed(magic):
+    return magic.decode() == _COMPRESSED_MAGIC
+
+
+class payload_compressor:
+    def __init__(self, compression, level=None):
+        self.compression = compression
+        self._codec = _create_codec(compression, level)
+
+    def encode(self, payload):
+        data = self._codec.encode(payload)
+        return (bytes([self.compression]) + data) if (len(data) < len(payload)) else (bytes([Compression.NONE]) + bytes(payload))
+
+
+class payload_decompressor:
+    def __init__(self):
+        self._codecs = {}
+
+    def decode(self, payload):
+        compression = payload[0]
+        if (compression == Compression.NONE):
+            return payload[1:]
+        codec = self._codecs.get(compression, None)
+        if (codec is None):
+            codec = _create_codec(compression)
+            self._codecs[compression] = codec
+        return bytearray(codec.decode(payload[1:]))
+
+
+class wr_compressed(hl2ss._context_manager):
+    def __init__(self, wr, compression=Compression.ZLIB, level=None, workers=4, pending=None):
+        self.wr = wr
+        self.port = wr.port
+        self.compression = get_compression(wr, compression)
+        self.level = level
+        self.workers = workers
+        self.pending = (4 * workers) if (pending is None) else pending
+
+    def __encode(self, packet):
+        key = hl2ss_lnm.is_key_frame(self.wr, packet.payload)
+        return hl2ss._packet(packet.timestamp, self._compressor.encode(packet.payload), packet.pose), key
+
+    def __put(self, drain):
+        while ((len(self._futures) > 0) and (drain or (len(self._futures) > self.pending) or self._futures[0].done())):
+            packet, key = self._futures.popleft().result()
+            self._writer.write(packet, key)
+            self._bytes += len(packet.payload)
+
+    def open(self):
+        self.wr.open()
+        self._writer = self.wr._wr
+        self._writer.patch(0, _COMPRESSED_MAGIC.encode())
+        self._compressor = payload_compressor(self.compression, self.level)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        self._futures = collections.deque()
+        self._raw_bytes = 0
+        self._bytes = 0
+
+    def write(self, packet):
+        self._futures.append(self._executor.submit(self.__encode, packet))
+        self._raw_bytes += len(packet.payload)
+        self.__put(False)
+
+    def get_ratio(self):
+        return (self._raw_bytes / self._bytes) if (self._bytes > 0) else 1.0
+
+    def close(self):
+        self.__put(True)
+        self._executor.shutdown()
+        self.wr.close()
+
+
+#------------------------------------------------------------------------------
+# Configuration Pack
+#------------------------------------------------------------------------------
+
+def _create_configuration_rm_vlc(wr):
+    return hl2ss._create_configuration_for_rm_vlc(wr.mode, wr.divisor, wr.profile, wr.level, wr.bitrate, wr.options)
+
+
+def _create_configuration_rm_depth_ahat(wr):
+    return hl2ss._create_configuration_for_rm_depth_ahat(wr.mode, wr.divisor, wr.profile_z, wr.profile_ab, wr.level, wr.bitrate, wr.options)
+
+
+def _create_configuration_rm_depth_longthrow(wr):
+    return hl2ss._create_configuration_for_rm_depth_longthrow(wr.mode, wr.divisor, wr.png_filter)
+
+
+def _create_configuration_rm_imu(wr):
+    return hl2ss._create_configuration_for_rm_imu(wr.mode)
+
+
+def _create_configuration_pv(wr):
+    return hl2ss._create_configuration_for_pv(wr.mode, wr.width, wr.height, wr.framerate, wr.divisor, wr.profile, wr.level, wr.bitrate, wr.options)
+
+
+def _create_configuration_microphone(wr):
+    return hl2ss._create_configuration_for_microphone(wr.profile, wr.level)
+
+
+def _create_configuration_si(wr):
+    return b''
+
+
+def _create_configuration_eet(wr):
+    return hl2ss._create_configuration_for_eet(wr.fps)
+
+
+def _create_configuration(wr):
+    if (wr.port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return _create_configuration_rm_vlc(wr)
+    if (wr.port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return _create_configuration_rm_vlc(wr)
+    if (wr.port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return _create_configuration_rm_vlc(wr)
+    if (wr.port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return _create_configuration_rm_vlc(wr)
+    if (wr.port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return _create_configuration_rm_depth_ahat(wr)
+    if (wr.port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return _create_configuration_rm_depth_longthrow(wr)
+    if (wr.port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+        return _create_configuration_rm_imu(wr)
+    if (wr.port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+        return _create_configuration_rm_imu(wr)
+    if (wr.port == hl2ss.StreamPort.RM_IMU_MAGNETOMETER):
+        return _create_configuration_rm_imu(wr)
+    if (wr.port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return _create_configuration_pv(wr)
+    if (wr.port == hl2ss.StreamPort.MICROPHONE):
+        return _create_configuration_microphone(wr)
+    if (wr.port == hl2ss.StreamPort.SPATIAL_INPUT):
+        return _create_configuration_si(wr)
+    if (wr.port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+        return _create_configuration_eet(wr)
+
+
+#------------------------------------------------------------------------------
+# Container
+#------------------------------------------------------------------------------
+
+_CHUNK_FORMAT = '<HBI'
+_CHUNK_SIZE = struct.calcsize(_CHUNK_FORMAT)
+_TRAILER_FORMAT = f'<Q{len(_CONTAINER_MAGIC)}s'
+_TRAILER_SIZE = struct.calcsize(_TRAILER_FORMAT)
+
+
+def get_container_stream(filename, port):
+    return f'{filename}#{int(port)}'
+
+
+def is_container_stream(filename):
+    return '#' in os.path.basename(filename)
+
+
+def _split_container_stream(filename):
+    filename, port = filename.rsplit('#', 1)
+    return filename, int(port)
+
+
+def _load_container_header(file):
+    magic, count = struct.unpack(f'<{len(_CONTAINER_MAGIC)}sI', file.read(len(_CONTAINER_MAGIC) + 4))
+    if (magic.decode() != _CONTAINER_MAGIC):
+        raise Exception(f'{file.name} is not a hl2ss container')
+    prefixes = {}
+    for _ in range(0, count):
+        port, size = struct.unpack('<HI', file.read(6))
+        prefixes[port] = file.read(size)
+    return prefixes
+
+
+def _load_container_footer(file, size):
+    if (size < _TRAILER_SIZE):
+        return None
+    file.seek(size - _TRAILER_SIZE)
+    offset, magic = struct.unpack(_TRAILER_FORMAT, file.read(_TRAILER_SIZE))
+    if ((magic != _CONTAINER_MAGIC.encode()) or (offset >= size)):
+        return None
+    file.seek(offset)
+    indices = {}
+    while (file.tell() < (size - _TRAILER_SIZE)):
+        port, count = struct.unpack('<HQ', file.read(10))
+        indices[port] = np.frombuffer(file.read(count * _INDEX_DTYPE.itemsize), dtype=_INDEX_DTYPE)
+    return indices
+
+
+def _scan_container(file, size, data_offset, ports):
+    entries = {port : [] for port in ports}
+    offset = data_offset
+    while ((offset + _CHUNK_SIZE + 8) <= size):
+        file.seek(offset)
+        port, key, length = struct.unpack(_CHUNK_FORMAT, file.read(_CHUNK_SIZE))
+        if ((port not in entries) or ((offset + _CHUNK_SIZE + length) > size)):
+            break
+        entries[port].append((struct.unpack('<Q', file.read(8))[0], offset + _CHUNK_SIZE, key))
+        offset += _CHUNK_SIZE + length
+    return {port : np.array(entries[port], dtype=_INDEX_DTYPE) for port in ports}
+
+
+def load_container(filename):
+    with open(filename, 'rb') as file:
+        prefixes = _load_container_header(file)
+        data_offset = file.tell()
+        size = os.fstat(file.fileno()).st_size
+        indices = _load_container_footer(file, size)
+        if (indices is None):
+            indices = _scan_container(file, size, data_offset, prefixes.keys())
+    return prefixes, indices
+
+
+class wr_container_stream(hl2ss._context_manager):
+    def __init__(self, queue, wr, name, event_failed):
+        self._queue = queue
+        self.wr = wr
+        self.port = wr.port
+        self._name = name
+        self._event_failed = event_failed
+
+    def open(self):
+        pass
+
+    def write(self, packet):
+        _check_background_writer(self._name, self._event_failed)
+        self._queue.put((self.port, packet.timestamp, hl2ss_lnm.is_key_frame(self.wr, packet.payload), bytes(hl2ss.pack_packet(packet))))
+
+    def close(self):
+        pass
+
+
+class wr_container(hl2ss._context_manager):
+    def __init__(self, filename, streams, user, queue_size=1024):
+        self.filename = filename
+        self.streams = {stream.port : create_wr_from_rx(None, stream, user) for stream in streams}
+        self.user = user
+        self.queue_size = queue_size
+
+    def __drain(self):
+        while (True):
+            data = self._queue.get()
+            if (data is None):
+                break
+            port, timestamp, key, packet = data
+            self._index[port].extend(struct.pack('<QQB', timestamp, self._offset + _CHUNK_SIZE, 1 if (key) else 0))
+            self._file.write(struct.pack(_CHUNK_FORMAT, port, 1 if (key) else 0, len(packet)))
+            self._file.write(packet)
+            self._offset += _CHUNK_SIZE + len(packet)
+
+    def open(self):
+        self._file = open(self.filename, 'wb')
+        self._file.write(struct.pack(f'<{len(_CONTAINER_MAGIC)}sI', _CONTAINER_MAGIC.encode(), len(self.streams)))
+        for port, wr in self.streams.items():
+            prefix = _create_header(port, self.user) + _create_configuration(wr)
+            self._file.write(struct.pack('<HI', port, len(prefix)))
+            self._file.write(prefix)
+        self._offset = self._file.tell()
+        self._index = {port : bytearray() for port in self.streams.keys()}
+        self._queue = mp.Queue(self.queue_size)
+        # Producers may run in other processes, so the failure flag is shared
+        self._worker = _background_writer(f'Container writer for {self.filename}', self._queue, self.__drain, mp.Event())
+
+    def get_writer(self, port):
+        return wr_container_stream(self._queue, self.streams[port], self._worker.name, self._worker.event_failed)
+
+    def close(self):
+        # A failed container keeps no footer; load_container recovers the
+        # complete chunks by scanning
+        try:
+            self._worker.join()
+            for port, index in self._index.items():
+                self._file.write(struct.pack('<HQ', port, len(index) // _INDEX_DTYPE.itemsize))
+                self._file.write(index)
+            self._file.write(struct.pack(_TRAILER_FORMAT, self._offset, _CONTAINER_MAGIC.encode()))
+        finally:
+            self._file.close()
+
+
 #------------------------------------------------------------------------------
 # File Reader
 #------------------------------------------------------------------------------
 
 class _reader:
     def open(self, filename, chunk):
-        self._file = open(filename, 'rb')
+        self.attach(open(filename, 'rb'), chunk)
+
+    def attach(self, file, chunk):
+        self._file = file
         self._chunk = chunk
         
     def get(self, format):
@@ -389,9 +1112,32 @@ class _reader:
         return self.get('<B')[0]
 
     def begin(self, mode):
+        self._mode = mode
         self._unpacker = hl2ss._unpacker()
         self._unpacker.reset(mode)
         self._eof = False
+        self._data_offset = self._file.tell()
+
+    def seek(self, offset):
+        self._file.seek(offset)
+        self._unpacker.reset(self._mode)
+        self._eof = False
+
+    def walk(self, read_payload):
+        size = os.fstat(self._file.fileno()).st_size
+        pose_size = 64 if (self._mode == hl2ss.StreamMode.MODE_1) else 0
+        offset = self._data_offset
+        while (True):
+            self._file.seek(offset)
+            header = self._file.read(12)
+            if (len(header) < 12):
+                break
+            timestamp, payload_size = struct.unpack('<QI', header)
+            end = offset + 12 + payload_size + pose_size
+            if (end > size):
+                break
+            yield timestamp, offset, self._file.read(payload_size) if (read_payload) else None
+            offset = end
         
     def get_next_packet(self):
         while (True):
@@ -407,12 +1153,156 @@ class _reader:
         self._file.close()
 
 
+#------------------------------------------------------------------------------
+# Mapped File Reader
+#------------------------------------------------------------------------------
+
+class _mapped_reader(_reader):
+    def open(self, filename, chunk):
+        super().open(filename, chunk)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._map)
+        self._size = len(self._map)
+
+    def begin(self, mode):
+        super().begin(mode)
+        self._pose_size = 64 if (mode == hl2ss.StreamMode.MODE_1) else 0
+        self._offset = self._data_offset
+
+    def seek(self, offset):
+        self._offset = offset
+
+    def get_next_packet(self):
+        if ((self._offset + 12) > self._size):
+            return None
+        timestamp, payload_size = struct.unpack_from('<QI', self._map, self._offset)
+        begin = self._offset + 12
+        end = begin + payload_size
+        if ((end + self._pose_size) > self._size):
+            return None
+        pose = np.frombuffer(self._map, dtype=np.float32, count=16, offset=end).reshape((4, 4)) if (self._pose_size > 0) else None
+        self._offset = end + self._pose_size
+        return hl2ss._packet(timestamp, self._view[begin:end], pose)
+
+    def close(self):
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+#------------------------------------------------------------------------------
+# Segmented File Reader
+#------------------------------------------------------------------------------
+
+class _segmented_reader(_reader):
+    def __init__(self, mapped=False):
+        self._mapped = mapped
+
+    def open(self, filename, chunk):
+        self._filename = filename
+        self._manifest = load_manifest(filename)
+        self._segments = self._manifest['segments']
+        self._bases = get_segment_bases(self._manifest)
+        super().open(get_segment_path(filename, self._segments[0]), chunk)
+
+    def _open_segment(self, index):
+        rd = _mapped_reader() if (self._mapped) else _reader()
+        rd.open(get_segment_path(self._filename, self._segments[index]), self._chunk)
+        rd._file.seek(self._segments[index]['data_offset'])
+        rd.begin(self._mode)
+        return rd
+
+    def begin(self, mode):
+        self._mode = mode
+        self._data_offset = 0
+        self._file.close()
+        self._index = 0
+        self._rd = self._open_segment(0)
+
+    def seek(self, offset):
+        index = int(np.searchsorted(self._bases, offset, side='right')) - 1
+        if (index != self._index):
+            self._rd.close()
+            self._index = index
+            self._rd = self._open_segment(index)
+        self._rd.seek(offset - int(self._bases[index]))
+
+    def walk(self, read_payload):
+        for index in range(0, len(self._segments)):
+            rd = self._open_segment(index)
+            base = int(self._bases[index])
+            for timestamp, offset, payload in rd.walk(read_payload):
+                yield timestamp, base + offset, payload
+            rd.close()
+
+    def get_next_packet(self):
+        while (True):
+            data = self._rd.get_next_packet()
+            if ((data is not None) or ((self._index + 1) >= len(self._segments))):
+                return data
+            self._rd.close()
+            self._index += 1
+            self._rd = self._open_segment(self._index)
+
+    def close(self):
+        self._rd.close()
+
+
+#------------------------------------------------------------------------------
+# Container Stream Reader
+#------------------------------------------------------------------------------
+
+class _container_reader(_reader):
+    def open(self, filename, chunk):
+        filename, self._port = _split_container_stream(filename)
+        prefixes, indices = load_container(filename)
+        self._index = indices[self._port]
+        self._container = open(filename, 'rb')
+        self.attach(io.BytesIO(prefixes[self._port]), chunk)
+
+    def begin(self, mode):
+        self._mode = mode
+        self._pose_size = 64 if (mode == hl2ss.StreamMode.MODE_1) else 0
+        self._data_offset = int(self._index['offset'][0]) if (self._index.shape[0] > 0) else 0
+        self._position = 0
+
+    def seek(self, offset):
+        self._position = int(np.searchsorted(self._index['offset'], offset, side='left'))
+
+    def __read(self, position, read_payload):
+        self._container.seek(int(self._index['offset'][position]))
+        timestamp, payload_size = struct.unpack('<QI', self._container.read(12))
+        if (not read_payload):
+            return timestamp, None, None
+        payload = bytearray(self._container.read(payload_size))
+        pose = np.frombuffer(self._container.read(self._pose_size), dtype=np.float32).reshape((4, 4)) if (self._pose_size > 0) else None
+        return timestamp, payload, pose
+
+    def walk(self, read_payload):
+        for position in range(0, self._index.shape[0]):
+            timestamp, payload, pose = self.__read(position, read_payload)
+            yield timestamp, int(self._index['offset'][position]), payload
+
+    def get_next_packet(self):
+        if (self._position >= self._index.shape[0]):
+            return None
+        timestamp, payload, pose = self.__read(self._position, True)
+        self._position += 1
+        return hl2ss._packet(timestamp, payload, pose)
+
+    def close(self):
+        self._container.close()
+
+
 #------------------------------------------------------------------------------
 # Mode 0 and Mode 1 Data Load
 #------------------------------------------------------------------------------
 
-def _create_rd(filename, chunk):
-    rd = _reader()
+def _create_rd(filename, chunk, mapped=False):
+    rd = _container_reader() if (is_container_stream(filename)) else _segmented_reader(mapped) if (is_manifest(filename)) else _mapped_reader() if (mapped) else _reader()
     rd.open(filename, chunk)
     return (rd,) + rd.get_header()
 
@@ -472,22 +1362,305 @@ class _rd(hl2ss._context_manager):
         f = _rd.__method_table[self.port]
         self.__load = types.MethodType(f[0], self)
         
-    def __init__(self, filename, chunk):
+    def __init__(self, filename, chunk, mapped=False):
         self.filename = filename
         self.chunk = chunk
+        self.mapped = mapped
 
     def open(self):
-        self._rd, self.magic, self.port, self.user = _create_rd(self.filename, self.chunk)
+        self._rd, self.magic, self.port, self.user = _create_rd(self.filename, self.chunk, self.mapped)
+        self._decompressor = payload_decompressor() if (is_compressed(self.magic)) else None
+        self._index = None
         self.__build()
         self.__load()
+
+    def get_index(self):
+        if (self._index is None):
+            self._index = load_index(self.filename)
+            if (self._index is None):
+                self._index = build_index(self.filename, self.chunk)
+            self._keys = np.flatnonzero(self._index['key'])
+        return self._index
+
+    def __len__(self):
+        return self.get_index().shape[0]
+
+    def seek_frame(self, frame):
+        index = self.get_index()
+        if (index.shape[0] <= 0):
+            return None
+        position = np.searchsorted(self._keys, min([max([frame, 0]), index.shape[0] - 1]), side='right') - 1
+        frame = int(self._keys[position]) if (position >= 0) else 0
+        self._rd.seek(int(index['offset'][frame]))
+        return frame
+
+    def seek(self, timestamp):
+        return self.seek_frame(np.searchsorted(self.get_index()['timestamp'], timestamp, side='right') - 1)
+        
+    def decompress(self, payload):
+        return self._decompressor.decode(payload) if (self._decompressor is not None) else payload
         
     def get_next_packet(self):
-        return self._rd.get_next_packet()
+        data = self._rd.get_next_packet()
+        if ((data is not None) and (self._decompressor is not None)):
+            data.payload = self._decompressor.decode(data.payload)
+        return data
 
     def close(self):
         self._rd.close()
 
 
+#------------------------------------------------------------------------------
+# Index Builder
+#------------------------------------------------------------------------------
+
+def build_index(filename, chunk=hl2ss.ChunkSize.SINGLE_TRANSFER):
+    rd = _rd(filename, chunk)
+    rd.open()
+    read_payload = not hl2ss_lnm.is_key_frame(rd, b'')
+    index = np.array([(timestamp, offset, hl2ss_lnm.is_key_frame(rd, rd.decompress(payload)) if (read_payload) else True) for timestamp, offset, payload in rd._rd.walk(read_payload)], dtype=_INDEX_DTYPE)
+    rd.close()
+    return index
+
+
+def create_index(filename, chunk=hl2ss.ChunkSize.SINGLE_TRANSFER):
+    if (is_container_stream(filename)):
+        return load_index(filename)
+    if (is_manifest(filename)):
+        for segment in load_manifest(filename)['segments']:
+            create_index(get_segment_path(filename, segment), chunk)
+        return load_index(filename)
+    index = build_index(filename, chunk)
+    save_index(filename, index, os.path.getsize(filename))
+    return index
+
+
+#------------------------------------------------------------------------------
+# Integrity Scanner
+#------------------------------------------------------------------------------
+
+def _is_valid_pose(pose):
+    return all([np.isfinite(value) for value in pose]) and ((pose[3], pose[7], pose[11], pose[15]) == (0, 0, 0, 1) or not any(pose))
+
+
+class _scan_state:
+    def __init__(self, pose_size, check_poses):
+        self.pose_size = pose_size
+        self.check_poses = check_poses and (pose_size > 0)
+        self.timestamps = []
+        self.offsets = []
+        self.invalid_poses = 0
+        self.empty_poses = 0
+        self.data_size = 0
+
+    def add(self, data, offset, base):
+        timestamp, payload_size = struct.unpack_from('<QI', data, offset)
+        end = offset + 12 + payload_size + self.pose_size
+        if (end > len(data)):
+            return None
+        if (self.check_poses):
+            pose = struct.unpack_from('<16f', data, end - self.pose_size)
+            if (not any(pose)):
+                self.empty_poses += 1
+            elif (not _is_valid_pose(pose)):
+                self.invalid_poses += 1
+        self.timestamps.append(timestamp)
+        self.offsets.append(base + offset)
+        self.data_size += end - offset
+        return end
+
+
+def _scan_file(state, filename, data_offset, base):
+    size = os.path.getsize(filename)
+    offset = data_offset
+    if (size > data_offset):
+        with open(filename, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                while ((offset + 12) <= size):
+                    end = state.add(data, offset, base)
+                    if (end is None):
+                        break
+                    offset = end
+    return size, offset
+
+
+def _scan_manifest(state, filename):
+    manifest = load_manifest(filename)
+    bases = get_segment_bases(manifest)
+    size = 0
+    valid_size = 0
+    for segment, base in zip(manifest['segments'], bases):
+        segment_size, segment_valid_size = _scan_file(state, get_segment_path(filename, segment), segment['data_offset'], int(base))
+        size += segment_size
+        valid_size += segment_valid_size
+    return size, valid_size
+
+
+def _scan_container_stream(state, filename):
+    filename, port = _split_container_stream(filename)
+    with open(filename, 'rb') as file:
+        prefixes = _load_container_header(file)
+        valid_size = file.tell()
+        size = os.fstat(file.fileno()).st_size
+        indices = _load_container_footer(file, size)
+        footer = indices is not None
+        if (not footer):
+            indices = _scan_container(file, size, valid_size, prefixes.keys())
+        if (port not in indices):
+            raise Exception(f'{filename} has no stream for port {port}')
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset in indices[port]['offset']:
+                state.add(data, int(offset), 0)
+            # Without a footer the chunk walk stops at the first incomplete
+            # chunk and everything after the last complete one is truncated
+            if (footer):
+                valid_size = size
+            else:
+                for index in indices.values():
+                    for offset in index['offset']:
+                        valid_size = max([valid_size, int(offset) + struct.unpack_from(_CHUNK_FORMAT, data, int(offset) - _CHUNK_SIZE)[2]])
+    return size, valid_size
+
+
+def scan(filename, period=None, check_poses=True):
+    rd = _rd(filename, hl2ss.ChunkSize.SINGLE_TRANSFER)
+    rd.open()
+    port = rd.port
+    data_offset = rd._rd._data_offset
+    mode = rd._rd._mode
+    rd.close()
+
+    state = _scan_state(64 if (mode == hl2ss.StreamMode.MODE_1) else 0, check_poses)
+
+    if (is_container_stream(filename)):
+        size, valid_size = _scan_container_stream(state, filename)
+    elif (is_manifest(filename)):
+        size, valid_size = _scan_manifest(state, filename)
+    else:
+        size, valid_size = _scan_file(state, filename, data_offset, 0)
+
+    timestamps = np.array(state.timestamps, dtype=np.uint64)
+    deltas = np.diff(timestamps.astype(np.int64))
+    if ((period is None) and np.any(deltas > 0)):
+        period = float(np.median(deltas[deltas > 0]))
+    gaps = np.flatnonzero(deltas > (1.5 * period)) + 1 if (period is not None) else np.zeros(0, dtype=np.int64)
+
+    return {
+        'port'          : port,
+        'mode'          : mode,
+        'data_offset'   : data_offset,
+        'packets'       : timestamps.shape[0],
+        'size'          : size,
+        'valid_size'    : valid_size,
+        'data_size'     : state.data_size,
+        'truncated'     : size - valid_size,
+        'non_monotonic' : np.flatnonzero(deltas <= 0) + 1,
+        'gaps'          : gaps,
+        'gap_deltas'    : deltas[gaps - 1],
+        'period'        : period,
+        'invalid_poses' : state.invalid_poses,
+        'empty_poses'   : state.empty_poses,
+        'timestamps'    : timestamps,
+        'offsets'       : np.array(state.offsets, dtype=np.uint64),
+    }
+
+
+def _copy_range(source, destination, offset, size, block_size):
+    source.seek(offset)
+    while (size > 0):
+        data = source.read(min([size, block_size]))
+        if (len(data) <= 0):
+            break
+        destination.write(data)
+        size -= len(data)
+
+
+def repair(filename, output_filename=None, chunk=hl2ss.ChunkSize.SINGLE_TRANSFER, block_size=64*1024*1024):
+    if (output_filename is None):
+        return create_index(filename, chunk)
+    if (is_container_stream(filename) or is_manifest(filename)):
+        raise Exception(f'{filename} is not a single stream recording')
+    with open(filename, 'rb') as source, open(output_filename, 'wb') as destination:
+        _copy_range(source, destination, 0, scan(filename, check_poses=False)['valid_size'], block_size)
+    return create_index(output_filename, chunk)
+
+
+#------------------------------------------------------------------------------
+# Trimming
+#------------------------------------------------------------------------------
+
+class _trim_source:
+    def __init__(self, filename, chunk, key_frames):
+        if (is_container_stream(filename) or is_manifest(filename)):
+            raise Exception(f'{filename} is not a single stream recording')
+        rd = _rd(filename, chunk)
+        rd.open()
+        self.filename = filename
+        self.port = rd.port
+        self.index = rd.get_index()
+        self.data_offset = rd._rd._data_offset
+        self.pose_size = 64 if (rd._rd._mode == hl2ss.StreamMode.MODE_1) else 0
+        self.period = 1 if (key_frames) else hl2ss_lnm.get_sync_period(rd)
+        self.keys = np.flatnonzero(self.index['key']) if (key_frames) else np.arange(0, self.index.shape[0], self.period)
+        rd.close()
+
+    def snap(self, frame):
+        position = np.searchsorted(self.keys, frame, side='right') - 1
+        return int(self.keys[position]) if (position >= 0) else 0
+
+    def get_frame_range(self, start, stop, frames):
+        count = self.index.shape[0]
+        if (frames):
+            begin = 0 if (start is None) else int(start)
+            end = count if (stop is None) else int(stop) + 1
+        else:
+            begin = 0 if (start is None) else int(np.searchsorted(self.index['timestamp'], start, side='right')) - 1
+            end = count if (stop is None) else int(np.searchsorted(self.index['timestamp'], stop, side='right'))
+        begin = self.snap(min([max([begin, 0]), count]))
+        return begin, min([max([end, begin]), count])
+
+    def get_offset(self, frame):
+        if (frame < self.index.shape[0]):
+            return int(self.index['offset'][frame])
+        if (frame <= 0):
+            return self.data_offset
+        offset = int(self.index['offset'][frame - 1])
+        with open(self.filename, 'rb') as file:
+            file.seek(offset)
+            return offset + 12 + struct.unpack('<QI', file.read(12))[1] + self.pose_size
+
+    def extract(self, output_filename, begin, end, block_size):
+        first = self.get_offset(begin)
+        last = self.get_offset(end)
+        index = self.index[begin:end].copy()
+        index['offset'] = index['offset'] - first + self.data_offset
+        with open(self.filename, 'rb') as source, open(output_filename, 'wb') as destination:
+            _copy_range(source, destination, 0, self.data_offset, block_size)
+            _copy_range(source, destination, first, last - first, block_size)
+        size = self.data_offset + last - first
+        save_index(output_filename, index, size)
+        return {'filename' : os.path.basename(output_filename), 'data_offset' : self.data_offset, 'size' : size, 'packets' : end - begin, 'first_timestamp' : int(index['timestamp'][0]) if (end > begin) else None, 'last_timestamp' : int(index['timestamp'][-1]) if (end > begin) else None}
+
+
+def trim(input_filename, output_filename, start=None, stop=None, frames=False, key_frames=True, chunk=hl2ss.ChunkSize.SINGLE_TRANSFER, block_size=64*1024*1024):
+    source = _trim_source(input_filename, chunk, key_frames)
+    begin, end = source.get_frame_range(start, stop, frames)
+    return source.extract(output_filename, begin, end, block_size)
+
+
+def split(input_filename, output_filename, count, key_frames=True, workers=None, chunk=hl2ss.ChunkSize.SINGLE_TRANSFER, block_size=64*1024*1024):
+    source = _trim_source(input_filename, chunk, key_frames)
+    frames = source.index.shape[0]
+    first = source.get_offset(0)
+    size = source.get_offset(frames) - first
+    boundaries = sorted(set([0] + [source.snap(int(np.searchsorted(source.index['offset'], first + (size * i) // count, side='left'))) for i in range(1, count)] + [frames]))
+    ranges = list(zip(boundaries[:-1], boundaries[1:]))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        segments = list(executor.map(lambda i: source.extract(get_segment_filename(output_filename, i), ranges[i][0], ranges[i][1], block_size), range(len(ranges))))
+    save_manifest(get_manifest_filename(output_filename), source.port, segments)
+    return segments
+
+
 #------------------------------------------------------------------------------
 # Decoded Readers
 #------------------------------------------------------------------------------
@@ -519,11 +1692,11 @@ class _rd_decoded(_rd):
 
     def __create_codec_rm_vlc(self):
         self._codec.create()
-        self.get_next_packet()
+        self._primed = self.get_next_packet()
 
     def __create_codec_rm_depth_ahat(self):
         self._codec.create()
-        self.get_next_packet()
+        self._primed = self.get_next_packet()
 
     def __create_codec_rm_depth_longthrow(self):
         pass
@@ -533,7 +1706,7 @@ class _rd_decoded(_rd):
 
     def __create_codec_pv(self):
         self._codec.create(self.width, self.height)
-        self.get_next_packet()
+        self._primed = self.get_next_packet()
 
     def __create_codec_microphone(self):
         self._codec.create()
@@ -592,17 +1765,33 @@ class _rd_decoded(_rd):
         self.__create_codec = types.MethodType(f[1], self)
         self.__decode       = types.MethodType(f[2], self)
 
-    def __init__(self, filename, chunk, format):
-        super().__init__(filename, chunk)
+    def __init__(self, filename, chunk, format, mapped=False):
+        super().__init__(filename, chunk, mapped)
         self.format = format
 
     def open(self):
         super().open()
         self.__build()
+        self._primed = None
         self.__set_codec()
         self.__create_codec()
+        self._primed = None
+
+    def seek_frame(self, frame):
+        frame = super().seek_frame(frame)
+        self._primed = None
+        self.__set_codec()
+        self.__create_codec()
+        # The key frame used to prime the decoder is returned next, so the
+        # first packet after seek_frame is the returned frame as for _rd
+        # (its payload is None if the decoder produced no image for it)
+        return frame
         
     def get_next_packet(self):
+        if (self._primed is not None):
+            data = self._primed
+            self._primed = None
+            return data
         data = super().get_next_packet()
         if (data is not None):
             data.payload = self.__decode(data.payload)
@@ -616,25 +1805,118 @@ class _rd_decoded(_rd):
 # Create Reader
 #------------------------------------------------------------------------------
 
-def create_rd(filename, chunk, decoded):
-    return _rd_decoded(filename, chunk, decoded) if (decoded) else _rd(filename, chunk)
+def create_rd(filename, chunk, decoded, mapped=False):
+    return _rd_decoded(filename, chunk, decoded, mapped) if (decoded) else _rd(filename, chunk, mapped)
 
 
 #------------------------------------------------------------------------------
-# Sequencer
+# Prefetching Reader
 #------------------------------------------------------------------------------
 
-class sequencer:
-    def __init__(self, filename, chunk, decoded):
+def _rd_prefetch_put(buffer, event_stop, data):
+    while (not event_stop.is_set()):
+        try:
+            buffer.put(data, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _rd_prefetch_serialize_error(error):
+    try:
+        return pickle.dumps(error, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return pickle.dumps(Exception(''.join(traceback.format_exception(error))), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _rd_prefetch_run(filename, chunk, decoded, mapped, buffer, event_stop, serialize):
+    try:
+        rd = create_rd(filename, chunk, decoded, mapped)
+        rd.open()
+        try:
+            while (True):
+                data = rd.get_next_packet()
+                if ((not _rd_prefetch_put(buffer, event_stop, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL) if (serialize) else data)) or (data is None)):
+                    break
+        finally:
+            rd.close()
+    except Exception as error:
+        _rd_prefetch_put(buffer, event_stop, _rd_prefetch_serialize_error(error) if (serialize) else error)
+
+
+class rd_prefetch(hl2ss._context_manager):
+    def __init__(self, filename, chunk, decoded, mapped=False, lookahead=64, processes=False):
         self.filename = filename
         self.chunk = chunk
         self.decoded = decoded
+        self.mapped = mapped
+        self.lookahead = lookahead
+        self.processes = processes
 
     def open(self):
-        self._rd = create_rd(self.filename, self.chunk, self.decoded)
-        self._rd.open()
-        self._l = self._rd.get_next_packet()
-        self._r = self._rd.get_next_packet()
+        self.source = create_rd(self.filename, self.chunk, False, self.mapped)
+        self.source.open()
+        self.source.close()
+        self.port = self.source.port
+        self._buffer = mp.Queue(self.lookahead) if (self.processes) else queue.Queue(self.lookahead)
+        self._event_stop = mp.Event() if (self.processes) else threading.Event()
+        # Packets are copied across the process boundary anyway and views into
+        # the worker's mmap cannot be pickled, so worker processes read unmapped
+        self._worker = (mp.Process if (self.processes) else threading.Thread)(target=_rd_prefetch_run, args=(self.filename, self.chunk, self.decoded, self.mapped and not self.processes, self._buffer, self._event_stop, self.processes), daemon=True)
+        self._worker.start()
+        self._eof = False
+
+    def _get(self):
+        while (True):
+            try:
+                return self._buffer.get(timeout=0.1)
+            except queue.Empty:
+                if (not self._worker.is_alive()):
+                    break
+        try:
+            return self._buffer.get_nowait()
+        except queue.Empty:
+            return Exception(f'Prefetch worker for {self.filename} exited unexpectedly')
+
+    def get_next_packet(self):
+        if (self._eof):
+            return None
+        data = self._get()
+        if (isinstance(data, bytes)):
+            data = pickle.loads(data)
+        if (isinstance(data, Exception)):
+            self._eof = True
+            raise data
+        self._eof = data is None
+        return data
+
+    def __iter__(self):
+        while (True):
+            data = self.get_next_packet()
+            if (data is None):
+                break
+            yield data
+
+    def close(self):
+        self._event_stop.set()
+        while (self._worker.is_alive()):
+            try:
+                self._buffer.get(timeout=0.01)
+            except queue.Empty:
+                pass
+        self._worker.join()
+
+
+#------------------------------------------------------------------------------
+# Sequencer
+#------------------------------------------------------------------------------
+
+class _aligner:
+    def __init__(self, source):
+        self._source = source
+        self._l = source.get_next_packet()
+        self._r = None if (self._l is None) else source.get_next_packet()
 
     def get_next_packet(self, timestamp):
         if ((self._l is None) or (self._r is None)):
@@ -643,11 +1925,84 @@ class sequencer:
             return None
         while (timestamp > self._r.timestamp):
             self._l = self._r
-            self._r = self._rd.get_next_packet()
+            self._r = self._source.get_next_packet()
             if (self._r is None):
                 return None
         return self._l if ((timestamp - self._l.timestamp) < (self._r.timestamp - timestamp)) else self._r
+
+
+class sequencer:
+    def __init__(self, filename, chunk, decoded, mapped=False):
+        self.filename = filename
+        self.chunk = chunk
+        self.decoded = decoded
+        self.mapped = mapped
+
+    def open(self):
+        self._rd = create_rd(self.filename, self.chunk, self.decoded, self.mapped)
+        self._rd.open()
+        self._aligner = _aligner(self._rd)
+
+    def get_next_packet(self, timestamp):
+        return self._aligner.get_next_packet(timestamp)
+
+    def seek(self, timestamp):
+        frame = self._rd.seek(timestamp)
+        self._aligner = _aligner(self._rd)
+        return frame
     
     def close(self):
         self._rd.close()
 
+
+
+#------------------------------------------------------------------------------
+# Multi-Stream Sequencer
+#------------------------------------------------------------------------------
+
+class multi_sequencer(hl2ss._context_manager):
+    def __init__(self, filenames, chunk, decoded, master=0, depth=64, mapped=False, processes=False):
+        self.filenames = filenames
+        self.chunk = chunk
+        self.decoded = decoded
+        self.master = master
+        self.depth = depth
+        self.mapped = mapped
+        self.processes = processes
+
+    def open(self):
+        self._sources = [rd_prefetch(filename, self.chunk, self.decoded, self.mapped, self.depth, self.processes) for filename in self.filenames]
+        for source in self._sources:
+            source.open()
+        self.ports = [source.port for source in self._sources]
+        self._heap = None
+        self._aligners = None
+
+    def get_next_packet(self):
+        if (self._heap is None):
+            self._heap = []
+            for index, source in enumerate(self._sources):
+                data = source.get_next_packet()
+                if (data is not None):
+                    heapq.heappush(self._heap, (data.timestamp, index, data))
+        if (len(self._heap) <= 0):
+            return None
+        timestamp, index, data = self._heap[0]
+        following = self._sources[index].get_next_packet()
+        if (following is None):
+            heapq.heappop(self._heap)
+        else:
+            heapq.heapreplace(self._heap, (following.timestamp, index, following))
+        return index, data
+
+    def get_next_bundle(self):
+        if (self._aligners is None):
+            self._aligners = [None if (index == self.master) else _aligner(source) for index, source in enumerate(self._sources)]
+        data = self._sources[self.master].get_next_packet()
+        if (data is None):
+            return None
+        return [data if (aligner is None) else aligner.get_next_packet(data.timestamp) for aligner in self._aligners]
+
+    def close(self):
+        for source in self._sources:
+            source.close()
@@ -66,6 +66,37 @@ def get_sync_period(rx):
         return 1
 
 
+#------------------------------------------------------------------------------
+# Key Frames
+#------------------------------------------------------------------------------
+
+def _is_key_frame_video(profile, payload):
+    return True if (profile == hl2ss.VideoProfile.RAW) else hl2ss.is_key_frame_h26x(payload, profile)
+
+
+def _is_key_frame_rm_depth_ahat(profile_z, profile_ab, payload):
+    if (profile_z == hl2ss.DepthProfile.SAME):
+        return _is_key_frame_video(profile_ab, payload)
+    size_z = int.from_bytes(payload[0:4], 'little')
+    return _is_key_frame_video(profile_ab, payload[(8 + size_z):])
+
+
+def is_key_frame(rx, payload):
+    if (rx.port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return _is_key_frame_video(rx.profile, payload)
+    if (rx.port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return _is_key_frame_video(rx.profile, payload)
+    if (rx.port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return _is_key_frame_video(rx.profile, payload)
+    if (rx.port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return _is_key_frame_video(rx.profile, payload)
+    if (rx.port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return _is_key_frame_rm_depth_ahat(rx.profile_z, rx.profile_ab, payload)
+    if (rx.port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return _is_key_frame_video(rx.profile, payload)
+    return True
+
+
 #------------------------------------------------------------------------------
 # Control
 #------------------------------------------------------------------------------
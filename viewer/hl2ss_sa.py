@@ -36,16 +36,32 @@ def su_mesh_to_open3d_triangle_mesh(mesh):
 #------------------------------------------------------------------------------
 
 class _sm_manager_entry:
-    def __init__(self, update_time, mesh, rcs):
+    def __init__(self, update_time, mesh, triangle_mesh, bucket):
         self.update_time = update_time
         self.mesh = mesh
-        self.rcs = rcs
+        self.triangle_mesh = triangle_mesh
+        self.bucket = bucket
+
+
+class _sm_manager_bucket:
+    def __init__(self, surfaces):
+        self.rcs = o3d.t.geometry.RaycastingScene()
+        geometry_ids = [self.rcs.add_triangles(entry.triangle_mesh) for entry in surfaces.values()]
+        self.ids = np.empty(max(geometry_ids) + 1, dtype=object)
+        self.ids[geometry_ids] = list(surfaces.keys())
+
+
+def _sm_manager_get_bucket(mesh, bucket_size):
+    if (bucket_size is None):
+        return (0, 0, 0)
+    return tuple(np.floor(np.mean(mesh.vertex_positions[:, 0:3], axis=0) / bucket_size).astype(np.int64).tolist())
 
 
 class sm_manager:
-    def __init__(self, host, triangles_per_cubic_meter, threads):
+    def __init__(self, host, triangles_per_cubic_meter, threads, bucket_size=4.0):
         self._tpcm = triangles_per_cubic_meter
         self._threads = threads
+        self._bucket_size = bucket_size
         self._vpf = hl2ss.SM_VertexPositionFormat.R16G16B16A16IntNormalized
         self._tif = hl2ss.SM_TriangleIndexFormat.R16UInt
         self._vnf = hl2ss.SM_VertexNormalFormat.R8G8B8A8IntNormalized
@@ -53,6 +69,7 @@ class sm_manager:
         self._bounds = False
         self._ipc = hl2ss_lnm.ipc_sm(host, hl2ss.IPCPort.SPATIAL_MAPPING)
         self._surfaces = {}
+        self._buckets = {}
         self._volumes = None
 
     def open(self):
@@ -64,10 +81,31 @@ class sm_manager:
 
     def _load_updated_surfaces(self):
         self._surfaces = self._updated_surfaces
+        self._buckets = self._updated_buckets
 
     def _get_surfaces(self):
         return self._surfaces.values()
 
+    def _get_buckets(self):
+        return self._buckets.values()
+
+    def _update_buckets(self):
+        changed = set()
+        for id, entry in self._updated_surfaces.items():
+            if (self._surfaces.get(id, None) is not entry):
+                changed.add(entry.bucket)
+        for id, entry in self._surfaces.items():
+            if (self._updated_surfaces.get(id, None) is not entry):
+                changed.add(entry.bucket)
+        members = {bucket : {} for bucket in changed}
+        for id, entry in self._updated_surfaces.items():
+            if (entry.bucket in members):
+                members[entry.bucket][id] = entry
+        self._updated_buckets = {bucket : rcs for bucket, rcs in self._buckets.items() if (bucket not in changed)}
+        for bucket, surfaces in members.items():
+            if (len(surfaces) > 0):
+                self._updated_buckets[bucket] = _sm_manager_bucket(surfaces)
+
     def get_observed_surfaces(self):
         self._updated_surfaces = {}
         tasks = hl2ss.sm_mesh_task()        
@@ -98,11 +136,11 @@ class sm_manager:
             mesh.unpack(self._vpf, self._tif, self._vnf)
             hl2ss_3dcv.sm_mesh_cast(mesh, np.float64, np.uint32, np.float64)
             hl2ss_3dcv.sm_mesh_normalize(mesh)
-            rcs = o3d.t.geometry.RaycastingScene()
-            rcs.add_triangles(o3d.t.geometry.TriangleMesh.from_legacy(sm_mesh_to_open3d_triangle_mesh(mesh)))
+            triangle_mesh = o3d.t.geometry.TriangleMesh.from_legacy(sm_mesh_to_open3d_triangle_mesh(mesh))
             surface_info = updated_surfaces[index]
-            self._updated_surfaces[surface_info.id] = _sm_manager_entry(surface_info.update_time, mesh, rcs)
+            self._updated_surfaces[surface_info.id] = _sm_manager_entry(surface_info.update_time, mesh, triangle_mesh, _sm_manager_get_bucket(mesh, self._bucket_size))
             
+        self._update_buckets()
         self._load_updated_surfaces()
     
     def close(self):
@@ -112,14 +150,20 @@ class sm_manager:
         surfaces = self._get_surfaces()
         return [surface.mesh for surface in surfaces]
 
-    def cast_rays(self, rays):
-        surfaces = self._get_surfaces()
-        n = len(surfaces)
-        distances = np.ones(rays.shape[0:-1] + (n if (n > 0) else 1,)) * np.inf
-        for index, entry in enumerate(surfaces):
-            distances[..., index] = entry.rcs.cast_rays(rays)['t_hit'].numpy()
-        distances = np.min(distances, axis=-1)
-        return distances
+    def cast_rays(self, rays, ids=False):
+        buckets = self._get_buckets()
+        distances = np.full(rays.shape[0:-1], np.inf)
+        surface_ids = np.full(rays.shape[0:-1], None, dtype=object) if (ids) else None
+        triangle_ids = np.full(rays.shape[0:-1], -1, dtype=np.int64) if (ids) else None
+        for bucket in buckets:
+            hits = bucket.rcs.cast_rays(rays)
+            t_hit = hits['t_hit'].numpy()
+            closer = t_hit < distances
+            distances[closer] = t_hit[closer]
+            if (ids):
+                surface_ids[closer] = bucket.ids[hits['geometry_ids'].numpy()[closer]]
+                triangle_ids[closer] = hits['primitive_ids'].numpy()[closer]
+        return (distances, surface_ids, triangle_ids) if (ids) else distances
 
 
 class sm_mt_manager(sm_manager):
@@ -138,6 +182,12 @@ class sm_mt_manager(sm_manager):
         surfaces = super()._get_surfaces()
         self._lock.release()
         return surfaces
+
+    def _get_buckets(self):
+        self._lock.acquire()
+        buckets = super()._get_buckets()
+        self._lock.release()
+        return buckets
     
     def get_observed_surfaces(self):
         if (self._task is not None):
@@ -159,12 +209,12 @@ class sm_mp_manager(mp.Process):
     IPC_GET_OBSERVED_SURFACES = 2
     IPC_CAST_RAYS = 3
 
-    def __init__(self, host, triangles_per_cubic_meter, threads):
+    def __init__(self, host, triangles_per_cubic_meter, threads, bucket_size=4.0):
         super().__init__()
         self._semaphore = mp.Semaphore(0)
         self._din = mp.Queue()
         self._dout = mp.Queue()        
-        self._ipc = sm_mt_manager(host, triangles_per_cubic_meter, threads)
+        self._ipc = sm_mt_manager(host, triangles_per_cubic_meter, threads, bucket_size)
 
     def open(self):
         self.start()
@@ -183,9 +233,10 @@ class sm_mp_manager(mp.Process):
         self._din.put(sm_mp_manager.IPC_GET_OBSERVED_SURFACES)
         self._semaphore.release()
 
-    def cast_rays(self, rays):
+    def cast_rays(self, rays, ids=False):
         self._din.put(sm_mp_manager.IPC_CAST_RAYS)
         self._din.put(rays)
+        self._din.put(ids)
         self._semaphore.release()
         d = self._dout.get()
         return d
@@ -199,7 +250,8 @@ class sm_mp_manager(mp.Process):
 
     def _cast_rays(self):
         rays = self._din.get()
-        d = self._ipc.cast_rays(rays)
+        ids = self._din.get()
+        d = self._ipc.cast_rays(rays, ids)
         self._dout.put(d)
     
     def run(self):
@@ -0,0 +1,1380 @@
+
+import collections
+import fractions
+import threading
+import traceback
+import time
+import socket
+import select
+import struct
+import queue
+import numpy as np
+import cv2
+import av
+import hl2ss
+import hl2ss_lnm
+import hl2ss_io
+
+
+#------------------------------------------------------------------------------
+# Server
+#------------------------------------------------------------------------------
+
+class _server:
+    def open(self, host, port, backlog, timeout):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self._socket.listen(backlog)
+        self._socket.settimeout(timeout)
+
+    def accept(self):
+        client_socket, address = self._socket.accept()
+        client_socket.settimeout(None)
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = hl2ss._client()
+        client.attach(client_socket)
+        return client, address
+
+    def close(self):
+        self._socket.close()
+
+
+def _is_disconnect(error):
+    return isinstance(error, OSError) or (str(error) == 'connection closed')
+
+
+def _is_peer_closed(client):
+    try:
+        readable, _, _ = select.select([client._socket], [], [], 0)
+        return (len(readable) > 0) and (len(client._socket.recv(1, socket.MSG_PEEK)) <= 0)
+    except (OSError, ValueError):
+        return True
+
+
+class _stream_server(hl2ss._context_manager):
+    def __init__(self, host, port, backlog=8, timeout=0.25):
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.timeout = timeout
+
+    def on_open(self):
+        pass
+
+    def on_client(self, client, address):
+        pass
+
+    def on_close(self):
+        pass
+
+    def on_error(self, address, error):
+        print('{address}: {error}'.format(address=address, error=''.join(traceback.format_exception(error))))
+
+    def _serve(self, client, address):
+        try:
+            self.on_client(client, address)
+        except Exception as error:
+            if (not _is_disconnect(error)):
+                self.on_error(address, error)
+        finally:
+            client.close()
+            with self._lock:
+                self._threads.pop(address, None)
+
+    def _listen(self):
+        while (not self._event_stop.is_set()):
+            try:
+                client, address = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            thread = threading.Thread(target=self._serve, args=(client, address), daemon=True)
+            with self._lock:
+                self._threads[address] = (client, thread)
+            thread.start()
+
+    def open(self):
+        self._event_stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = dict()
+        self.on_open()
+        self._server = _server()
+        self._server.open(self.host, self.port, self.backlog, self.timeout)
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+
+    def is_open(self):
+        return not self._event_stop.is_set()
+
+    def close(self):
+        self._event_stop.set()
+        self._thread.join()
+        self._server.close()
+        self.on_close()
+        with self._lock:
+            threads = list(self._threads.values())
+        for client, thread in threads:
+            try:
+                client._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            thread.join()
+
+
+#------------------------------------------------------------------------------
+# Stream Configuration
+#------------------------------------------------------------------------------
+
+class _client_file:
+    def __init__(self, client):
+        self._client = client
+        self.data = bytearray()
+
+    def read(self, size):
+        chunk = self._client.download(size, hl2ss.ChunkSize.SINGLE_TRANSFER) if (size > 0) else bytearray()
+        self.data.extend(chunk)
+        return chunk
+
+
+def _create_configuration_reader(client):
+    rd = hl2ss_io._reader()
+    rd.attach(_client_file(client), hl2ss.ChunkSize.SINGLE_TRANSFER)
+    return rd
+
+
+def _receive_configuration_rm_vlc(rd):
+    mode = rd.get_configuration_for_mode()
+    if (mode[0] == hl2ss.StreamMode.MODE_2):
+        return mode
+    return mode + rd.get_configuration_for_video_divisor() + rd.get_configuration_for_video_encoding() + rd.get_configuration_for_h26x_encoding()
+
+
+def _receive_configuration_rm_depth_ahat(rd):
+    mode = rd.get_configuration_for_mode()
+    if (mode[0] == hl2ss.StreamMode.MODE_2):
+        return mode
+    return mode + rd.get_configuration_for_video_divisor() + rd.get_configuration_for_depth_encoding() + rd.get_configuration_for_video_encoding() + rd.get_configuration_for_h26x_encoding()
+
+
+def _receive_configuration_rm_depth_longthrow(rd):
+    mode = rd.get_configuration_for_mode()
+    if (mode[0] == hl2ss.StreamMode.MODE_2):
+        return mode
+    return mode + rd.get_configuration_for_video_divisor() + rd.get_configuration_for_png_encoding()
+
+
+def _receive_configuration_rm_imu(rd):
+    return rd.get_configuration_for_mode()
+
+
+def _receive_configuration_pv(rd):
+    mode = rd.get_configuration_for_mode()
+    video_format = rd.get_configuration_for_video_format()
+    if ((mode[0] & hl2ss._PVCNT.START) != 0):
+        rd.get('<BBBBBBfffII')
+    if ((mode[0] & 3) >= hl2ss.StreamMode.MODE_2):
+        return mode + video_format
+    return mode + video_format + rd.get_configuration_for_video_divisor() + rd.get_configuration_for_video_encoding() + rd.get_configuration_for_h26x_encoding()
+
+
+def _receive_configuration_microphone(rd):
+    return (hl2ss.StreamMode.MODE_0,) + rd.get_configuration_for_audio_encoding()
+
+
+def _receive_configuration_si(rd):
+    return (hl2ss.StreamMode.MODE_0,)
+
+
+def _receive_configuration_eet(rd):
+    return (hl2ss.StreamMode.MODE_1, rd.get_configuration_for_eet())
+
+
+def _receive_configuration(port, rd):
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return _receive_configuration_rm_vlc(rd)
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return _receive_configuration_rm_vlc(rd)
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return _receive_configuration_rm_vlc(rd)
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return _receive_configuration_rm_vlc(rd)
+    if (port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return _receive_configuration_rm_depth_ahat(rd)
+    if (port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return _receive_configuration_rm_depth_longthrow(rd)
+    if (port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+        return _receive_configuration_rm_imu(rd)
+    if (port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+        return _receive_configuration_rm_imu(rd)
+    if (port == hl2ss.StreamPort.RM_IMU_MAGNETOMETER):
+        return _receive_configuration_rm_imu(rd)
+    if (port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return _receive_configuration_pv(rd)
+    if (port == hl2ss.StreamPort.MICROPHONE):
+        return _receive_configuration_microphone(rd)
+    if (port == hl2ss.StreamPort.SPATIAL_INPUT):
+        return _receive_configuration_si(rd)
+    if (port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+        return _receive_configuration_eet(rd)
+
+
+def _get_stream_mode(port, mode):
+    return (mode & 3) if (port == hl2ss.StreamPort.PERSONAL_VIDEO) else mode
+
+
+def _is_control(port, mode):
+    return (port == hl2ss.StreamPort.PERSONAL_VIDEO) and ((mode & 3) == hl2ss._PVCNT.MODE_3)
+
+
+def _get_mode2_size(port):
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return hl2ss._Mode2Layout_RM_VLC.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return hl2ss._Mode2Layout_RM_VLC.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return hl2ss._Mode2Layout_RM_VLC.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return hl2ss._Mode2Layout_RM_VLC.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return hl2ss._Mode2Layout_RM_DEPTH_AHAT.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return hl2ss._Mode2Layout_RM_DEPTH_LONGTHROW.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+        return hl2ss._Mode2Layout_RM_IMU.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+        return hl2ss._Mode2Layout_RM_IMU.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.RM_IMU_MAGNETOMETER):
+        return hl2ss._Mode2Layout_RM_IMU.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+    if (port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return hl2ss._Mode2Layout_PV.FLOAT_COUNT * hl2ss._SIZEOF.FLOAT
+
+    return None
+
+
+def get_stream_mode(rx):
+    if (rx.port == hl2ss.StreamPort.MICROPHONE):
+        return hl2ss.StreamMode.MODE_0
+    if (rx.port == hl2ss.StreamPort.SPATIAL_INPUT):
+        return hl2ss.StreamMode.MODE_0
+    if (rx.port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+        return hl2ss.StreamMode.MODE_1
+    return rx.mode
+
+
+#------------------------------------------------------------------------------
+# Packet Packer
+#------------------------------------------------------------------------------
+
+_ZERO_POSE = bytes(16 * hl2ss._SIZEOF.FLOAT)
+
+
+def pack_packet_for_mode(packet, mode):
+    buffer = bytearray()
+    buffer.extend(struct.pack('<QI', packet.timestamp, len(packet.payload)))
+    buffer.extend(packet.payload)
+    if (mode == hl2ss.StreamMode.MODE_1):
+        buffer.extend(_ZERO_POSE if (packet.pose is None) else packet.pose.tobytes())
+    return buffer
+
+
+#------------------------------------------------------------------------------
+# Relay
+#------------------------------------------------------------------------------
+
+# Relay queue overflow policy
+# 0: Discard the oldest queued packet
+# 1: Discard the incoming packet
+# 2: Discard all queued packets and restart at the next key frame
+class RelayPolicy:
+    DROP_OLDEST = 0
+    DROP_NEWEST = 1
+    RESYNC      = 2
+
+
+class _relay_client:
+    def __init__(self, address, mode, queue_size, policy):
+        self.address = address
+        self.mode = mode
+        self.policy = policy
+        self.sent = 0
+        self.dropped = 0
+        self.bytes = 0
+        self._queue = queue.Queue(queue_size)
+        self._sync = True
+
+    def _drain(self):
+        count = 0
+        while (True):
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return count
+            count += 1
+
+    def _drain_one(self):
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            return 0
+        return 1
+
+    def push(self, item):
+        if (item is None):
+            self._drain()
+            self._queue.put(None)
+            return
+        if (self._sync):
+            if (not item[1]):
+                return
+            self._sync = False
+        try:
+            self._queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        if (self.policy == RelayPolicy.DROP_NEWEST):
+            self.dropped += 1
+            return
+        if (self.policy == RelayPolicy.DROP_OLDEST):
+            self.dropped += self._drain_one()
+        else:
+            self.dropped += self._drain()
+            if (not item[1]):
+                self._sync = True
+                self.dropped += 1
+                return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def pop(self, timeout):
+        return self._queue.get(timeout=timeout)
+
+    def pending(self):
+        return self._queue.qsize()
+
+
+def _get_mode2_configuration(rx):
+    if (_get_mode2_size(rx.port) is None):
+        return None
+    if (rx.port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return hl2ss._create_configuration_for_pv_mode2(hl2ss.StreamMode.MODE_2, rx.width, rx.height, rx.framerate)
+    return hl2ss._create_configuration_for_rm_mode2(hl2ss.StreamMode.MODE_2)
+
+
+def _interrupt_rx(rx):
+    try:
+        rx._client._client._socket.shutdown(socket.SHUT_RDWR)
+    except (AttributeError, OSError):
+        pass
+
+
+class relay(_stream_server):
+    def __init__(self, rx, host, port=None, queue_size=64, policy=RelayPolicy.RESYNC, transcoder=None, backlog=8, timeout=0.25):
+        super().__init__(host, rx.port if (port is None) else port, backlog, timeout)
+        self._rx = rx
+        self.queue_size = queue_size
+        self.policy = policy
+        self.transcoder = transcoder
+
+    def on_open(self):
+        self._clients = dict()
+        self._clients_lock = threading.Lock()
+        self._mode = get_stream_mode(self._rx)
+        self._stream = self._rx
+        # The HL2 accepts one client per port, so calibration is downloaded
+        # before the upstream stream is opened and served from memory
+        configuration = _get_mode2_configuration(self._rx)
+        self._calibration = None if (configuration is None) else hl2ss._download_mode2_data(self._rx.host, self._rx.port, configuration, _get_mode2_size(self._rx.port))
+        if (self.transcoder is not None):
+            self.transcoder.create(self._rx)
+            self._stream = self.transcoder
+        self._rx.open()
+        self._upstream = threading.Thread(target=self._relay, daemon=True)
+        self._upstream.start()
+
+    def _relay(self):
+        while (not self._event_stop.is_set()):
+            try:
+                data = self._rx.get_next_packet()
+            except Exception as error:
+                if (not self._event_stop.is_set()):
+                    self.on_error((self._rx.host, self._rx.port), error)
+                break
+            if (self.transcoder is not None):
+                data = self.transcoder.transcode(data)
+                if (data is None):
+                    continue
+            item = (data, hl2ss_lnm.is_key_frame(self._stream, data.payload), pack_packet_for_mode(data, self._mode))
+            with self._clients_lock:
+                clients = list(self._clients.values())
+            for client in clients:
+                client.push(item)
+        with self._clients_lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.push(None)
+
+    def _send_mode2(self, client):
+        client.sendall(self._calibration)
+
+    def on_client(self, client, address):
+        mode = _receive_configuration(self._rx.port, _create_configuration_reader(client))[0]
+        if (_is_control(self._rx.port, mode)):
+            return
+        mode = _get_stream_mode(self._rx.port, mode)
+        if (mode == hl2ss.StreamMode.MODE_2):
+            self._send_mode2(client)
+            return
+        entry = _relay_client(address, mode, self.queue_size, self.policy)
+        with self._clients_lock:
+            self._clients[address] = entry
+        try:
+            while (not self._event_stop.is_set()):
+                # Clients never send after the configuration, so readable
+                # with no data while idle means the client disconnected
+                try:
+                    item = entry.pop(self.timeout)
+                except queue.Empty:
+                    if (_is_peer_closed(client)):
+                        break
+                    continue
+                if (item is None):
+                    break
+                data = item[2] if (mode == self._mode) else pack_packet_for_mode(item[0], mode)
+                client.sendall(data)
+                entry.sent += 1
+                entry.bytes += len(data)
+        finally:
+            with self._clients_lock:
+                self._clients.pop(address, None)
+
+    def get_statistics(self):
+        with self._clients_lock:
+            clients = list(self._clients.values())
+        return {client.address : {'sent' : client.sent, 'dropped' : client.dropped, 'bytes' : client.bytes, 'pending' : client.pending()} for client in clients}
+
+    def on_close(self):
+        _interrupt_rx(self._rx)
+        self._upstream.join()
+        self._rx.close()
+        with self._clients_lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.push(None)
+
+
+#------------------------------------------------------------------------------
+# Relay Transcoders
+#------------------------------------------------------------------------------
+
+def _get_quiet_encoder_options(name):
+    if (name == 'libx264'):
+        return {'x264-params' : 'log=-1'}
+    if (name == 'libx265'):
+        return {'x265-params' : 'log-level=none'}
+    return {}
+
+
+def _create_video_encoder(width, height, framerate, profile, bitrate, gop_size):
+    encoder = av.CodecContext.create(hl2ss.get_video_codec_name(profile), 'w')
+    encoder.width = width
+    encoder.height = height
+    encoder.pix_fmt = 'yuv420p'
+    encoder.time_base = fractions.Fraction(1, framerate)
+    encoder.framerate = framerate
+    encoder.bit_rate = bitrate
+    encoder.gop_size = gop_size
+    encoder.max_b_frames = 0
+    encoder.options = {'tune' : 'zerolatency', **_get_quiet_encoder_options(encoder.name)}
+    return encoder
+
+
+def _encode_video_frame(encoder, frame):
+    return b''.join([bytes(packet) for packet in encoder.encode(frame)])
+
+
+class pv_transcoder:
+    def __init__(self, width, height, framerate, profile, bitrate=None, gop_size=None):
+        self.port = hl2ss.StreamPort.PERSONAL_VIDEO
+        self.width = width
+        self.height = height
+        self.framerate = framerate
+        self.profile = profile
+        self.bitrate = hl2ss_lnm.get_video_codec_default_bitrate(width, height, framerate, 1, profile) if (bitrate is None) else bitrate
+        self.gop_size = hl2ss_lnm.get_video_codec_default_gop_size(framerate, 1) if (gop_size is None) else gop_size
+
+    def create(self, rx):
+        self._scale = np.array([self.width / rx.width, self.height / rx.height], dtype=np.float32)
+        self._decoder = hl2ss.decode_pv(rx.profile)
+        self._decoder.create(rx.width, rx.height)
+        self._encoder = _create_video_encoder(self.width, self.height, self.framerate, self.profile, self.bitrate, self.gop_size)
+        self._pts = 0
+
+    def transcode(self, data):
+        payload = hl2ss.unpack_pv(data.payload)
+        image = self._decoder.decode(payload.image, 'bgr24')
+        if (image is None):
+            return None
+        frame = av.VideoFrame.from_ndarray(image, format='bgr24').reformat(self.width, self.height, 'yuv420p')
+        frame.pts = self._pts
+        self._pts += 1
+        encoded = _encode_video_frame(self._encoder, frame)
+        if (len(encoded) <= 0):
+            return None
+        focal_length = payload.focal_length * self._scale
+        principal_point = payload.principal_point * self._scale
+        return hl2ss._packet(data.timestamp, encoded + focal_length.tobytes() + principal_point.tobytes(), data.pose)
+
+
+#------------------------------------------------------------------------------
+# Replay
+#------------------------------------------------------------------------------
+
+class replay(_stream_server):
+    def __init__(self, filename, host, port=None, speed=1.0, loop=False, calibration=None, chunk=hl2ss.ChunkSize.SINGLE_TRANSFER, backlog=8, timeout=0.25):
+        super().__init__(host, port, backlog, timeout)
+        self.filename = filename
+        self.speed = speed
+        self.loop = loop
+        self.calibration = calibration
+        self.chunk = chunk
+
+    def on_open(self):
+        rd = hl2ss_io.create_rd(self.filename, self.chunk, None)
+        rd.open()
+        rd.close()
+        self.stream_port = rd.port
+        self.stream_mode = get_stream_mode(rd)
+        if (self.port is None):
+            self.port = self.stream_port
+
+    def _wait(self, base, timestamp):
+        if (self.speed <= 0):
+            return
+        delay = ((timestamp - base[1]) / (hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS * self.speed)) - (time.perf_counter() - base[0])
+        if (delay > 0):
+            self._event_stop.wait(delay)
+
+    def _send_mode2(self, client):
+        size = _get_mode2_size(self.stream_port)
+        client.sendall(bytes(size) if (self.calibration is None) else self.calibration[:size])
+
+    def on_client(self, client, address):
+        mode = _receive_configuration(self.stream_port, _create_configuration_reader(client))[0]
+        if (_is_control(self.stream_port, mode)):
+            return
+        mode = _get_stream_mode(self.stream_port, mode)
+        if (mode == hl2ss.StreamMode.MODE_2):
+            self._send_mode2(client)
+            return
+        offset = 0
+        while (not self._event_stop.is_set()):
+            span = self._stream(client, mode, offset)
+            if ((not self.loop) or (span is None)):
+                break
+            offset += span
+
+    def _stream(self, client, mode, offset):
+        rd = hl2ss_io.create_rd(self.filename, self.chunk, None)
+        rd.open()
+        first = None
+        last = None
+        period = 1
+        try:
+            data = rd.get_next_packet()
+            while ((data is not None) and (not self._event_stop.is_set())):
+                if (first is None):
+                    first = data.timestamp
+                    base = (time.perf_counter(), first)
+                else:
+                    period = data.timestamp - last
+                self._wait(base, data.timestamp)
+                last = data.timestamp
+                data.timestamp += offset
+                client.sendall(pack_packet_for_mode(data, mode))
+                data = rd.get_next_packet()
+        finally:
+            rd.close()
+        return None if (first is None) else ((last - first) + period)
+
+
+#------------------------------------------------------------------------------
+# Synthetic Load
+#------------------------------------------------------------------------------
+
+def get_synthetic_timestamp():
+    return time.time_ns() // 100
+
+
+def _create_synthetic_pose(index):
+    angle = index * 0.01
+    pose = np.eye(4, 4, dtype=np.float32)
+    pose[0, 0] =  np.cos(angle)
+    pose[0, 2] = -np.sin(angle)
+    pose[2, 0] =  np.sin(angle)
+    pose[2, 2] =  np.cos(angle)
+    pose[3, 0] = 0.001 * (index % 1000)
+    pose[3, 1] = 1.6
+    return pose
+
+
+def _create_synthetic_image(height, width, index, dtype=np.uint8, scale=1):
+    return (((np.arange(height, dtype=np.uint32)[:, None] + np.arange(width, dtype=np.uint32)[None, :] + 4 * index) * scale) % (np.iinfo(dtype).max + 1)).astype(dtype)
+
+
+def _get_gop_size(options, framerate):
+    return max([1, options.get(hl2ss.H26xEncoderProperty.CODECAPI_AVEncMPVGOPSize, framerate)])
+
+
+def _get_pool_size(count, gop_size):
+    return gop_size * max([1, count // gop_size])
+
+
+def _encode_video_pool(frames, width, height, framerate, profile, bitrate, gop_size):
+    payloads = []
+    for start in range(0, len(frames), gop_size):
+        encoder = _create_video_encoder(width, height, framerate, profile, bitrate, gop_size)
+        for pts, frame in enumerate(frames[start:(start + gop_size)]):
+            frame.pts = pts
+            payloads.append(_encode_video_frame(encoder, frame))
+    return payloads
+
+
+def _synthesize_rm_vlc(configuration, count):
+    mode, divisor, profile, level, bitrate, options = configuration
+    if (profile == hl2ss.VideoProfile.RAW):
+        return [_create_synthetic_image(hl2ss.Parameters_RM_VLC.HEIGHT, hl2ss.Parameters_RM_VLC.WIDTH, index).tobytes() for index in range(0, count)]
+    framerate = hl2ss.Parameters_RM_VLC.FPS // divisor
+    gop_size = _get_gop_size(options, framerate)
+    frames = [av.VideoFrame.from_ndarray(_create_synthetic_image(hl2ss.Parameters_RM_VLC.HEIGHT, hl2ss.Parameters_RM_VLC.WIDTH, index), format='gray').reformat(format='yuv420p') for index in range(0, _get_pool_size(count, gop_size))]
+    return _encode_video_pool(frames, hl2ss.Parameters_RM_VLC.WIDTH, hl2ss.Parameters_RM_VLC.HEIGHT, framerate, profile, bitrate, gop_size)
+
+
+def _synthesize_rm_depth_ahat(configuration, count):
+    mode, divisor, profile_z, profile_ab, level, bitrate, options = configuration
+    framerate = hl2ss.Parameters_RM_DEPTH_AHAT.FPS // divisor
+    gop_size = _get_gop_size(options, framerate)
+    size = count if (profile_ab == hl2ss.VideoProfile.RAW) else _get_pool_size(count, gop_size)
+    depth = [_create_synthetic_image(hl2ss.Parameters_RM_DEPTH_AHAT.HEIGHT, hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH, index, np.uint16, 4) % 1024 for index in range(0, size)]
+    ab = [_create_synthetic_image(hl2ss.Parameters_RM_DEPTH_AHAT.HEIGHT, hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH, index, np.uint16, 64) for index in range(0, size)]
+    if (profile_z == hl2ss.DepthProfile.SAME):
+        if (profile_ab == hl2ss.VideoProfile.RAW):
+            return [depth[index].tobytes() + ab[index].tobytes() for index in range(0, size)]
+        frames = []
+        for index in range(0, size):
+            yuv = np.empty((hl2ss._Mode0Layout_RM_DEPTH_AHAT.END_AB_V_Y, hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH), dtype=np.uint8)
+            yuv[hl2ss._Mode0Layout_RM_DEPTH_AHAT.BEGIN_DEPTH_Y:hl2ss._Mode0Layout_RM_DEPTH_AHAT.END_DEPTH_Y, :] = depth[index] // 4
+            yuv[hl2ss._Mode0Layout_RM_DEPTH_AHAT.BEGIN_AB_U_Y:hl2ss._Mode0Layout_RM_DEPTH_AHAT.END_AB_U_Y, :] = np.sqrt(ab[index][:, 0::4]).astype(np.uint8).reshape((-1, hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH))
+            yuv[hl2ss._Mode0Layout_RM_DEPTH_AHAT.BEGIN_AB_V_Y:hl2ss._Mode0Layout_RM_DEPTH_AHAT.END_AB_V_Y, :] = np.sqrt(ab[index][:, 2::4]).astype(np.uint8).reshape((-1, hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH))
+            frames.append(av.VideoFrame.from_ndarray(yuv, format='yuv420p'))
+        return _encode_video_pool(frames, hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH, hl2ss.Parameters_RM_DEPTH_AHAT.HEIGHT, framerate, profile_ab, bitrate, gop_size)
+    import pyzdepth
+    compressor = pyzdepth.DepthCompressor()
+    payloads_z = [bytes(compressor.Compress(hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH, hl2ss.Parameters_RM_DEPTH_AHAT.HEIGHT, depth[index].tobytes(), True)[1]) for index in range(0, size)]
+    if (profile_ab == hl2ss.VideoProfile.RAW):
+        payloads_ab = [ab[index].tobytes() for index in range(0, size)]
+    else:
+        frames = [av.VideoFrame.from_ndarray(np.sqrt(ab[index]).astype(np.uint8), format='gray').reformat(format='yuv420p') for index in range(0, size)]
+        payloads_ab = _encode_video_pool(frames, hl2ss.Parameters_RM_DEPTH_AHAT.WIDTH, hl2ss.Parameters_RM_DEPTH_AHAT.HEIGHT, framerate, profile_ab, bitrate, gop_size)
+    return [struct.pack('<II', len(payloads_z[index]), len(payloads_ab[index])) + payloads_z[index] + payloads_ab[index] for index in range(0, size)]
+
+
+def _synthesize_rm_depth_longthrow(configuration, count):
+    payloads = []
+    for index in range(0, count):
+        depth = _create_synthetic_image(hl2ss.Parameters_RM_DEPTH_LONGTHROW.HEIGHT, hl2ss.Parameters_RM_DEPTH_LONGTHROW.WIDTH, index, np.uint16, 8) % 7500
+        ab = _create_synthetic_image(hl2ss.Parameters_RM_DEPTH_LONGTHROW.HEIGHT, hl2ss.Parameters_RM_DEPTH_LONGTHROW.WIDTH, index, np.uint16, 16)
+        composite = np.vstack((depth, ab)).view(np.uint8).reshape((hl2ss.Parameters_RM_DEPTH_LONGTHROW.HEIGHT, hl2ss.Parameters_RM_DEPTH_LONGTHROW.WIDTH, 4))
+        payloads.append(cv2.imencode('.png', composite)[1].tobytes())
+    return payloads
+
+
+def _synthesize_rm_imu(batch_size, count):
+    payloads = []
+    for index in range(0, count):
+        payload = bytearray()
+        for sample in range(0, batch_size):
+            ticks = (index * batch_size) + sample
+            payload.extend(struct.pack('<QQffff', ticks, ticks, np.sin(ticks * 0.01), np.cos(ticks * 0.01), 9.81, 35.0))
+        payloads.append(bytes(payload))
+    return payloads
+
+
+def _synthesize_pv(configuration, count):
+    mode, width, height, framerate, divisor, profile, level, bitrate, options = configuration
+    intrinsics = np.array([width, width, width / 2, height / 2], dtype=np.float32).tobytes()
+    if (profile == hl2ss.VideoProfile.RAW):
+        stride = hl2ss.get_video_stride(width)
+        return [_create_synthetic_image((height * 3) // 2, stride, index).tobytes() + intrinsics for index in range(0, count)]
+    framerate = framerate // divisor
+    gop_size = _get_gop_size(options, framerate)
+    frames = [av.VideoFrame.from_ndarray(np.dstack([_create_synthetic_image(height, width, index + offset) for offset in [0, 85, 170]]), format='bgr24').reformat(format='yuv420p') for index in range(0, _get_pool_size(count, gop_size))]
+    return [payload + intrinsics for payload in _encode_video_pool(frames, width, height, framerate, profile, bitrate, gop_size)]
+
+
+def _create_adts_header(size):
+    length = size + 7
+    return bytes([0xFF, 0xF1, (1 << 6) | (3 << 2), ((hl2ss.Parameters_MICROPHONE.CHANNELS & 3) << 6) | (length >> 11), (length >> 3) & 0xFF, ((length & 7) << 5) | 0x1F, 0xFC])
+
+
+def _synthesize_microphone(configuration, count):
+    mode, profile, level = configuration
+    if (profile == hl2ss.AudioProfile.RAW):
+        samples = hl2ss.Parameters_MICROPHONE.GROUP_SIZE_RAW
+        return [(np.sin(2 * np.pi * 440 * (np.arange(samples * hl2ss.Parameters_MICROPHONE.CHANNELS) // hl2ss.Parameters_MICROPHONE.CHANNELS + index * samples) / hl2ss.Parameters_MICROPHONE.SAMPLE_RATE) * 8192).astype(np.int16).tobytes() for index in range(0, count)]
+    samples = hl2ss.Parameters_MICROPHONE.GROUP_SIZE_AAC
+    encoder = av.CodecContext.create(hl2ss.get_audio_codec_name(profile), 'w')
+    encoder.sample_rate = hl2ss.Parameters_MICROPHONE.SAMPLE_RATE
+    encoder.layout = 'stereo'
+    encoder.format = 'fltp'
+    encoder.bit_rate = hl2ss.get_audio_codec_bitrate(profile)
+    payloads = []
+    for index in range(0, count + 2):
+        tone = np.sin(2 * np.pi * 440 * (np.arange(samples) + index * samples) / hl2ss.Parameters_MICROPHONE.SAMPLE_RATE).astype(np.float32) * 0.25
+        frame = av.AudioFrame.from_ndarray(np.vstack((tone, tone)), format='fltp', layout='stereo')
+        frame.sample_rate = hl2ss.Parameters_MICROPHONE.SAMPLE_RATE
+        frame.pts = index * samples
+        payloads.extend([_create_adts_header(packet.size) + bytes(packet) for packet in encoder.encode(frame)])
+    return payloads
+
+
+def _synthesize_si(configuration, count):
+    payloads = []
+    for index in range(0, count):
+        pose = _create_synthetic_pose(index)
+        joints = np.zeros((hl2ss.SI_HandJointKind.TOTAL, hl2ss._Mode0Layout_SI_Hand.BYTE_COUNT // hl2ss._SIZEOF.FLOAT), dtype=np.float32)
+        joints[:, 3] = 1
+        joints[:, 4] = np.linspace(-0.1, 0.1, hl2ss.SI_HandJointKind.TOTAL)
+        joints[:, 6] = -0.4
+        joints[:, 7] = 0.01
+        joints[:, 8] = np.frombuffer(struct.pack('<i', 1), dtype=np.float32)[0]
+        head = np.hstack((pose[3, :3], -pose[2, :3], pose[1, :3], pose[3, :3], -pose[2, :3])).astype(np.float32)
+        payloads.append(struct.pack('<B', 0x0F) + head.tobytes() + joints.tobytes() + joints.tobytes())
+    return payloads
+
+
+def _synthesize_eet(configuration, count):
+    payloads = []
+    for index in range(0, count):
+        pose = _create_synthetic_pose(index)
+        ray = np.hstack((pose[3, :3], -pose[2, :3])).astype(np.float32)
+        f = np.hstack((ray, ray, ray, [1.0, 1.0, 1.5])).astype(np.float32)
+        payloads.append(struct.pack('<I', 0) + f.tobytes() + struct.pack('<I', 0x7F))
+    return payloads
+
+
+def _synthesize(port, configuration, count):
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return _synthesize_rm_vlc(configuration, count)
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return _synthesize_rm_vlc(configuration, count)
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return _synthesize_rm_vlc(configuration, count)
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return _synthesize_rm_vlc(configuration, count)
+    if (port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return _synthesize_rm_depth_ahat(configuration, count)
+    if (port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return _synthesize_rm_depth_longthrow(configuration, count)
+    if (port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+        return _synthesize_rm_imu(hl2ss.Parameters_RM_IMU_ACCELEROMETER.BATCH_SIZE, count)
+    if (port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+        return _synthesize_rm_imu(hl2ss.Parameters_RM_IMU_GYROSCOPE.BATCH_SIZE, count)
+    if (port == hl2ss.StreamPort.RM_IMU_MAGNETOMETER):
+        return _synthesize_rm_imu(hl2ss.Parameters_RM_IMU_MAGNETOMETER.BATCH_SIZE, count)
+    if (port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return _synthesize_pv(configuration, count)
+    if (port == hl2ss.StreamPort.MICROPHONE):
+        return _synthesize_microphone(configuration, count)
+    if (port == hl2ss.StreamPort.SPATIAL_INPUT):
+        return _synthesize_si(configuration, count)
+    if (port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+        return _synthesize_eet(configuration, count)
+
+
+def get_synthetic_rate(port, configuration):
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return hl2ss.Parameters_RM_VLC.FPS / configuration[1]
+    if (port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return hl2ss.Parameters_RM_VLC.FPS / configuration[1]
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return hl2ss.Parameters_RM_VLC.FPS / configuration[1]
+    if (port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return hl2ss.Parameters_RM_VLC.FPS / configuration[1]
+    if (port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return hl2ss.Parameters_RM_DEPTH_AHAT.FPS / configuration[1]
+    if (port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return hl2ss.Parameters_RM_DEPTH_LONGTHROW.FPS / configuration[1]
+    if (port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+        return 12
+    if (port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+        return 6
+    if (port == hl2ss.StreamPort.RM_IMU_MAGNETOMETER):
+        return 5
+    if (port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return configuration[3] / configuration[4]
+    if (port == hl2ss.StreamPort.MICROPHONE):
+        return hl2ss.Parameters_MICROPHONE.SAMPLE_RATE / (hl2ss.Parameters_MICROPHONE.GROUP_SIZE_RAW if (configuration[1] == hl2ss.AudioProfile.RAW) else hl2ss.Parameters_MICROPHONE.GROUP_SIZE_AAC)
+    if (port == hl2ss.StreamPort.SPATIAL_INPUT):
+        return hl2ss.Parameters_SI.SAMPLE_RATE
+    if (port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+        return configuration[1]
+
+
+class load_statistics:
+    def __init__(self, window=4096):
+        self.packets = 0
+        self.dropped = 0
+        self.bytes = 0
+        self._latency = collections.deque(maxlen=window)
+        self._start = time.perf_counter()
+
+    def add(self, size, latency):
+        self.packets += 1
+        self.bytes += size
+        self._latency.append(latency)
+
+    def drop(self, count):
+        self.dropped += count
+
+    def get(self, percentiles=(50, 90, 99)):
+        elapsed = time.perf_counter() - self._start
+        latency = np.percentile(np.array(self._latency), percentiles) * 1000 if (len(self._latency) > 0) else np.full(len(percentiles), np.nan)
+        statistics = {'packets' : self.packets, 'dropped' : self.dropped, 'packets_per_second' : self.packets / elapsed, 'megabytes_per_second' : self.bytes / (elapsed * 1024 * 1024)}
+        for percentile, value in zip(percentiles, latency):
+            statistics[f'latency_p{percentile}_ms'] = float(value)
+        return statistics
+
+
+class synthetic(_stream_server):
+    def __init__(self, host, port, rate=None, count=64, backlog=8, timeout=0.25):
+        super().__init__(host, port, backlog, timeout)
+        self.rate = rate
+        self.count = count
+
+    def on_open(self):
+        self._statistics = dict()
+        self._statistics_lock = threading.Lock()
+
+    def on_client(self, client, address):
+        configuration = _receive_configuration(self.port, _create_configuration_reader(client))
+        if (_is_control(self.port, configuration[0])):
+            return
+        mode = _get_stream_mode(self.port, configuration[0])
+        if (mode == hl2ss.StreamMode.MODE_2):
+            client.sendall(bytes(_get_mode2_size(self.port)))
+            return
+        payloads = _synthesize(self.port, configuration, self.count)
+        period = 1 / (get_synthetic_rate(self.port, configuration) if (self.rate is None) else self.rate)
+        statistics = load_statistics()
+        with self._statistics_lock:
+            self._statistics[address] = statistics
+        try:
+            index = 0
+            base = time.perf_counter()
+            while (not self._event_stop.is_set()):
+                schedule = base + (index * period)
+                delay = schedule - time.perf_counter()
+                if (delay > 0):
+                    self._event_stop.wait(delay)
+                elif (-delay > period):
+                    skip = int(-delay / period)
+                    statistics.drop(skip)
+                    index += skip
+                    continue
+                data = pack_packet_for_mode(hl2ss._packet(get_synthetic_timestamp(), payloads[index % len(payloads)], _create_synthetic_pose(index)), mode)
+                client.sendall(data)
+                statistics.add(len(data), time.perf_counter() - schedule)
+                index += 1
+        finally:
+            with self._statistics_lock:
+                self._statistics.pop(address, None)
+
+    def get_statistics(self):
+        with self._statistics_lock:
+            statistics = list(self._statistics.items())
+        return {address : entry.get() for address, entry in statistics}
+
+
+class _benchmark_probe:
+    def __init__(self, client):
+        self._client = client
+        self.size = 0
+
+    def get_next_packet(self):
+        data = self._client.get_next_packet()
+        self.size = 12 + len(data.payload) + (0 if (data.pose is None) else 64)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def benchmark(rx, count, rate=None):
+    # Sizes are measured at the raw packet layer so decoded receivers, whose
+    # payloads are frame structures, can be benchmarked too
+    probe = _benchmark_probe(rx._client)
+    rx._client = probe
+    statistics = load_statistics(count)
+    period = None if (rate is None) else (hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS / rate)
+    last = None
+    try:
+        for _ in range(0, count):
+            data = rx.get_next_packet()
+            now = get_synthetic_timestamp()
+            statistics.add(probe.size, (now - data.timestamp) / hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS)
+            if ((period is not None) and (last is not None)):
+                statistics.drop(max([0, int(round((data.timestamp - last) / period)) - 1]))
+            last = data.timestamp
+    finally:
+        rx._client = probe._client
+    return statistics.get()
+
+
+#------------------------------------------------------------------------------
+# Mesh Sources
+#------------------------------------------------------------------------------
+
+class _mesh:
+    def __init__(self, vertex_positions, triangle_indices):
+        self.vertex_positions = vertex_positions
+        self.triangle_indices = triangle_indices
+        self.vertex_normals = compute_vertex_normals(vertex_positions, triangle_indices)
+
+
+def compute_vertex_normals(vertex_positions, triangle_indices):
+    v = vertex_positions[triangle_indices]
+    n = np.cross(v[:, 1, :] - v[:, 0, :], v[:, 2, :] - v[:, 0, :])
+    normals = np.zeros(vertex_positions.shape, dtype=np.float32)
+    for i in range(0, 3):
+        np.add.at(normals, triangle_indices[:, i], n)
+    d = np.linalg.norm(normals, axis=1)
+    normals[d > 0, :] = normals[d > 0, :] / d[d > 0, np.newaxis]
+    return normals
+
+
+def _triangulate(faces):
+    triangles = []
+    for face in faces:
+        for i in range(1, len(face) - 1):
+            triangles.append((face[0], face[i], face[i + 1]))
+    return np.array(triangles, dtype=np.uint32).reshape((-1, 3))
+
+
+def load_mesh_obj(filename):
+    vertices = []
+    faces = []
+    with open(filename, 'r') as f:
+        for line in f:
+            fields = line.split()
+            if (len(fields) <= 0):
+                continue
+            if (fields[0] == 'v'):
+                vertices.append([float(x) for x in fields[1:4]])
+            elif (fields[0] == 'f'):
+                indices = [int(x.split('/')[0]) for x in fields[1:]]
+                faces.append([(i - 1) if (i > 0) else (len(vertices) + i) for i in indices])
+    return _mesh(np.array(vertices, dtype=np.float32).reshape((-1, 3)), _triangulate(faces))
+
+
+_PLY_TYPES = {'char' : 'i1', 'uchar' : 'u1', 'short' : 'i2', 'ushort' : 'u2', 'int' : 'i4', 'uint' : 'u4', 'float' : 'f4', 'double' : 'f8', 'int8' : 'i1', 'uint8' : 'u1', 'int16' : 'i2', 'uint16' : 'u2', 'int32' : 'i4', 'uint32' : 'u4', 'float32' : 'f4', 'float64' : 'f8'}
+
+
+def load_mesh_ply(filename):
+    with open(filename, 'rb') as f:
+        elements = []
+        encoding = 'ascii'
+        while (True):
+            fields = f.readline().decode('ascii').split()
+            if (len(fields) <= 0):
+                continue
+            if (fields[0] == 'end_header'):
+                break
+            if (fields[0] == 'format'):
+                encoding = fields[1]
+            elif (fields[0] == 'element'):
+                elements.append((fields[1], int(fields[2]), []))
+            elif (fields[0] == 'property'):
+                elements[-1][2].append(tuple(fields[1:]))
+
+        endian = '>' if (encoding == 'binary_big_endian') else '<'
+        vertices = None
+        faces = []
+
+        for name, count, properties in elements:
+            if (encoding == 'ascii'):
+                rows = [f.readline().decode('ascii').split() for _ in range(0, count)]
+                if (name == 'vertex'):
+                    columns = [p[-1] for p in properties]
+                    vertices = np.array([[float(row[columns.index(axis)]) for axis in ['x', 'y', 'z']] for row in rows], dtype=np.float32).reshape((-1, 3))
+                elif (name == 'face'):
+                    faces = [[int(x) for x in row[1:(1 + int(row[0]))]] for row in rows]
+            elif (properties[0][0] != 'list'):
+                data = np.frombuffer(f.read(count * np.dtype([(p[1], endian + _PLY_TYPES[p[0]]) for p in properties]).itemsize), dtype=[(p[1], endian + _PLY_TYPES[p[0]]) for p in properties])
+                if (name == 'vertex'):
+                    vertices = np.stack([data['x'], data['y'], data['z']], axis=1).astype(np.float32)
+            else:
+                size_type = np.dtype(endian + _PLY_TYPES[properties[0][1]])
+                index_type = np.dtype(endian + _PLY_TYPES[properties[0][2]])
+                for _ in range(0, count):
+                    n = int(np.frombuffer(f.read(size_type.itemsize), dtype=size_type)[0])
+                    face = np.frombuffer(f.read(n * index_type.itemsize), dtype=index_type)
+                    if (name == 'face'):
+                        faces.append(face.tolist())
+
+    return _mesh(vertices, _triangulate(faces))
+
+
+def load_mesh(filename):
+    return load_mesh_ply(filename) if (filename.lower().endswith('.ply')) else load_mesh_obj(filename)
+
+
+def create_mesh_surface(size, resolution, phase=0.0, amplitude=0.05):
+    u, v = np.meshgrid(np.linspace(0, size, resolution + 1, dtype=np.float32), np.linspace(0, size, resolution + 1, dtype=np.float32))
+    h = amplitude * np.sin((2 * np.pi * u / size) + phase) * np.cos((2 * np.pi * v / size) + phase)
+    vertex_positions = np.stack((u.reshape((-1,)), h.reshape((-1,)), v.reshape((-1,))), axis=1).astype(np.float32)
+    i, j = np.meshgrid(np.arange(resolution, dtype=np.uint32), np.arange(resolution, dtype=np.uint32))
+    a = (j * (resolution + 1) + i).reshape((-1,))
+    b = a + 1
+    c = a + resolution + 1
+    d = c + 1
+    triangle_indices = np.vstack((np.stack((a, c, b), axis=1), np.stack((b, c, d), axis=1)))
+    return _mesh(vertex_positions, triangle_indices)
+
+
+def get_mesh_resolution(triangles):
+    return max([1, int(np.sqrt(triangles / 2))])
+
+
+#------------------------------------------------------------------------------
+# Mock IPC
+#------------------------------------------------------------------------------
+
+def _receive(client, format):
+    return struct.unpack(format, client.download(struct.calcsize(format), hl2ss.ChunkSize.SINGLE_TRANSFER))
+
+
+class _ipc_server(_stream_server):
+    def on_command(self, client, command):
+        pass
+
+    def on_client(self, client, address):
+        while (not self._event_stop.is_set()):
+            self.on_command(client, _receive(client, '<B')[0])
+
+
+class mock_rc(_ipc_server):
+    _COMMAND_FORMAT = {
+        hl2ss.ipc_rc._CMD_GET_APPLICATION_VERSION         : '',
+        hl2ss.ipc_rc._CMD_GET_UTC_OFFSET                  : '<I',
+        hl2ss.ipc_rc._CMD_SET_HS_MARKER_STATE             : '<I',
+        hl2ss.ipc_rc._CMD_GET_PV_SUBSYSTEM_STATUS         : '',
+        hl2ss.ipc_rc._CMD_SET_PV_FOCUS                    : '<IIIII',
+        hl2ss.ipc_rc._CMD_SET_PV_VIDEO_TEMPORAL_DENOISING : '<I',
+        hl2ss.ipc_rc._CMD_SET_PV_WHITE_BALANCE_PRESET     : '<I',
+        hl2ss.ipc_rc._CMD_SET_PV_WHITE_BALANCE_VALUE      : '<I',
+        hl2ss.ipc_rc._CMD_SET_PV_EXPOSURE                 : '<II',
+        hl2ss.ipc_rc._CMD_SET_PV_EXPOSURE_PRIORITY_VIDEO  : '<I',
+        hl2ss.ipc_rc._CMD_SET_PV_ISO_SPEED                : '<II',
+        hl2ss.ipc_rc._CMD_SET_PV_BACKLIGHT_COMPENSATION   : '<I',
+        hl2ss.ipc_rc._CMD_SET_PV_SCENE_MODE               : '<I',
+    }
+
+    def __init__(self, host, port=hl2ss.IPCPort.REMOTE_CONFIGURATION, version=(1, 0, 0, 0), utc_offset=0, pv_subsystem=True, backlog=8, timeout=0.25):
+        super().__init__(host, port, backlog, timeout)
+        self.version = version
+        self.utc_offset = utc_offset
+        self.pv_subsystem = pv_subsystem
+        self.settings = dict()
+
+    def on_command(self, client, command):
+        format = mock_rc._COMMAND_FORMAT[command]
+        arguments = _receive(client, format) if (len(format) > 0) else ()
+        if (command == hl2ss.ipc_rc._CMD_GET_APPLICATION_VERSION):
+            client.sendall(struct.pack('<HHHH', *self.version))
+        elif (command == hl2ss.ipc_rc._CMD_GET_UTC_OFFSET):
+            client.sendall(struct.pack('<Q', self.utc_offset))
+        elif (command == hl2ss.ipc_rc._CMD_GET_PV_SUBSYSTEM_STATUS):
+            client.sendall(struct.pack('<B', 1 if (self.pv_subsystem) else 0))
+        else:
+            self.settings[command] = arguments
+
+
+class _sm_surface:
+    def __init__(self, id, pose, mesh=None, phase=0.0):
+        self.id = id
+        self.pose = pose
+        self.mesh = mesh
+        self.phase = phase
+        self.update_time = 0
+        self.cache = dict()
+
+    def update(self, update_time):
+        self.update_time = update_time
+        self.phase += 0.5
+        self.cache.clear()
+
+
+def _pack_sm_bounds(vertex_positions, pose):
+    lo = vertex_positions.min(axis=0)
+    hi = vertex_positions.max(axis=0)
+    return np.hstack(((((lo + hi) / 2) + pose[3, :3]), ((hi - lo) / 2), [0, 0, 0, 1])).astype(np.float32).tobytes()
+
+
+def _pack_sm_mesh(mesh, pose, vpf, tif, vnf, flags):
+    if (vpf == hl2ss.SM_VertexPositionFormat.R16G16B16A16IntNormalized):
+        scale = np.maximum(np.abs(mesh.vertex_positions).max(axis=0), 1e-6).astype(np.float32)
+        vertex_positions = np.hstack((np.round((mesh.vertex_positions / scale) * 32767), np.full((mesh.vertex_positions.shape[0], 1), 32767))).astype(np.int16)
+    else:
+        scale = np.ones(3, dtype=np.float32)
+        vertex_positions = np.hstack((mesh.vertex_positions, np.ones((mesh.vertex_positions.shape[0], 1)))).astype(np.float32)
+    triangle_indices = mesh.triangle_indices.astype(hl2ss._SM_Convert.DirectXPixelFormatToNumPy[tif])
+    if ((flags & 1) == 0):
+        vertex_normals = b''
+    elif (vnf == hl2ss.SM_VertexNormalFormat.R8G8B8A8IntNormalized):
+        vertex_normals = np.hstack((np.round(mesh.vertex_normals * 127), np.zeros((mesh.vertex_normals.shape[0], 1)))).astype(np.int8).tobytes()
+    else:
+        vertex_normals = np.hstack((mesh.vertex_normals, np.zeros((mesh.vertex_normals.shape[0], 1)))).astype(np.float32).tobytes()
+    vertex_positions = vertex_positions.tobytes()
+    triangle_indices = triangle_indices.tobytes()
+    bounds = _pack_sm_bounds(mesh.vertex_positions, pose) if ((flags & 2) != 0) else b''
+    return (len(vertex_positions), len(triangle_indices), len(vertex_normals), scale.tobytes(), pose.tobytes(), bounds, vertex_positions + triangle_indices + vertex_normals)
+
+
+class mock_sm(_ipc_server):
+    def __init__(self, host, port=hl2ss.IPCPort.SPATIAL_MAPPING, surfaces=64, meshes=None, triangles=None, churn=0.0, size=1.0, backlog=8, timeout=0.25):
+        super().__init__(host, port, backlog, timeout)
+        self.surfaces = surfaces
+        self.meshes = meshes
+        self.triangles = triangles
+        self.churn = churn
+        self.size = size
+
+    def on_open(self):
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(0)
+        self._clock = 0
+        self._surfaces = []
+        meshes = [] if (self.meshes is None) else [load_mesh(filename) if (isinstance(filename, str)) else filename for filename in self.meshes]
+        count = len(meshes) if (len(meshes) > 0) else self.surfaces
+        side = int(np.ceil(np.sqrt(count)))
+        for index in range(0, count):
+            pose = np.eye(4, 4, dtype=np.float32)
+            if (len(meshes) <= 0):
+                pose[3, 0] = (index % side) * self.size
+                pose[3, 2] = (index // side) * self.size
+            self._surfaces.append(_sm_surface(struct.pack('<QQ', index, 0x484C325353534D00), pose, meshes[index] if (len(meshes) > 0) else None, index * 0.1))
+        self._index = {surface.id : surface for surface in self._surfaces}
+
+    def _update(self):
+        self._clock += 1
+        for surface in self._surfaces:
+            if ((surface.update_time <= 0) or (self._rng.random() < self.churn)):
+                surface.update(self._clock)
+
+    def _get_mesh(self, surface, tpcm):
+        if (surface.mesh is not None):
+            return surface.mesh
+        return create_mesh_surface(self.size, get_mesh_resolution((tpcm * (self.size ** 3)) if (self.triangles is None) else self.triangles), surface.phase)
+
+    def _pack_mesh(self, index, surface, tpcm, vpf, tif, vnf, flags):
+        if (surface is None):
+            return struct.pack('<IIIII', index, 1, 0, 0, 0) + bytes(12 + 64 + 4)
+        key = (tpcm, vpf, tif, vnf, flags)
+        with self._lock:
+            entry = surface.cache.get(key, None)
+        if (entry is None):
+            entry = _pack_sm_mesh(self._get_mesh(surface, tpcm), surface.pose, vpf, tif, vnf, flags)
+            with self._lock:
+                surface.cache[key] = entry
+        vpl, til, vnl, scale, pose, bounds, data = entry
+        return struct.pack('<IIIII', index, 0, vpl, til, vnl) + scale + pose + struct.pack('<I', len(bounds)) + bounds + data
+
+    def on_command(self, client, command):
+        if (command == hl2ss.ipc_sm._CMD_CREATE_OBSERVER):
+            return
+        if (command == hl2ss.ipc_sm._CMD_SET_VOLUMES):
+            for _ in range(0, _receive(client, '<B')[0]):
+                kind = _receive(client, '<I')[0]
+                _receive(client, '<{count}f'.format(count=(6 if (kind == hl2ss._SM_VolumeType.Box) else 24 if (kind == hl2ss._SM_VolumeType.Frustum) else 10 if (kind == hl2ss._SM_VolumeType.OrientedBox) else 4)))
+            return
+        if (command == hl2ss.ipc_sm._CMD_GET_OBSERVED_SURFACES):
+            with self._lock:
+                self._update()
+                data = bytearray(struct.pack('<Q', len(self._surfaces)))
+                for surface in self._surfaces:
+                    data.extend(surface.id + struct.pack('<Q', surface.update_time))
+            client.sendall(data)
+            return
+        if (command == hl2ss.ipc_sm._CMD_GET_MESHES):
+            count, threads = _receive(client, '<II')
+            for index in range(0, count):
+                id, tpcm, vpf, tif, vnf, flags = _receive(client, '<16sdIIII')
+                client.sendall(self._pack_mesh(index, self._index.get(id, None), tpcm, vpf, tif, vnf, flags))
+
+
+class _su_entity:
+    def __init__(self, id, kind, location, extents, meshes):
+        self.id = id
+        self.kind = kind
+        self.location = location
+        self.extents = extents
+        self.meshes = meshes
+
+
+def _get_su_kind_flag(kind):
+    if (kind == hl2ss.SU_Kind.Unknown):
+        return hl2ss.SU_KindFlag.Unknown
+    if (kind == hl2ss.SU_Kind.World):
+        return hl2ss.SU_KindFlag.World
+    if (kind == hl2ss.SU_Kind.CompletelyInferred):
+        return hl2ss.SU_KindFlag.CompletelyInferred
+    return 1 << kind
+
+
+def _get_su_resolution(lod):
+    if (lod == hl2ss.SU_MeshLOD.Coarse):
+        return 2
+    if (lod == hl2ss.SU_MeshLOD.Medium):
+        return 8
+    if (lod == hl2ss.SU_MeshLOD.Fine):
+        return 32
+    return 64
+
+
+def _create_su_location(rotation, position):
+    location = np.eye(4, 4, dtype=np.float32)
+    location[:3, :3] = rotation
+    location[3, :3] = position
+    return location
+
+
+class mock_su(_ipc_server):
+    def __init__(self, host, port=hl2ss.IPCPort.SCENE_UNDERSTANDING, width=4.0, depth=5.0, height=2.5, platforms=2, meshes=None, backlog=8, timeout=0.25):
+        super().__init__(host, port, backlog, timeout)
+        self.width = width
+        self.depth = depth
+        self.height = height
+        self.platforms = platforms
+        self.meshes = meshes
+
+    def _add(self, kind, rotation, position, extents):
+        self._entities.append(_su_entity(struct.pack('<QQ', len(self._entities), 0x484C325353535500), kind, _create_su_location(rotation, position), np.array(extents, dtype=np.float32), None))
+
+    def on_open(self):
+        self._entities = []
+        floor = np.array([[1, 0, 0], [0, 0, -1], [0, 1, 0]], dtype=np.float32)
+        ceiling = np.array([[1, 0, 0], [0, 0, 1], [0, -1, 0]], dtype=np.float32)
+        self._add(hl2ss.SU_Kind.Floor, floor, [0, 0, 0], [self.width, self.depth])
+        self._add(hl2ss.SU_Kind.Ceiling, ceiling, [0, self.height, 0], [self.width, self.depth])
+        for angle, distance in [(0, self.depth), (np.pi / 2, self.width), (np.pi, self.depth), (3 * np.pi / 2, self.width)]:
+            rotation = np.array([[np.cos(angle), 0, -np.sin(angle)], [0, 1, 0], [np.sin(angle), 0, np.cos(angle)]], dtype=np.float32)
+            self._add(hl2ss.SU_Kind.Wall, rotation, [-np.sin(angle) * distance / 2, self.height / 2, -np.cos(angle) * distance / 2], [self.width if ((angle % np.pi) == 0) else self.depth, self.height])
+        for index in range(0, self.platforms):
+            self._add(hl2ss.SU_Kind.Platform, floor, [(index - (self.platforms - 1) / 2) * 1.0, 0.75, -self.depth / 4], [0.8, 0.6])
+        meshes = [] if (self.meshes is None) else [load_mesh(filename) if (isinstance(filename, str)) else filename for filename in self.meshes]
+        self._world = _su_entity(struct.pack('<QQ', len(self._entities), 0x484C325353535500), hl2ss.SU_Kind.World, np.eye(4, 4, dtype=np.float32), np.zeros(2, dtype=np.float32), meshes if (len(meshes) > 0) else None)
+
+    def _get_meshes(self, entity, lod):
+        if (entity.meshes is not None):
+            return entity.meshes
+        if (entity.kind == hl2ss.SU_Kind.World):
+            return [create_mesh_surface(max([self.width, self.depth]), _get_su_resolution(lod))]
+        resolution = _get_su_resolution(lod)
+        mesh = create_mesh_surface(1.0, resolution, 0.0, 0.0)
+        mesh.vertex_positions = np.stack(((mesh.vertex_positions[:, 0] - 0.5) * entity.extents[0], (mesh.vertex_positions[:, 2] - 0.5) * entity.extents[1], mesh.vertex_positions[:, 1]), axis=1).astype(np.float32)
+        return [mesh]
+
+    def _pack_meshes(self, meshes):
+        data = bytearray(struct.pack('<I', len(meshes)))
+        for mesh in meshes:
+            vertex_positions = mesh.vertex_positions.astype(np.float32)
+            triangle_indices = mesh.triangle_indices.astype(np.uint32)
+            data.extend(struct.pack('<II', vertex_positions.size, triangle_indices.size))
+            data.extend(vertex_positions.tobytes())
+            data.extend(triangle_indices.tobytes())
+        return data
+
+    def _pack_item(self, entity, task):
+        data = bytearray(entity.id + struct.pack('<i', entity.kind))
+        if (task.get_orientation):
+            data.extend(np.array([0, 0, 0, 1], dtype=np.float32).tobytes())
+        if (task.get_position):
+            data.extend(entity.location[3, :3].tobytes())
+        if (task.get_location_matrix):
+            data.extend(entity.location.tobytes())
+        if (task.get_quad):
+            data.extend(struct.pack('<i', 0))
+            data.extend(entity.extents.tobytes())
+        meshes = self._get_meshes(entity, task.mesh_lod) if ((task.get_meshes) or (task.get_collider_meshes)) else []
+        if (task.get_meshes):
+            data.extend(self._pack_meshes(meshes))
+        if (task.get_collider_meshes):
+            data.extend(self._pack_meshes(meshes))
+        return data
+
+    def on_client(self, client, address):
+        while (not self._event_stop.is_set()):
+            fields = _receive(client, '<BBBBIfBBBBBBBBI')
+            guids = [bytes(client.download(16, hl2ss.ChunkSize.SINGLE_TRANSFER)) for _ in range(0, fields[-1])]
+            task = hl2ss.su_task(*fields[:-1], guids)
+            entities = [entity for entity in self._entities if ((_get_su_kind_flag(entity.kind) & task.kind_flags) != 0)] if (task.enable_quads or task.enable_meshes) else []
+            if (task.enable_world_mesh):
+                entities.append(self._world)
+            if (len(guids) > 0):
+                entities = [entity for entity in entities if (entity.id in guids)]
+            data = bytearray(struct.pack('<I', 0))
+            data.extend(np.eye(4, 4, dtype=np.float32).tobytes())
+            data.extend(np.eye(4, 4, dtype=np.float32).tobytes())
+            data.extend(struct.pack('<I', len(entities)))
+            for entity in entities:
+                data.extend(self._pack_item(entity, task))
+            client.sendall(data)
+
+
+class mock_vi(_ipc_server):
+    def __init__(self, host, port=hl2ss.IPCPort.VOICE_INPUT, backlog=8, timeout=0.25):
+        super().__init__(host, port, backlog, timeout)
+        self.commands = []
+
+    def on_open(self):
+        self._results = queue.Queue()
+
+    def push_result(self, index, confidence=hl2ss.VI_SpeechRecognitionConfidence.High, phrase_duration=0, phrase_start_time=0, raw_confidence=1.0):
+        self._results.put(struct.pack('<IIQQd', index, confidence, phrase_duration, phrase_start_time, raw_confidence))
+
+    def on_command(self, client, command):
+        if (command == hl2ss.ipc_vi._CMD_REGISTER_COMMANDS):
+            clear, count = _receive(client, '<BB')
+            if (clear):
+                self.commands = []
+            for _ in range(0, count):
+                self.commands.append(bytes(client.download(_receive(client, '<H')[0], hl2ss.ChunkSize.SINGLE_TRANSFER)).decode('utf-16'))
+            client.sendall(struct.pack('<B', 1))
+        elif (command == hl2ss.ipc_vi._CMD_POP):
+            results = []
+            while (not self._results.empty()):
+                results.append(self._results.get_nowait())
+            client.sendall(struct.pack('<I', len(results)) + b''.join(results))
+        elif (command == hl2ss.ipc_vi._CMD_CLEAR):
+            self.commands = []
+
+
+def _umq_default_handler(id, data):
+    return 0
+
+
+class mock_umq(_ipc_server):
+    def __init__(self, host, port=hl2ss.IPCPort.UNITY_MESSAGE_QUEUE, handler=_umq_default_handler, backlog=8, timeout=0.25):
+        super().__init__(host, port, backlog, timeout)
+        self.handler = handler
+
+    def on_client(self, client, address):
+        while (not self._event_stop.is_set()):
+            id, size = _receive(client, '<II')
+            data = client.download(size, hl2ss.ChunkSize.SINGLE_TRANSFER) if (size > 0) else bytearray()
+            client.sendall(struct.pack('<I', self.handler(id, data)))
@@ -1,5 +1,11 @@
 
 import multiprocessing as mp
+import threading
+import queue
+import heapq
+import collections
+import concurrent.futures
+import os
 import io
 import fractions
 import tarfile
@@ -52,12 +58,14 @@ class wr_process_rx(mp.Process):
 
 
 class wr_process_producer(mp.Process):
-    def __init__(self, filename, producer, port, user):
+    def __init__(self, filename, producer, port, user, write_behind=False, container=None):
         super().__init__()
         self._event_stop = mp.Event()
-        self._wr = hl2ss_io.create_wr_from_rx(filename, producer.get_receiver(port), user)
+        self._wr = hl2ss_io.create_wr_from_rx(filename, producer.get_receiver(port), user) if (container is None) else container.get_writer(port)
         self._sink = hl2ss_mp.consumer().create_sink(producer, port, mp.Manager(), ...)
-        self._sync_period = hl2ss_lnm.get_sync_period(self._wr)
+        self._sync_period = hl2ss_lnm.get_sync_period(producer.get_receiver(port))
+        if (write_behind and (container is None)):
+            self._wr = hl2ss_io.wr_write_behind(self._wr)
 
     def stop(self):
         self._event_stop.set()
@@ -545,35 +553,48 @@ def get_av_framerate(port):
         return hl2ss.Parameters_MICROPHONE.SAMPLE_RATE
 
 
-def unpack_to_mp4(input_filenames, output_filename):
-    time_base = fractions.Fraction(1, hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS)
-
-    readers = [hl2ss_io.create_rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER, None) for input_filename in input_filenames]
-    [reader.open() for reader in readers]
-
-    container = av.open(output_filename, mode='w')
-    streams = [container.add_stream(get_av_codec_name(reader.port, reader.profile_ab if (reader.port == hl2ss.StreamPort.RM_DEPTH_AHAT) else reader.profile), rate=get_av_framerate(reader.port) if (get_av_framerate(reader.port) is not None) else reader.framerate) for reader in readers]
-    codecs = [av.CodecContext.create(get_av_codec_name(reader.port, reader.profile_ab if (reader.port == hl2ss.StreamPort.RM_DEPTH_AHAT) else reader.profile), "r") for reader in readers]
-
-    for stream in streams:
-        stream.time_base = time_base
-    for codec in codecs:
-        codec.time_base = time_base
-
-    base = 0#hl2ss._RANGEOF.U64_MAX
-
-    for reader in readers:
-        data = reader.get_next_packet()
-        if ((data is not None) and (data.timestamp > base)):
-            base = data.timestamp
-
-    [reader.close() for reader in readers]
-    [reader.open() for reader in readers]
+def get_stream_period(rd):
+    if (rd.port == hl2ss.StreamPort.RM_VLC_LEFTFRONT):
+        return hl2ss.Parameters_RM_VLC.PERIOD * rd.divisor * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.RM_VLC_LEFTLEFT):
+        return hl2ss.Parameters_RM_VLC.PERIOD * rd.divisor * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.RM_VLC_RIGHTFRONT):
+        return hl2ss.Parameters_RM_VLC.PERIOD * rd.divisor * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.RM_VLC_RIGHTRIGHT):
+        return hl2ss.Parameters_RM_VLC.PERIOD * rd.divisor * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return hl2ss.Parameters_RM_DEPTH_AHAT.PERIOD * rd.divisor * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return hl2ss.Parameters_RM_DEPTH_LONGTHROW.PERIOD * rd.divisor * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.PERSONAL_VIDEO):
+        return (rd.divisor / rd.framerate) * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.MICROPHONE):
+        return (hl2ss.Parameters_MICROPHONE.GROUP_SIZE_RAW if (rd.profile == hl2ss.AudioProfile.RAW) else hl2ss.Parameters_MICROPHONE.GROUP_SIZE_AAC) * hl2ss.Parameters_MICROPHONE.PERIOD * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.SPATIAL_INPUT):
+        return hl2ss.Parameters_SI.PERIOD * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    if (rd.port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+        return (1 / rd.fps) * hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS
+    return None
+
+
+def _unpack_to_mp4_put(output, event_stop, item):
+    while (not event_stop.is_set()):
+        try:
+            output.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _unpack_to_mp4_parse(reader, codec, start, stop, output, event_stop):
+    try:
+        if (start is not None):
+            reader.seek(start)
 
-    for reader, codec, stream in zip(readers, codecs, streams):
         while (True):
             data = reader.get_next_packet()
-            if (data is None):
+            if ((data is None) or ((stop is not None) and (data.timestamp > stop))):
                 break
 
             if (reader.port == hl2ss.StreamPort.PERSONAL_VIDEO):
@@ -581,45 +602,463 @@ def unpack_to_mp4(input_filenames, output_filename):
             else:
                 payload = data.payload
 
-            local_timestamp = data.timestamp - base
-            if (local_timestamp < 0):
-                continue
+            if (not _unpack_to_mp4_put(output, event_stop, (data.timestamp, codec.parse(payload)))):
+                break
+    except Exception as error:
+        _unpack_to_mp4_put(output, event_stop, error)
+    finally:
+        _unpack_to_mp4_put(output, event_stop, None)
+
+
+def _unpack_to_mp4_get(output):
+    item = output.get()
+    if (isinstance(item, Exception)):
+        raise item
+    return item
 
-            for packet in codec.parse(payload):
-                packet.stream = stream
-                packet.pts = local_timestamp
-                packet.dts = local_timestamp
-                packet.time_base = time_base
-                container.mux(packet)
 
-    container.close()
-    [reader.close() for reader in readers]
+def unpack_to_mp4(input_filenames, output_filename, start=None, stop=None, ports=None, buffer_size=256):
+    time_base = fractions.Fraction(1, hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS)
+
+    readers = []
+    container = None
+    threads = []
+    event_stop = threading.Event()
+
+    try:
+        for input_filename in input_filenames:
+            reader = hl2ss_io.create_rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER, None)
+            reader.open()
+            if ((ports is not None) and (reader.port not in ports)):
+                reader.close()
+            else:
+                readers.append(reader)
+
+        container = av.open(output_filename, mode='w')
+        streams = [container.add_stream(get_av_codec_name(reader.port, reader.profile_ab if (reader.port == hl2ss.StreamPort.RM_DEPTH_AHAT) else reader.profile), rate=get_av_framerate(reader.port) if (get_av_framerate(reader.port) is not None) else reader.framerate) for reader in readers]
+        codecs = [av.CodecContext.create(get_av_codec_name(reader.port, reader.profile_ab if (reader.port == hl2ss.StreamPort.RM_DEPTH_AHAT) else reader.profile), "r") for reader in readers]
+        queues = [queue.Queue(maxsize=buffer_size) for _ in readers]
+
+        for stream in streams:
+            stream.time_base = time_base
+        for codec in codecs:
+            codec.time_base = time_base
+
+        for reader, codec, output in zip(readers, codecs, queues):
+            thread = threading.Thread(target=_unpack_to_mp4_parse, args=(reader, codec, start, stop, output, event_stop), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        heap = []
+        for index, output in enumerate(queues):
+            item = _unpack_to_mp4_get(output)
+            if (item is not None):
+                heap.append((item[0], index, item[1]))
+        heapq.heapify(heap)
+
+        # Readers seek to the key frame preceding start, so keep every stream from
+        # its key frame onward instead of cutting at start
+        base = (max if (start is None) else min)([item[0] for item in heap], default=0)
+
+        while (len(heap) > 0):
+            timestamp, index, packets = heapq.heappop(heap)
+            local_timestamp = timestamp - base
+            if (local_timestamp >= 0):
+                for packet in packets:
+                    packet.stream = streams[index]
+                    packet.pts = local_timestamp
+                    packet.dts = local_timestamp
+                    packet.time_base = time_base
+                    container.mux(packet)
+            item = _unpack_to_mp4_get(queues[index])
+            if (item is not None):
+                heapq.heappush(heap, (item[0], index, item[1]))
+    finally:
+        # Unblocks workers waiting on a full queue when muxing fails
+        event_stop.set()
+        [thread.join() for thread in threads]
+        if (container is not None):
+            container.close()
+        [reader.close() for reader in readers]
 
 
 def unpack_to_png(input_filename, output_filename):
-    rd = hl2ss_io.create_rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER, True)
-    rd.open()
+    export_frames(input_filename, output_filename, ExportFormat.TAR)
+
+
+#------------------------------------------------------------------------------
+# Frame Export
+#------------------------------------------------------------------------------
+
+class ExportFormat:
+    TAR = 0
+    DIRECTORY = 1
+    NPY = 2
+
+
+class _unpack_export_rm_depth_longthrow:
+    def create(self):
+        pass
+
+    def decode(self, payload):
+        return hl2ss.decode_rm_depth_longthrow(payload)
+
+
+def _get_export_decoder(rd):
+    if (rd.port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return _unpack_export_rm_depth_longthrow()
+    if ((rd.port == hl2ss.StreamPort.RM_DEPTH_AHAT) and (rd.profile_z == hl2ss.DepthProfile.SAME) and (rd.profile_ab == hl2ss.VideoProfile.RAW)):
+        return hl2ss.decode_rm_depth_ahat(rd.profile_z, rd.profile_ab)
+    if ((rd.port in [hl2ss.StreamPort.RM_VLC_LEFTFRONT, hl2ss.StreamPort.RM_VLC_LEFTLEFT, hl2ss.StreamPort.RM_VLC_RIGHTFRONT, hl2ss.StreamPort.RM_VLC_RIGHTRIGHT]) and (rd.profile == hl2ss.VideoProfile.RAW)):
+        return hl2ss.decode_rm_vlc(rd.profile)
+    return None
+
 
-    tar = tarfile.open(output_filename, 'w')
+def _get_export_images(port, frame):
+    if (port == hl2ss.StreamPort.RM_DEPTH_LONGTHROW):
+        return [('depth', frame.depth), ('ab', frame.ab)]
+    if (port == hl2ss.StreamPort.RM_DEPTH_AHAT):
+        return [('depth', frame.depth), ('ab', frame.ab)]
+    return [('image', frame)]
+
+
+def _export_frame(port, decoder, payload, encode):
+    images = _get_export_images(port, payload if (decoder is None) else decoder.decode(payload))
+    return [(name, cv2.imencode('.png', image)[1].tobytes() if (encode) else np.array(image)) for name, image in images]
+
+
+class _export_tar:
+    def open(self, output, count):
+        self._tar = tarfile.open(output, 'w')
+
+    def write(self, idx, timestamp, images):
+        for name, data in images:
+            info = tarfile.TarInfo(f'{name}_{idx}.png')
+            info.size = len(data)
+            self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self, count):
+        self._tar.close()
+
+
+class _export_directory:
+    def open(self, output, count):
+        self._path = output
+        os.makedirs(self._path, exist_ok=True)
+
+    def write(self, idx, timestamp, images):
+        for name, data in images:
+            with open(os.path.join(self._path, f'{name}_{idx}.png'), 'wb') as file:
+                file.write(data)
+
+    def close(self, count):
+        pass
+
+
+def _truncate_npy(filename, offset, dtype, shape):
+    header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (np.lib.format.dtype_to_descr(dtype), shape)
+    with open(filename, 'r+b') as file:
+        version = np.lib.format.read_magic(file)
+        begin = file.tell() + (2 if (version == (1, 0)) else 4)
+        file.seek(begin)
+        file.write(header.ljust(offset - begin - 1).encode('latin1') + b'\n')
+        file.truncate(offset + (int(np.prod(shape)) * dtype.itemsize))
+
+
+class _export_npy:
+    def open(self, output, count):
+        self._path = output
+        self._count = count
+        self._arrays = None
+        self._timestamps = np.zeros(count, dtype=np.uint64)
+        os.makedirs(self._path, exist_ok=True)
+
+    def write(self, idx, timestamp, images):
+        if (self._arrays is None):
+            self._arrays = {name : np.lib.format.open_memmap(os.path.join(self._path, f'{name}.npy'), mode='w+', dtype=image.dtype, shape=(self._count,) + image.shape) for name, image in images}
+        for name, image in images:
+            self._arrays[name][idx] = image
+        self._timestamps[idx] = timestamp
+
+    def close(self, count):
+        if (self._arrays is not None):
+            [array.flush() for array in self._arrays.values()]
+            layouts = [(array.filename, array.offset, array.dtype, (count,) + array.shape[1:]) for array in self._arrays.values()]
+            self._arrays = None
+            if (count < self._count):
+                [_truncate_npy(*layout) for layout in layouts]
+        np.save(os.path.join(self._path, 'timestamps.npy'), self._timestamps[:count])
+
+
+def _create_export_sink(format):
+    if (format == ExportFormat.TAR):
+        return _export_tar()
+    if (format == ExportFormat.DIRECTORY):
+        return _export_directory()
+    if (format == ExportFormat.NPY):
+        return _export_npy()
+
+
+def export_frames(input_filename, output, format=ExportFormat.TAR, start=None, stop=None, stride=1, workers=None, processes=False):
+    rd = hl2ss_io.create_rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER, None)
+    rd.open()
+    decoder = _get_export_decoder(rd)
+    if (decoder is None):
+        rd.close()
+        rd = hl2ss_io.create_rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER, True)
+        rd.open()
+
+    timestamps = rd.get_index()['timestamp']
+    selected = np.count_nonzero((timestamps >= (0 if (start is None) else start)) & (timestamps <= (hl2ss._RANGEOF.U64_MAX if (stop is None) else stop)))
+    count = int((selected + stride - 1) // stride)
+
+    if (start is not None):
+        rd.seek(start)
+
+    workers = os.cpu_count() if (workers is None) else workers
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if (processes) else concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    encode = format != ExportFormat.NPY
+    sink = _create_export_sink(format)
+    sink.open(output, count)
+    pending = collections.deque()
+    position = 0
     idx = 0
 
+    while (idx < count):
+        data = rd.get_next_packet()
+        if ((data is None) or ((stop is not None) and (data.timestamp > stop))):
+            break
+        if ((data.payload is None) or ((start is not None) and (data.timestamp < start))):
+            continue
+        if ((position % stride) == 0):
+            pending.append((idx, data.timestamp, executor.submit(_export_frame, rd.port, decoder, data.payload, encode)))
+            idx += 1
+        position += 1
+        while ((len(pending) > 0) and ((len(pending) > (4 * workers)) or pending[0][2].done())):
+            i, timestamp, future = pending.popleft()
+            sink.write(i, timestamp, future.result())
+
+    while (len(pending) > 0):
+        i, timestamp, future = pending.popleft()
+        sink.write(i, timestamp, future.result())
+
+    executor.shutdown()
+    sink.close(idx)
+    rd.close()
+    return idx
+
+
+#------------------------------------------------------------------------------
+# Columnar Export
+#------------------------------------------------------------------------------
+
+class ColumnFormat:
+    NPZ = 0
+    PARQUET = 1
+    CSV = 2
+
+
+_RM_IMU_SAMPLE_DTYPE = np.dtype([('sensor_ticks', '<u8'), ('soc_ticks', '<u8'), ('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('temperature', '<f4')])
+_SI_HAND_JOINT_DTYPE = np.dtype([('orientation', '<f4', (4,)), ('position', '<f4', (3,)), ('radius', '<f4'), ('accuracy', '<i4')])
+_SI_DTYPE = np.dtype([('valid', 'u1'), ('head_position', '<f4', (3,)), ('head_forward', '<f4', (3,)), ('head_up', '<f4', (3,)), ('eye_origin', '<f4', (3,)), ('eye_direction', '<f4', (3,)), ('hand_left', _SI_HAND_JOINT_DTYPE, (hl2ss.SI_HandJointKind.TOTAL,)), ('hand_right', _SI_HAND_JOINT_DTYPE, (hl2ss.SI_HandJointKind.TOTAL,))])
+_EET_DTYPE = np.dtype([('reserved', '<u4'), ('combined_origin', '<f4', (3,)), ('combined_direction', '<f4', (3,)), ('left_origin', '<f4', (3,)), ('left_direction', '<f4', (3,)), ('right_origin', '<f4', (3,)), ('right_direction', '<f4', (3,)), ('left_openness', '<f4'), ('right_openness', '<f4'), ('vergence_distance', '<f4'), ('valid', '<u4')])
+
+
+def _flatten_columns(name, array, columns):
+    if (array.dtype.names is not None):
+        for field in array.dtype.names:
+            _flatten_columns(f'{name}_{field}' if (name) else field, array[field], columns)
+    elif (array.ndim > 1):
+        for i in range(0, array.shape[1]):
+            _flatten_columns(f'{name}_{i}', array[:, i], columns)
+    else:
+        columns[name] = array
+
+
+def _get_records(buffer, sizes, dtype):
+    if (sizes.shape[0] <= 0):
+        return np.zeros(0, dtype=dtype)
+    if (np.all(sizes == sizes[0])):
+        return np.ascontiguousarray(np.frombuffer(buffer, dtype=np.uint8).reshape((-1, sizes[0]))[:, :dtype.itemsize]).view(dtype).reshape((-1,))
+    data = np.zeros((sizes.shape[0], dtype.itemsize), dtype=np.uint8)
+    offsets = np.cumsum(sizes) - sizes
+    for i, (offset, size) in enumerate(zip(offsets, np.minimum(sizes, dtype.itemsize))):
+        data[i, :size] = np.frombuffer(buffer, dtype=np.uint8, count=size, offset=offset)
+    return data.view(dtype).reshape((-1,))
+
+
+def _load_columns_rm_imu(port, timestamps, buffer, sizes, poses, columns):
+    columns['timestamp'] = timestamps
+    _flatten_columns('', _get_records(buffer, sizes, np.dtype([('samples', _RM_IMU_SAMPLE_DTYPE, (rm_imu_get_batch_size(port),))]))['samples'], columns)
+    return poses
+
+
+def _load_columns_si(timestamps, buffer, sizes, poses, columns):
+    columns['timestamp'] = timestamps
+    _flatten_columns('', _get_records(buffer, sizes, _SI_DTYPE), columns)
+    return poses
+
+
+def _load_columns_eet(timestamps, buffer, sizes, poses, columns):
+    columns['timestamp'] = timestamps
+    _flatten_columns('', _get_records(buffer, sizes, _EET_DTYPE), columns)
+    return poses
+
+
+def _load_columns_default(timestamps, buffer, sizes, poses, columns):
+    columns['timestamp'] = timestamps
+    return poses
+
+
+def _load_columns(port, timestamps, buffer, sizes, poses, columns):
+    if (port == hl2ss.StreamPort.RM_IMU_ACCELEROMETER):
+        return _load_columns_rm_imu(port, timestamps, buffer, sizes, poses, columns)
+    if (port == hl2ss.StreamPort.RM_IMU_GYROSCOPE):
+        return _load_columns_rm_imu(port, timestamps, buffer, sizes, poses, columns)
+    if (port == hl2ss.StreamPort.RM_IMU_MAGNETOMETER):
+        return _load_columns_rm_imu(port, timestamps, buffer, sizes, poses, columns)
+    if (port == hl2ss.StreamPort.SPATIAL_INPUT):
+        return _load_columns_si(timestamps, buffer, sizes, poses, columns)
+    if (port == hl2ss.StreamPort.EXTENDED_EYE_TRACKER):
+        return _load_columns_eet(timestamps, buffer, sizes, poses, columns)
+    return _load_columns_default(timestamps, buffer, sizes, poses, columns)
+
+
+def load_columns(input_filename):
+    rd = hl2ss_io.create_rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER, None, True)
+    rd.open()
+
+    timestamps = []
+    payloads = []
+    poses = []
+
     while (True):
         data = rd.get_next_packet()
         if (data is None):
             break
-        depth = cv2.imencode('.png', data.payload.depth)[1].tobytes()
-        ab = cv2.imencode('.png', data.payload.ab)[1].tobytes()
-        depth_info = tarfile.TarInfo(f'depth_{idx}.png')        
-        ab_info = tarfile.TarInfo(f'ab_{idx}.png')
-        depth_info.size = len(depth)
-        ab_info.size = len(ab)
-        tar.addfile(depth_info, io.BytesIO(depth))
-        tar.addfile(ab_info, io.BytesIO(ab))
-        idx += 1
-
-    tar.close()
+        timestamps.append(data.timestamp)
+        payloads.append(data.payload)
+        poses.append(data.pose)
+
+    sizes = np.array([len(payload) for payload in payloads], dtype=np.int64)
+    buffer = b''.join(payloads)
+    poses = np.array(poses, dtype=np.float32).reshape((-1, 4, 4)) if ((len(poses) > 0) and (poses[0] is not None)) else None
+    port = rd.port
+
+    payloads = None
+    rd.close()
+
+    columns = dict()
+    poses = _load_columns(port, np.array(timestamps, dtype=np.uint64), buffer, sizes, poses, columns)
+    if (poses is not None):
+        for i in range(0, 4):
+            for j in range(0, 4):
+                columns[f'pose_{i}{j}'] = poses[:, i, j]
+
+    return columns
+
+
+def _save_columns_npz(output_filename, columns):
+    np.savez(output_filename, **columns)
+
+
+def _save_columns_parquet(output_filename, columns):
+    import pyarrow
+    import pyarrow.parquet
+    pyarrow.parquet.write_table(pyarrow.table(columns), output_filename)
+
+
+def _save_columns_csv(output_filename, columns):
+    fmt = ','.join(['%d' if (np.issubdtype(column.dtype, np.integer)) else '%.9g' for column in columns.values()])
+    with open(output_filename, 'w') as file:
+        file.write(','.join(columns.keys()) + '\n')
+        file.writelines([(fmt % row) + '\n' for row in zip(*[column.tolist() for column in columns.values()])])
+
+
+def export_columns(input_filename, output_filename, format=ColumnFormat.NPZ):
+    columns = load_columns(input_filename)
+    if (format == ColumnFormat.NPZ):
+        _save_columns_npz(output_filename, columns)
+    elif (format == ColumnFormat.PARQUET):
+        _save_columns_parquet(output_filename, columns)
+    elif (format == ColumnFormat.CSV):
+        _save_columns_csv(output_filename, columns)
+    return columns
+
+
+#------------------------------------------------------------------------------
+# Recording Statistics
+#------------------------------------------------------------------------------
+
+_CONFIGURATION_FIELDS = ['mode', 'width', 'height', 'framerate', 'divisor', 'profile', 'profile_z', 'profile_ab', 'level', 'bitrate', 'options', 'png_filter', 'fps']
+
+
+def _get_recording_configuration(rd):
+    configuration = {name : getattr(rd, name) for name in _CONFIGURATION_FIELDS if (hasattr(rd, name))}
+    if ('options' in configuration):
+        configuration['options'] = {str(key) : int(value) for key, value in configuration['options'].items()}
+    configuration = {key : (int(value) if (isinstance(value, (int, np.integer))) else value) for key, value in configuration.items()}
+    configuration['compressed'] = bool(hl2ss_io.is_compressed(rd.magic))
+    configuration['user_size'] = len(rd.user)
+    return configuration
+
+
+def get_recording_statistics(input_filename):
+    rd = hl2ss_io.create_rd(input_filename, hl2ss.ChunkSize.SINGLE_TRANSFER, None)
+    rd.open()
+    port = rd.port
+    configuration = _get_recording_configuration(rd)
+    period = get_stream_period(rd)
     rd.close()
 
+    report = hl2ss_io.scan(input_filename, period)
+    timestamps = report['timestamps']
+    count = report['packets']
+    deltas = np.diff(timestamps.astype(np.int64))
+    duration = float(timestamps[-1] - timestamps[0]) / hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS if (count > 1) else 0.0
+    data_size = report['data_size']
+    missing, gaps = np.unique(np.round(report['gap_deltas'] / report['period']).astype(np.int64) - 1, return_counts=True) if (report['gaps'].shape[0] > 0) else ([], [])
+    poses = count if (report['mode'] == hl2ss.StreamMode.MODE_1) else 0
+
+    return {
+        'filename'           : input_filename,
+        'port'               : int(port),
+        'stream'             : hl2ss.get_port_name(port),
+        'configuration'      : configuration,
+        'frames'             : int(count),
+        'first_timestamp'    : int(timestamps[0]) if (count > 0) else None,
+        'last_timestamp'     : int(timestamps[-1]) if (count > 0) else None,
+        'duration'           : duration,
+        'nominal_period'     : None if (report['period'] is None) else float(report['period']) / hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS,
+        'effective_fps'      : ((count - 1) / duration) if (duration > 0) else 0.0,
+        'delta_min'          : float(deltas.min()) / hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS if (count > 1) else None,
+        'delta_max'          : float(deltas.max()) / hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS if (count > 1) else None,
+        'delta_std'          : float(deltas.std()) / hl2ss.TimeBase.HUNDREDS_OF_NANOSECONDS if (count > 1) else None,
+        'gaps'               : int(report['gaps'].shape[0]),
+        'gap_histogram'      : {str(int(frames)) : int(total) for frames, total in zip(missing, gaps)},
+        'non_monotonic'      : int(report['non_monotonic'].shape[0]),
+        'size'               : int(report['size']),
+        'data_size'          : int(data_size),
+        'truncated'          : int(report['truncated']),
+        'bytes_per_frame'    : (data_size / count) if (count > 0) else 0.0,
+        'bytes_per_second'   : (data_size / duration) if (duration > 0) else 0.0,
+        'pose_valid_ratio'   : ((poses - report['empty_poses'] - report['invalid_poses']) / poses) if (poses > 0) else None,
+        'pose_invalid'       : int(report['invalid_poses']),
+    }
+
+
+def _get_recording_statistics_safe(input_filename):
+    try:
+        return get_recording_statistics(input_filename)
+    except Exception as error:
+        return {'filename' : input_filename, 'error' : f'{type(error).__name__}: {error}'}
+
+
+def get_recordings_statistics(input_filenames, workers=None, processes=True):
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if (processes) else concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    with executor:
+        return list(executor.map(_get_recording_statistics_safe, input_filenames, chunksize=16 if (processes) else 1))
+
 
 #------------------------------------------------------------------------------
 # Timing
@@ -66,6 +66,9 @@ if (__name__ == '__main__'):
     stereo_calibration = hl2ss_3dcv.rm_vlc_stereo_calibrate(K1, K2, Rt1, Rt2)
     stereo_rectification = hl2ss_3dcv.rm_vlc_stereo_rectify(K1, K2, stereo_calibration.R, stereo_calibration.t, shape)
 
+    # Fuse undistortion, rotation and rectification into one remap per camera
+    rectifier = hl2ss_3dcv.rm_vlc_stereo_rectifier(port_left, port_right, calibration_lf, calibration_rf, stereo_rectification, calibration=stereo_calibration)
+
     # You can save stereo calibration and rectification using:
     # hl2ss_3dcv.save_stereo_calibration(port_left, port_right, stereo_calibration, calibration_path)
     # hl2ss_3dcv.save_stereo_rectification(port_left, port_right, stereo_rectification, calibration_path)
@@ -103,14 +106,9 @@ if (__name__ == '__main__'):
             continue
 
         # Undistort and rectify frames ----------------------------------------
-        lf_u = cv2.remap(data_left.payload, calibration_lf.undistort_map[:, :, 0], calibration_lf.undistort_map[:, :, 1], cv2.INTER_LINEAR)
-        rf_u = cv2.remap(data_right.payload, calibration_rf.undistort_map[:, :, 0], calibration_rf.undistort_map[:, :, 1], cv2.INTER_LINEAR)
-
-        lf_ru = hl2ss_3dcv.rm_vlc_rotate_image(lf_u, rotation_lf)
-        rf_ru = hl2ss_3dcv.rm_vlc_rotate_image(rf_u, rotation_rf)
-
-        r1 = cv2.remap(lf_ru, stereo_rectification.map1[:, :, 0], stereo_rectification.map1[:, :, 1], cv2.INTER_LINEAR)
-        r2 = cv2.remap(rf_ru, stereo_rectification.map2[:, :, 0], stereo_rectification.map2[:, :, 1], cv2.INTER_LINEAR)
+        # r1 and r2 are views into a buffer that the next rectify call reuses,
+        # copy them (or pass out=) to keep frames across iterations
+        r1, r2 = rectifier.rectify(data_left.payload, data_right.payload)
 
         # Display frames ------------------------------------------------------
         image_l = hl2ss_3dcv.rm_vlc_to_rgb(r1)
@@ -118,8 +116,8 @@ if (__name__ == '__main__'):
 
         image = np.hstack((image_l, image_r))
 
-        for y in range(line_start, shape[1], line_offset):
-            cv2.line(image, (0, y), ((shape[0] * 2) - 1, y), line_color, line_thickness)
+        for y in range(line_start, rectifier.height, line_offset):
+            cv2.line(image, (0, y), ((rectifier.width * 2) - 1, y), line_color, line_thickness)
         
         cv2.imshow('Rectified', image)
         cv2.waitKey(1)
@@ -0,0 +1,54 @@
+#------------------------------------------------------------------------------
+# Multi-stream sequencer example. The multi-stream sequencer reads and decodes
+# several files on worker threads and pairs their frames with the frames of a
+# master stream. Here, it is used to pair RM VLC LEFTFRONT and RIGHTFRONT 
+# frames with PV frames, all previously recorded using simple recorder.
+#------------------------------------------------------------------------------
+
+import cv2
+import hl2ss_imshow
+import hl2ss
+import hl2ss_io
+
+# Settings --------------------------------------------------------------------
+
+# Directory containing the recorded data
+path = './data'
+
+# Packets buffered ahead per stream
+depth = 64
+
+#------------------------------------------------------------------------------
+
+# Create sequencer ------------------------------------------------------------
+filenames = [
+    f'{path}/{hl2ss.get_port_name(hl2ss.StreamPort.PERSONAL_VIDEO)}.bin',
+    f'{path}/{hl2ss.get_port_name(hl2ss.StreamPort.RM_VLC_LEFTFRONT)}.bin',
+    f'{path}/{hl2ss.get_port_name(hl2ss.StreamPort.RM_VLC_RIGHTFRONT)}.bin',
+]
+
+sequencer = hl2ss_io.multi_sequencer(filenames, hl2ss.ChunkSize.SINGLE_TRANSFER, 'bgr24', 0, depth)
+
+# Open sequencer --------------------------------------------------------------
+sequencer.open()
+
+# Main loop -------------------------------------------------------------------
+while (True):
+    # Get PV frame and nearest (in time) lf and rf frames ---------------------
+    bundle = sequencer.get_next_bundle()
+    if (bundle is None):
+        break
+
+    data_pv, data_lf, data_rf = bundle
+
+    # Display frames ----------------------------------------------------------
+    if (data_lf is not None):
+        cv2.imshow('RM VLC LF', data_lf.payload)
+    if (data_rf is not None):
+        cv2.imshow('RM VLC RF', data_rf.payload)
+
+    cv2.imshow('PV', data_pv.payload.image)
+    cv2.waitKey(1)
+
+# Close sequencer -------------------------------------------------------------
+sequencer.close()
@@ -12,6 +12,7 @@ import threading
 import hl2ss
 import hl2ss_lnm
 import hl2ss_mp
+import hl2ss_io
 import hl2ss_utilities
 
 # Settings --------------------------------------------------------------------
@@ -25,6 +26,9 @@ path = './data'
 # Unpack to viewable formats (e.g., encoded video to mp4)
 unpack = True
 
+# Record all streams to a single container file instead of one file per port
+container = False
+
 # Ports to record
 ports = [
     hl2ss.StreamPort.RM_VLC_LEFTFRONT,
@@ -112,8 +116,16 @@ if __name__ == '__main__':
     print('Preparing...')
 
     # Start writers -----------------------------------------------------------
-    filenames = {port : os.path.join(path, f'{hl2ss.get_port_name(port)}.bin') for port in ports}
-    writers = {port : hl2ss_utilities.wr_process_producer(filenames[port], producer, port, 'hl2ss simple recorder'.encode()) for port in ports}
+    if (container):
+        container_filename = os.path.join(path, 'session.hl2c')
+        wr_container = hl2ss_io.wr_container(container_filename, [producer.get_receiver(port) for port in ports], 'hl2ss simple recorder'.encode())
+        wr_container.open()
+        filenames = {port : hl2ss_io.get_container_stream(container_filename, port) for port in ports}
+    else:
+        wr_container = None
+        filenames = {port : os.path.join(path, f'{hl2ss.get_port_name(port)}.bin') for port in ports}
+
+    writers = {port : hl2ss_utilities.wr_process_producer(filenames[port], producer, port, 'hl2ss simple recorder'.encode(), container=wr_container) for port in ports}
     
     for port in ports:
         writers[port].start()
@@ -131,6 +143,9 @@ if __name__ == '__main__':
     for port in ports:
         writers[port].join()
 
+    if (container):
+        wr_container.close()
+
     for port in ports:
         producer.stop(port)
 
@@ -171,6 +186,6 @@ if __name__ == '__main__':
     # Unpack stream metadata and numeric payloads to csv ----------------------
     for port in ports:
         input_filename = filenames[port]
-        output_filename = input_filename[:input_filename.rfind('.bin')] + '.csv'
+        output_filename = os.path.join(path, f'{hl2ss.get_port_name(port)}.csv')
         hl2ss_utilities.unpack_to_csv(input_filename, output_filename)
 